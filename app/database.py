@@ -1,20 +1,98 @@
-from sqlalchemy import create_engine
+import os
+from typing import Any, Dict
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-SQLITE_DATABASE_URL = "sqlite:///./products.db"
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./products.db")
 
-engine = create_engine(
-    SQLITE_DATABASE_URL, 
-    connect_args={"check_same_thread": False}
-)
+# "performance" runs SQLite in WAL mode so uploads don't lock out readers;
+# "default" keeps SQLite's rollback journal and only sets the busy timeout.
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "performance")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+SQLITE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+    },
+    "performance": {
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": SQLITE_MMAP_SIZE,
+        # Negative cache_size is in KiB rather than pages
+        "cache_size": -SQLITE_CACHE_SIZE_KB,
+        "temp_store": "MEMORY",
+    },
+}
+
+if SQLITE_PROFILE not in SQLITE_PROFILES:
+    raise ValueError(f"Unknown SQLITE_PROFILE '{SQLITE_PROFILE}', expected one of: {', '.join(SQLITE_PROFILES)}")
+
+
+def _engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    parsed = make_url(url)
+    pool_options = {"pool_size": DB_POOL_SIZE, "max_overflow": DB_MAX_OVERFLOW, "pool_timeout": DB_POOL_TIMEOUT}
+    if parsed.get_backend_name() != "sqlite":
+        return pool_options
+    options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}}
+    if parsed.database and parsed.database != ":memory:":
+        # In-memory databases use a single shared connection; only file databases
+        # are pooled. aiosqlite would otherwise open a new connection (and re-run
+        # the PRAGMAs) for every request.
+        options.update(pool_options)
+        if is_async:
+            options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
+
+def _async_url(url: str) -> str:
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+def apply_sqlite_profile(engine: Engine, profile: str = SQLITE_PROFILE) -> None:
+    """Set the profile's PRAGMAs on every new DBAPI connection of a SQLite engine."""
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = SQLITE_PROFILES[profile]
+    
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+
+# Request handlers run on aiosqlite so a slow query doesn't block the event loop;
+# the synchronous engine stays for schema setup and background import workers.
+async_engine = create_async_engine(_async_url(DATABASE_URL), **_engine_options(DATABASE_URL, is_async=True))
+
+apply_sqlite_profile(engine)
+apply_sqlite_profile(async_engine.sync_engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+def get_sync_engine() -> Engine:
+    return engine
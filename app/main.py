@@ -1,18 +1,34 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from app.database import engine
-from app.models import Base
+from app.metrics import MetricsMiddleware, router as metrics_router
+from app.migrate import MIGRATE_ON_STARTUP, migrate
 from app.routers import upload, products
+from app.services.job_service import IMPORT_JOB_STALE_SECONDS, JobService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if MIGRATE_ON_STARTUP:
+        migrate(engine)
+        # Sibling workers may already be running jobs, so only fail ones that stalled
+        JobService.fail_interrupted_jobs(engine, IMPORT_JOB_STALE_SECONDS)
+    JobService.recover_jobs(engine)
+    yield
 
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Product Management API",
     description="A FastAPI service for managing product data with CSV upload, validation, and search functionality",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(upload.router)
 app.include_router(products.router)
+app.include_router(metrics_router)
 
 @app.get("/")
 async def root():
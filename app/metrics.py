@@ -0,0 +1,197 @@
+"""Request latency, SQL query and CSV ingestion metrics.
+
+Everything is kept in-process and exposed in the Prometheus text format on
+/metrics. Each request also gets a Server-Timing header with its own totals.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values."""
+    
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, *label_values: str) -> None:
+        # Per series: one count per bucket, then +Inf count and sum
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((labels, list(values)) for labels, values in self._series.items())
+        for label_values, values in series:
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values))
+            prefix = labels + "," if labels else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            cumulative += values[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {cumulative}')
+            suffix = "{" + labels + "}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {values[-1]}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+    
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time to the end of the response body, by route.",
+    ["method", "route", "status"]
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed while handling a request.",
+    ["method", "route"], QUERY_COUNT_BUCKETS
+)
+QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Execution time of single SQL statements, by the route that issued them.",
+    ["route"]
+)
+CSV_STAGE_LATENCY = Histogram(
+    "csv_ingest_stage_seconds", "Time spent per CSV ingestion step (parse, validate, store).",
+    ["stage"]
+)
+HISTOGRAMS = [REQUEST_LATENCY, REQUEST_QUERIES, QUERY_LATENCY, CSV_STAGE_LATENCY]
+
+
+class RequestStats:
+    """Totals for the request being handled; shared with its worker threads and greenlets."""
+    
+    def __init__(self, scope: Optional[dict] = None):
+        self.scope = scope or {}
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.stages: Dict[str, float] = {}
+    
+    @property
+    def route(self) -> str:
+        # The route template, not the path, so /products/{sku} stays one series;
+        # the router adds it to the scope once it has matched
+        route = self.scope.get("route")
+        return getattr(route, "path_format", None) or "unmatched"
+    
+    def server_timing(self, total_seconds: float) -> str:
+        entries = [f"db;desc=\"{self.queries} queries\";dur={self.db_seconds * 1000:.2f}"]
+        entries += [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in self.stages.items()]
+        entries.append(f"total;dur={total_seconds * 1000:.2f}")
+        return ", ".join(entries)
+
+
+_current: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+
+@contextmanager
+def csv_stage(stage: str) -> Iterator[None]:
+    """Time a CSV ingestion step into csv_ingest_stage_seconds and the request's Server-Timing.
+
+    Works as a decorator too; each call gets its own timer.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        CSV_STAGE_LATENCY.observe(elapsed, stage)
+        stats = _current.get()
+        if stats is not None:
+            stats.stages[stage] = stats.stages.get(stage, 0.0) + elapsed
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the per-statement context so a statement that raises leaves nothing behind
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = _current.get()
+    QUERY_LATENCY.observe(elapsed, stats.route if stats is not None else "background")
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and query counts and adding Server-Timing."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = RequestStats(scope)
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+        
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                timing = stats.server_timing(time.perf_counter() - started)
+                headers.append((b"server-timing", timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            REQUEST_LATENCY.observe(time.perf_counter() - started, scope["method"], stats.route, str(status))
+            REQUEST_QUERIES.observe(stats.queries, scope["method"], stats.route)
+
+
+def render_metrics() -> str:
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition of the request, query and ingestion histograms."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,38 @@
+"""Schema setup and import job cleanup, run once per deploy before the API workers start.
+
+    python -m app.migrate
+"""
+import os
+from sqlalchemy.engine import Engine
+from app.database import engine
+from app.models import Base, CatalogState, ImportJob, Product, add_missing_columns, seed_catalog_state
+from app.services.job_service import JobService
+from app.services.search_index import SearchIndex
+
+# Whether the API's lifespan hook migrates on startup; deploys that run
+# `python -m app.migrate` first set this to 0 so workers start serving sooner
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "1").lower() not in ("0", "false", "no")
+
+
+def migrate(engine: Engine = engine) -> None:
+    """Create missing tables, columns and indexes, seed catalog_state and backfill the search index."""
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        add_missing_columns(connection, Product.__table__)
+        add_missing_columns(connection, CatalogState.__table__)
+        add_missing_columns(connection, ImportJob.__table__)
+        # Writers and the pagination count expect the row to exist
+        seed_catalog_state(connection)
+    # create_all skips indexes of tables that already exist
+    for index in Product.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+    SearchIndex.ensure(engine)
+
+
+if __name__ == "__main__":
+    migrate()
+    print("Database schema is up to date")
+    # No API worker is up yet, so every job still marked running was interrupted
+    failed = JobService.fail_interrupted_jobs(engine)
+    if failed:
+        print(f"Marked {failed} interrupted import job(s) as failed")
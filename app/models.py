@@ -1,8 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float
+from typing import List, Optional, Tuple
+from sqlalchemy import Boolean, Column, Integer, String, Float, Text, DateTime, ForeignKey, Index, Table, event, inspect
 from app.database import Base
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_brand_price", "brand", "price"),
+        Index("ix_products_color_price", "color", "price"),
+        Index("ix_products_price", "price"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     sku = Column(String(100), unique=True, index=True, nullable=False)
@@ -13,6 +19,215 @@ class Product(Base):
     mrp = Column(Float, nullable=False)
     price = Column(Float, nullable=False)
     quantity = Column(Integer, default=0)
+    # Digest of the catalog fields, so a sync upload can tell which rows changed
+    content_hash = Column(String(32))
     
     def __repr__(self):
-        return f"<Product(sku='{self.sku}', name='{self.name}', brand='{self.brand}')>"
\ No newline at end of file
+        return f"<Product(sku='{self.sku}', name='{self.name}', brand='{self.brand}')>"
+
+
+# Trigram full-text index over brand and color so substring searches don't scan
+# products. It is an external-content table: triggers keep it in sync with
+# every insert, update and delete on products.
+PRODUCTS_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+        brand, color, content='products', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO products_fts(rowid, brand, color) VALUES (new.id, new.brand, new.color);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, brand, color) VALUES ('delete', old.id, old.brand, old.color);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF brand, color ON products BEGIN
+        INSERT INTO products_fts(products_fts, rowid, brand, color) VALUES ('delete', old.id, old.brand, old.color);
+        INSERT INTO products_fts(rowid, brand, color) VALUES (new.id, new.brand, new.color);
+    END""",
+]
+
+
+def fts_trigram_supported(connection) -> bool:
+    if connection.dialect.name != "sqlite":
+        return False
+    version = connection.exec_driver_sql("SELECT sqlite_version()").scalar()
+    if tuple(int(part) for part in version.split(".")) < (3, 34, 0):
+        return False
+    options = {row[0] for row in connection.exec_driver_sql("PRAGMA compile_options")}
+    return "ENABLE_FTS5" in options
+
+
+def create_products_fts(connection, rebuild: bool = False) -> bool:
+    if not fts_trigram_supported(connection):
+        return False
+    for statement in PRODUCTS_FTS_DDL:
+        connection.exec_driver_sql(statement)
+    if rebuild:
+        connection.exec_driver_sql("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+    return True
+
+
+def add_missing_columns(connection, table: Table) -> List[str]:
+    """Add columns that are new in the model to an existing table; create_all leaves those out."""
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    added = []
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        column_type = column.type.compile(dialect=connection.dialect)
+        connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+        added.append(column.name)
+    return added
+
+
+@event.listens_for(Product.__table__, "after_create")
+def _create_products_fts_after_products(target, connection, **kw):
+    create_products_fts(connection)
+
+
+# Upper bounds of the price bands /products/facets counts by: band i holds
+# PRICE_BAND_BOUNDS[i - 1] <= price < PRICE_BAND_BOUNDS[i], and the last band is
+# open-ended. product_facets has to be rebuilt after changing them.
+PRICE_BAND_BOUNDS = [500, 1000, 2000, 5000, 10000]
+
+
+def price_band_range(band: int) -> Tuple[Optional[float], Optional[float]]:
+    """(inclusive lower, exclusive upper) price of a band; None where it is open."""
+    lower = PRICE_BAND_BOUNDS[band - 1] if band > 0 else None
+    upper = PRICE_BAND_BOUNDS[band] if band < len(PRICE_BAND_BOUNDS) else None
+    return lower, upper
+
+
+class ProductFacet(Base):
+    """Product counts per brand, color and price band, kept current by triggers on products."""
+    __tablename__ = "product_facets"
+    
+    brand = Column(String(100), primary_key=True)
+    # '' stands for products without a color, so the key stays unique
+    color = Column(String(50), primary_key=True)
+    price_band = Column(Integer, primary_key=True)
+    product_count = Column(Integer, nullable=False, default=0)
+
+
+# The triggers it gets on creation are defined on products
+ProductFacet.__table__.add_is_dependent_on(Product.__table__)
+
+
+def _price_band_sql(price: str) -> str:
+    cases = " ".join(f"WHEN {price} < {bound} THEN {band}" for band, bound in enumerate(PRICE_BAND_BOUNDS))
+    return f"CASE {cases} ELSE {len(PRICE_BAND_BOUNDS)} END"
+
+
+def _facet_increment_sql(row: str) -> str:
+    return f"""INSERT INTO product_facets(brand, color, price_band, product_count)
+        VALUES ({row}.brand, coalesce({row}.color, ''), {_price_band_sql(f"{row}.price")}, 1)
+        ON CONFLICT(brand, color, price_band) DO UPDATE SET product_count = product_count + 1;"""
+
+
+def _facet_decrement_sql(row: str) -> str:
+    # Rows that drop to zero stay behind; readers skip them and clearing the catalog removes them
+    return f"""UPDATE product_facets SET product_count = product_count - 1
+        WHERE brand = {row}.brand AND color = coalesce({row}.color, '')
+        AND price_band = {_price_band_sql(f"{row}.price")};"""
+
+
+PRODUCT_FACETS_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS product_facets_ai AFTER INSERT ON products BEGIN
+        {_facet_increment_sql("new")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS product_facets_ad AFTER DELETE ON products BEGIN
+        {_facet_decrement_sql("old")}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS product_facets_au AFTER UPDATE OF brand, color, price ON products BEGIN
+        {_facet_decrement_sql("old")}
+        {_facet_increment_sql("new")}
+    END""",
+]
+
+PRODUCT_FACETS_REBUILD = [
+    "DELETE FROM product_facets",
+    f"""INSERT INTO product_facets(brand, color, price_band, product_count)
+        SELECT brand, coalesce(color, ''), {_price_band_sql("price")}, count(*) FROM products GROUP BY 1, 2, 3""",
+]
+
+
+def create_product_facets(connection, rebuild: bool = False) -> bool:
+    if connection.dialect.name != "sqlite":
+        return False
+    for statement in PRODUCT_FACETS_DDL:
+        connection.exec_driver_sql(statement)
+    if rebuild:
+        for statement in PRODUCT_FACETS_REBUILD:
+            connection.exec_driver_sql(statement)
+    return True
+
+
+@event.listens_for(ProductFacet.__table__, "after_create")
+def _create_product_facets_after_table(target, connection, **kw):
+    # Also backfills when the table is added to a database that already has products
+    create_product_facets(connection, rebuild=True)
+
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+    
+    id = Column(String(36), primary_key=True)
+    filename = Column(String(255))
+    file_path = Column(String(1024))
+    status = Column(String(20), nullable=False, default="queued")
+    # The upload's options, so a job requeued after a restart runs the same way
+    sync = Column(Boolean, default=False)
+    workers = Column(Integer, default=1)
+    rows_processed = Column(Integer, default=0)
+    valid_products_stored = Column(Integer, default=0)
+    skipped_duplicates = Column(Integer, default=0)
+    validation_errors_count = Column(Integer, default=0)
+    # Sync imports only
+    inserted = Column(Integer)
+    updated = Column(Integer)
+    unchanged = Column(Integer)
+    detail = Column(Text)
+    created_at = Column(DateTime)
+    started_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    
+    def __repr__(self):
+        return f"<ImportJob(id='{self.id}', status='{self.status}', rows_processed={self.rows_processed})>"
+
+
+class ImportJobError(Base):
+    __tablename__ = "import_job_errors"
+    
+    id = Column(Integer, primary_key=True)
+    job_id = Column(String(36), ForeignKey("import_jobs.id"), nullable=False, index=True)
+    row = Column(Integer, nullable=False)
+    errors = Column(Text, nullable=False)
+
+
+
+class CatalogState(Base):
+    """Single-row summary of the catalog, updated in the same transaction as product writes."""
+    __tablename__ = "catalog_state"
+    
+    id = Column(Integer, primary_key=True)
+    product_count = Column(Integer, nullable=False, default=0)
+    # Bumped by every committed product write; workers compare it to notice each other's writes
+    version = Column(Integer, nullable=False, default=0)
+
+
+def seed_catalog_state(connection) -> None:
+    """Insert the catalog_state row if it's missing, counted from the products already stored.
+    
+    Readers and writers of the counter assume the row exists, so it is seeded
+    once here instead of on the first read.
+    """
+    stored = "(SELECT count(*) FROM products)" if inspect(connection).has_table(Product.__tablename__) else "0"
+    connection.exec_driver_sql(
+        f"INSERT OR IGNORE INTO catalog_state (id, product_count, version) VALUES (1, {stored}, 0)"
+    )
+
+
+@event.listens_for(CatalogState.__table__, "after_create")
+def _seed_catalog_state_after_table(target, connection, **kw):
+    # create_all may create catalog_state before products; migrate seeds again afterwards
+    seed_catalog_state(connection)
@@ -1,20 +1,59 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
+import os
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncResult, AsyncSession
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, Union
+from app.database import get_db, get_sync_engine
+from app.services.export_service import EXPORT_FORMATS, ExportService
+from app.services.catalog_state import catalog_sync
+from app.services.facet_service import FacetService
 from app.services.product_service import ProductService
-from app.schemas import ProductResponse, PaginatedProductResponse
+from app.services.result_cache import ResultCache, result_cache, sku_cache
+from app.schemas import (
+    ProductResponse,
+    PaginatedProductResponse,
+    CursorPaginatedProductResponse,
+    FacetResponse,
+    SkuLookupRequest,
+    SkuLookupResponse,
+)
 
-router = APIRouter(prefix="/products", tags=["Products"])
+# Answer /products/search from an in-memory copy of the catalog instead of SQLite
+CATALOG_REPLICA = os.getenv("CATALOG_REPLICA", "0").lower() not in ("0", "false", "no")
 
 
-@router.get("", response_model=PaginatedProductResponse)
+async def _sync_catalog_version(db: AsyncSession = Depends(get_db)) -> None:
+    # Shares the request's session with the handler
+    if catalog_sync.due():
+        await db.run_sync(catalog_sync.check)
+
+
+# Every route reads some in-process cache, so each request first catches up with other workers' writes
+router = APIRouter(prefix="/products", tags=["Products"], dependencies=[Depends(_sync_catalog_version)])
+
+
+@router.get("", response_model=Union[PaginatedProductResponse, CursorPaginatedProductResponse])
 async def list_products(
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(10, ge=1, le=100, description="Number of products per page"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page; replaces page"),
+    include_total: bool = Query(False, description="Include total_products when paging by cursor"),
+    db: AsyncSession = Depends(get_db)
 ):
-    return ProductService.get_products_paginated(db, page, limit)
+    async def build() -> Tuple[bytes, Dict[str, str]]:
+        if cursor is not None:
+            result = await db.run_sync(ProductService.get_product_rows_after_cursor, cursor, limit, include_total)
+        else:
+            result = await db.run_sync(ProductService.get_product_rows_paginated, page, limit)
+        return orjson.dumps(result), {}
+    
+    key = ResultCache.make_key("list", page=page, limit=limit, cursor=cursor, include_total=include_total)
+    try:
+        return await _cached_json(key, build)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/search", response_model=List[ProductResponse])
@@ -23,12 +62,133 @@ async def search_products(
     color: Optional[str] = Query(None, description="Filter by color"),
     minPrice: Optional[float] = Query(None, ge=0, description="Minimum price filter"),
     maxPrice: Optional[float] = Query(None, ge=0, description="Maximum price filter"),
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of products to return"),
+    cursor: Optional[str] = Query(None, description="Opaque X-Next-Cursor value from a previous page"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="json, or ndjson to stream one product per line"),
+    exact: bool = Query(False, description="Match brand and color exactly instead of by case-insensitive substring"),
+    db: AsyncSession = Depends(get_db)
+):
+    async def build() -> Tuple[bytes, Dict[str, str]]:
+        # Without limit or cursor every match is returned; a cursor alone pages by 100
+        page_size = limit or (100 if cursor is not None else None)
+        replica = _catalog_replica() if CATALOG_REPLICA else None
+        if replica is not None:
+            products, next_cursor = replica.search_product_rows(brand, color, minPrice, maxPrice, page_size, cursor, exact)
+        else:
+            products, next_cursor = await db.run_sync(
+                ProductService.search_product_rows, brand, color, minPrice, maxPrice, page_size, cursor, exact
+            )
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return orjson.dumps(products), headers
+    
+    try:
+        if format == "ndjson":
+            statement = await db.run_sync(
+                ProductService.search_rows_statement, brand, color, minPrice, maxPrice, limit, cursor, exact
+            )
+            result = await db.stream(statement.execution_options(yield_per=500))
+            return StreamingResponse(_ndjson_lines(result), media_type="application/x-ndjson")
+        
+        key = ResultCache.make_key(
+            "search", brand=brand, color=color, minPrice=minPrice, maxPrice=maxPrice,
+            limit=limit, cursor=cursor, exact=exact
+        )
+        return await _cached_json(key, build)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/facets", response_model=FacetResponse)
+async def product_facets(
+    brand: Optional[str] = Query(None, description="Filter by brand"),
+    color: Optional[str] = Query(None, description="Filter by color"),
+    minPrice: Optional[float] = Query(None, ge=0, description="Minimum price filter"),
+    maxPrice: Optional[float] = Query(None, ge=0, description="Maximum price filter"),
+    exact: bool = Query(False, description="Match brand and color exactly instead of by case-insensitive substring"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of brand and color values to return"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Brand, color and price-band counts for the products /products/search would return."""
+    async def build() -> Tuple[bytes, Dict[str, str]]:
+        facets = await db.run_sync(FacetService.get_facets, brand, color, minPrice, maxPrice, exact, limit)
+        return orjson.dumps(facets), {}
+    
+    key = ResultCache.make_key(
+        "facets", brand=brand, color=color, minPrice=minPrice, maxPrice=maxPrice, exact=exact, limit=limit
+    )
+    return await _cached_json(key, build)
+
+
+@router.get("/export")
+async def export_products(
+    format: str = Query("csv", pattern="^(csv|parquet|arrow)$", description="csv (the /upload format), parquet or arrow (IPC stream)"),
+    brand: Optional[str] = Query(None, description="Filter by brand"),
+    color: Optional[str] = Query(None, description="Filter by color"),
+    minPrice: Optional[float] = Query(None, ge=0, description="Minimum price filter"),
+    maxPrice: Optional[float] = Query(None, ge=0, description="Maximum price filter"),
+    exact: bool = Query(False, description="Match brand and color exactly instead of by case-insensitive substring"),
+    sync_engine: Engine = Depends(get_sync_engine)
 ):
-    return ProductService.search_products(db, brand, color, minPrice, maxPrice)
+    """Stream the whole catalog, or the products matching the search filters, as one file."""
+    media_type, extension = EXPORT_FORMATS[format]
+    # A sync generator: Starlette pulls each chunk from a worker thread
+    body = ExportService.iter_export(sync_engine, format, brand, color, minPrice, maxPrice, exact)
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="products.{extension}"'}
+    )
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters of the listing and search result cache, and of the SKU cache."""
+    return {**result_cache.stats(), "sku_cache": sku_cache.stats()}
+
+
+@router.post("/lookup", response_model=SkuLookupResponse)
+async def lookup_products(request: SkuLookupRequest, db: AsyncSession = Depends(get_db)):
+    """Resolve up to 1000 SKUs at once; products come back in request order, unknown SKUs in missing."""
+    found = await db.run_sync(ProductService.lookup_skus, request.skus)
+    skus = list(dict.fromkeys(request.skus))
+    payload = {
+        "products": [found[sku] for sku in skus if sku in found],
+        "missing": [sku for sku in skus if sku not in found],
+    }
+    return Response(content=orjson.dumps(payload), media_type="application/json")
+
+
+async def _cached_json(key: Hashable, build: Callable[[], Awaitable[Tuple[bytes, Dict[str, str]]]]) -> Response:
+    cached = result_cache.get(key)
+    if cached is None:
+        generation = result_cache.generation
+        cached = await build()
+        result_cache.set(key, cached, generation)
+    body, headers = cached
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _catalog_replica() -> Optional[Any]:
+    # Imported on first use so numpy isn't loaded unless the replica is on
+    from app.services.catalog_replica import CatalogReplica
+    return CatalogReplica.snapshot(get_sync_engine())
+
+
+async def _ndjson_lines(result: AsyncResult) -> AsyncIterator[bytes]:
+    async for row in result.mappings():
+        yield orjson.dumps(dict(row), option=orjson.OPT_APPEND_NEWLINE)
 
 
 @router.delete("/clear")
-async def clear_all_products(db: Session = Depends(get_db)):
+async def clear_all_products(db: AsyncSession = Depends(get_db)):
     """Clear all products from database."""
-    return ProductService.clear_all_products(db)
\ No newline at end of file
+    return await db.run_sync(ProductService.clear_all_products)
+
+
+# Registered last so it doesn't shadow the fixed /products/... paths above
+@router.get("/{sku}", response_model=ProductResponse)
+async def get_product(sku: str, db: AsyncSession = Depends(get_db)):
+    found = await db.run_sync(ProductService.lookup_skus, [sku])
+    if sku not in found:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return Response(content=orjson.dumps(found[sku]), media_type="application/json")
\ No newline at end of file
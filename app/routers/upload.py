@@ -1,24 +1,70 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends
+import os
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.services.csv_service import CSVService
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_sync_engine
+from app.services.job_service import JobService
+from app.schemas import ImportJobCreated, ImportJobResponse
 
 router = APIRouter(prefix="/upload", tags=["Upload"])
 
+# Upper bound for ?workers=N
+MAX_PARSE_WORKERS = int(os.getenv("MAX_PARSE_WORKERS", str(os.cpu_count() or 1)))
+
 
 @router.post("")
-async def upload_csv(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def upload_csv(
+    file: UploadFile = File(...),
+    stream: bool = Query(False, description="Validate and store the file in fixed-size chunks instead of loading it whole"),
+    background: bool = Query(False, description="Queue the import as a background job and return its id immediately"),
+    workers: int = Query(1, ge=1, description="Parse and validate the file in this many processes (capped at MAX_PARSE_WORKERS)"),
+    sync: bool = Query(False, description="Update existing SKUs whose fields changed instead of skipping them"),
+    db: AsyncSession = Depends(get_db),
+    sync_engine: Engine = Depends(get_sync_engine)
+):
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="File must be a CSV")
     
+    workers = min(workers, MAX_PARSE_WORKERS)
+    
+    if background:
+        job_id, file_path = await run_in_threadpool(JobService.save_upload, file.file)
+        job = await db.run_sync(JobService.record_job, job_id, file.filename, file_path, workers, sync)
+        JobService.submit(job.id, sync_engine, workers, sync)
+        created = ImportJobCreated(job_id=job.id, status=job.status, status_url=f"/upload/jobs/{job.id}")
+        return JSONResponse(status_code=202, content=created.model_dump())
+    
+    # The pandas-backed services load on the first synchronous upload, not at startup
+    from app.services.csv_service import CSVService
+    from app.services.parallel_csv import ParallelCSVService
+    
     try:
+        if workers > 1:
+            # Worker processes read their partitions from disk, not from the request's spooled file
+            _, file_path = await run_in_threadpool(JobService.save_upload, file.file)
+            try:
+                return await ParallelCSVService.process_csv_parallel_async(file_path, db, workers, sync=sync)
+            finally:
+                os.remove(file_path)
+        
+        if stream:
+            return await CSVService.process_csv_stream_async(file.file, db, sync=sync)
+        
         contents = await file.read()
-        df = CSVService.parse_csv(contents)
-        result = CSVService.process_csv(df, db)
+        result = await CSVService.process_csv_bytes_async(contents, db, sync=sync)
         return result
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error processing CSV file: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error processing CSV file: {str(e)}")
+
+
+@router.get("/jobs/{job_id}", response_model=ImportJobResponse)
+async def get_import_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    job = await db.run_sync(JobService.get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
@@ -1,5 +1,6 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+from typing import Optional, List, Dict, Any
 
 class ProductBase(BaseModel):
     sku: str
@@ -24,7 +25,64 @@ class PaginationInfo(BaseModel):
     total_pages: int
     total_products: int
     products_per_page: int
+    next_cursor: Optional[str] = None
 
 class PaginatedProductResponse(BaseModel):
     products: List[ProductResponse]
-    pagination: PaginationInfo
\ No newline at end of file
+    pagination: PaginationInfo
+
+class CursorPaginationInfo(BaseModel):
+    next_cursor: Optional[str] = None
+    products_per_page: int
+    total_products: Optional[int] = None
+
+class CursorPaginatedProductResponse(BaseModel):
+    products: List[ProductResponse]
+    pagination: CursorPaginationInfo
+
+class SkuLookupRequest(BaseModel):
+    skus: List[str] = Field(..., min_length=1, max_length=1000)
+
+class SkuLookupResponse(BaseModel):
+    products: List[ProductResponse]
+    missing: List[str]
+
+class FacetValue(BaseModel):
+    value: Optional[str] = None
+    count: int
+
+class PriceBandFacet(BaseModel):
+    min: Optional[float] = None
+    max: Optional[float] = None
+    count: int
+
+class FacetResponse(BaseModel):
+    total_products: int
+    brands: List[FacetValue]
+    colors: List[FacetValue]
+    price_bands: List[PriceBandFacet]
+
+class ImportJobCreated(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+
+class ImportJobResponse(BaseModel):
+    job_id: str
+    status: str
+    filename: Optional[str] = None
+    rows_processed: int
+    valid_products_stored: int
+    skipped_duplicates: int
+    validation_errors_count: int
+    sync: bool = False
+    workers: int = 1
+    inserted: Optional[int] = None
+    updated: Optional[int] = None
+    unchanged: Optional[int] = None
+    rows_per_second: Optional[float] = None
+    detail: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    errors: List[Dict[str, Any]]
\ No newline at end of file
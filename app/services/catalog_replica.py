@@ -0,0 +1,174 @@
+import re
+import threading
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.models import Product
+from app.services.product_service import PRODUCT_COLUMNS, PRODUCT_FIELDS, ProductService
+from app.services.result_cache import result_cache
+
+# SQLite's lower() and LIKE only fold ASCII letters
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _ilike_matcher(term: str):
+    """Python equivalent of SQLite's ``lower(value) LIKE lower('%term%')``."""
+    pattern = "".join(
+        ".*" if char == "%" else "." if char == "_" else re.escape(char)
+        for char in f"%{term}%".translate(_ASCII_LOWER)
+    )
+    regex = re.compile(pattern, re.DOTALL)
+    return lambda value: value is not None and regex.fullmatch(value.translate(_ASCII_LOWER)) is not None
+
+
+class _Dictionary:
+    """A low-cardinality column as int32 codes into its distinct values."""
+    
+    def __init__(self, values: List[Optional[str]]):
+        index: Dict[Optional[str], int] = {}
+        self.codes = np.fromiter((index.setdefault(value, len(index)) for value in values), dtype=np.int32, count=len(values))
+        self.values = np.empty(len(index), dtype=object)
+        self.values[:] = list(index)
+    
+    def mask(self, predicate, positions: np.ndarray) -> np.ndarray:
+        """Whether the rows at positions match; the predicate runs once per distinct value."""
+        matches = np.fromiter((predicate(value) for value in self.values), dtype=bool, count=len(self.values))
+        return matches[self.codes[positions]]
+
+
+class CatalogSnapshot:
+    """Products as columnar arrays in id order; never modified once built."""
+    
+    def __init__(self, rows: List[tuple], generation: int):
+        self.generation = generation
+        columns = list(zip(*rows)) if rows else [()] * len(PRODUCT_FIELDS)
+        sku, name, brand, color, size, mrp, price, quantity, ids = columns
+        self.row_count = len(rows)
+        self.ids = np.array(ids, dtype=np.int64)
+        self.price = np.array(price, dtype=np.float64)
+        self.mrp = np.array(mrp, dtype=np.float64)
+        self.brand = _Dictionary(brand)
+        self.color = _Dictionary(color)
+        # Free-form text and the nullable quantity keep their Python objects
+        self.text = {field: self._objects(values) for field, values in (("sku", sku), ("name", name), ("size", size))}
+        self.quantity = self._objects(quantity)
+        # Row positions sorted by price, for bisecting price ranges
+        self.price_order = np.argsort(self.price, kind="stable")
+        self.sorted_price = self.price[self.price_order]
+    
+    @staticmethod
+    def _objects(values) -> np.ndarray:
+        array = np.empty(len(values), dtype=object)
+        array[:] = list(values)
+        return array
+    
+    def search_product_rows(
+        self,
+        brand: Optional[str] = None,
+        color: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        exact: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """ProductService.search_product_rows answered from the snapshot."""
+        after_id = ProductService.decode_cursor(cursor) if cursor is not None else None
+        fetch = limit + 1 if limit is not None else None
+        rows = self.search(brand, color, min_price, max_price, fetch, after_id, exact)
+        if limit is None or len(rows) <= limit:
+            return rows, None
+        products = rows[:limit]
+        return products, ProductService.encode_cursor(products[-1]["id"])
+    
+    def search(
+        self,
+        brand: Optional[str] = None,
+        color: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None,
+        exact: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Rows matching the filters like ProductService._plan_search's clauses, in id order."""
+        start = int(np.searchsorted(self.ids, after_id, side="right")) if after_id is not None else 0
+        if min_price is not None or max_price is not None:
+            low = np.searchsorted(self.sorted_price, min_price, side="left") if min_price is not None else 0
+            high = np.searchsorted(self.sorted_price, max_price, side="right") if max_price is not None else self.row_count
+            positions = np.sort(self.price_order[low:high])
+            positions = positions[positions >= start]
+        else:
+            positions = np.arange(start, self.row_count)
+        
+        for column, term in ((self.brand, brand), (self.color, color)):
+            if term:
+                predicate = (lambda value, term=term: value == term) if exact else _ilike_matcher(term)
+                positions = positions[column.mask(predicate, positions)]
+        
+        if limit is not None:
+            positions = positions[:limit]
+        return self.rows(positions)
+    
+    def rows(self, positions: np.ndarray) -> List[Dict[str, Any]]:
+        columns = (
+            self.text["sku"][positions].tolist(),
+            self.text["name"][positions].tolist(),
+            self.brand.values[self.brand.codes[positions]].tolist(),
+            self.color.values[self.color.codes[positions]].tolist(),
+            self.text["size"][positions].tolist(),
+            self.mrp[positions].tolist(),
+            self.price[positions].tolist(),
+            self.quantity[positions].tolist(),
+            self.ids[positions].tolist(),
+        )
+        return [dict(zip(PRODUCT_FIELDS, row)) for row in zip(*columns)]
+
+
+class CatalogReplica:
+    """In-memory read replica of the products table, one per database.
+
+    A snapshot is only served while the read caches are still in the generation
+    it was built in, so every upload or clear makes it stale. The next search
+    starts a rebuild in a background thread, which swaps the new snapshot in as
+    a whole; until then searches go to SQLite instead of waiting, so building
+    the arrays never runs on the event loop.
+    """
+    
+    _snapshots = weakref.WeakKeyDictionary()
+    _rebuilding = threading.Lock()
+    
+    @classmethod
+    def snapshot(cls, engine: Engine) -> Optional[CatalogSnapshot]:
+        """The up-to-date snapshot for engine's database, or None when SQL should answer.
+        
+        A missing or stale snapshot starts a rebuild on its own Session in a
+        background thread, unless one is already running.
+        """
+        current = cls._snapshots.get(engine)
+        if current is not None and current.generation == result_cache.generation:
+            return current
+        if cls._rebuilding.acquire(blocking=False):
+            threading.Thread(target=cls._rebuild_in_background, args=(engine,), name="catalog-replica", daemon=True).start()
+        return None
+    
+    @classmethod
+    def _rebuild_in_background(cls, engine: Engine) -> None:
+        try:
+            with Session(bind=engine) as db:
+                cls.rebuild(db)
+        finally:
+            cls._rebuilding.release()
+    
+    @classmethod
+    def rebuild(cls, db: Session) -> CatalogSnapshot:
+        # Read the generation first: a write that commits during the load bumps
+        # it, so the snapshot is already stale instead of silently missing rows
+        generation = result_cache.generation
+        rows = db.execute(select(*PRODUCT_COLUMNS).order_by(Product.id)).all()
+        snapshot = CatalogSnapshot(rows, generation)
+        cls._snapshots[db.get_bind()] = snapshot
+        return snapshot
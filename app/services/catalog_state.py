@@ -0,0 +1,102 @@
+import os
+import threading
+import time
+from typing import Callable, Optional
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from app.models import CatalogState
+from app.services.result_cache import invalidate_read_caches
+
+STATE_ID = 1
+
+# Multi-worker mode: before serving a /products request, each worker compares
+# catalog_state.version with the last one it saw and drops its in-process read
+# caches when another worker has written. On by default when uvicorn runs more
+# than one worker through WEB_CONCURRENCY.
+CATALOG_SYNC = os.getenv(
+    "CATALOG_SYNC", "1" if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 else "0"
+).lower() not in ("0", "false", "no")
+# Seconds between version checks per worker; 0 checks on every request
+CATALOG_SYNC_INTERVAL_SECONDS = float(os.getenv("CATALOG_SYNC_INTERVAL_SECONDS", "0"))
+
+
+class CatalogStateService:
+    """Maintained catalog counters so pagination metadata doesn't need COUNT(*) over products.
+
+    Writers adjust the counter inside their own transaction with a relative
+    UPDATE, so concurrent workers serialize on SQLite's write lock and the
+    value always matches the committed products table.
+    """
+    
+    @staticmethod
+    def get_product_count(db: Session) -> int:
+        # The row is seeded when catalog_state is created and by app.migrate
+        return db.scalar(select(CatalogState.product_count).where(CatalogState.id == STATE_ID)) or 0
+    
+    @staticmethod
+    def adjust_product_count(db: Session, delta: int) -> None:
+        if delta:
+            db.execute(
+                update(CatalogState)
+                .where(CatalogState.id == STATE_ID)
+                .values(product_count=CatalogState.product_count + delta)
+            )
+    
+    @staticmethod
+    def reset_product_count(db: Session) -> None:
+        db.execute(update(CatalogState).where(CatalogState.id == STATE_ID).values(product_count=0))
+    
+    @staticmethod
+    def bump_version(db: Session) -> None:
+        """Mark the catalog as changed; call inside the writing transaction, before commit."""
+        # Columns added by add_missing_columns start out NULL on existing rows
+        db.execute(
+            update(CatalogState)
+            .where(CatalogState.id == STATE_ID)
+            .values(version=func.coalesce(CatalogState.version, 0) + 1)
+        )
+    
+    @staticmethod
+    def get_version(db: Session) -> int:
+        return db.scalar(select(CatalogState.version).where(CatalogState.id == STATE_ID)) or 0
+
+
+class CatalogVersionSync:
+    """Keeps this process's read caches coherent with writes committed by other processes.
+        
+    Writers bump catalog_state.version in their own transaction. check() reads it
+    and invalidates the local caches (and with them the catalog replica) whenever
+    it differs from the version seen last, so a worker never serves results
+    cached before another worker's upload or clear.
+    """
+    
+    def __init__(self, enabled: bool, interval_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.enabled = enabled
+        self.interval_seconds = interval_seconds
+        self.seen_version: Optional[int] = None
+        self.invalidations = 0
+        self._clock = clock
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def due(self) -> bool:
+        if not self.enabled:
+            return False
+        checked_at = self._checked_at
+        return checked_at is None or self._clock() - checked_at >= self.interval_seconds
+    
+    def check(self, db: Session) -> bool:
+        """Read the catalog version; returns whether the local caches were invalidated."""
+        version = CatalogStateService.get_version(db)
+        with self._lock:
+            self._checked_at = self._clock()
+            changed = self.seen_version is not None and version != self.seen_version
+            self.seen_version = version
+            if changed:
+                self.invalidations += 1
+        if changed:
+            invalidate_read_caches()
+        return changed
+
+
+catalog_sync = CatalogVersionSync(CATALOG_SYNC, CATALOG_SYNC_INTERVAL_SECONDS)
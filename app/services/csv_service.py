@@ -1,21 +1,123 @@
-import pandas as pd
+import csv
+import hashlib
 import io
-from typing import List, Dict, Any, Tuple
+import os
+from operator import itemgetter
+from typing import List, Dict, Any, BinaryIO, Callable, Iterator, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.metrics import csv_stage
 from app.models import Product
+from app.services.catalog_state import CatalogStateService
+from app.services.result_cache import invalidate_read_caches
+
+# How uploads are parsed: "pandas" builds DataFrames; "stdlib" (csv module) and
+# "pyarrow" (pyarrow.csv) read plain column lists. All apply the same validation.
+CSV_ENGINE = os.getenv("CSV_ENGINE", "pandas")
+CSV_ENGINES = ("pandas", "stdlib", "pyarrow")
+
+if CSV_ENGINE not in CSV_ENGINES:
+    raise ValueError(f"Unknown CSV_ENGINE '{CSV_ENGINE}', expected one of: {', '.join(CSV_ENGINES)}")
+
+# Fields the non-pandas engines read; any other columns in the file are ignored
+CSV_FIELDS = ['sku', 'name', 'brand', 'color', 'size', 'mrp', 'price', 'quantity']
+
+# pandas' default na_values, so every engine treats the same cells as missing
+NA_VALUES = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+])
+
+# What the non-pandas engines give the validator as "missing"; pyarrow already maps NA tokens to None
+MISSING = NA_VALUES | {None}
+
+ValidatedChunk = Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]
+# One CSV record's CSV_FIELDS as raw strings (or None), in CSV_FIELDS order
+RawRow = Tuple[Optional[str], ...]
+
+
+def _safe_float(value: Any) -> float:
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return float('nan')
+
+
+def _coerce_quantity(value: Any) -> int:
+    try:
+        # None and NaN (the only value not equal to itself) count as missing
+        return int(value) if value is not None and value == value else 0
+    except (ValueError, TypeError):
+        return 0
+
+
+def _parse_quantity(value: Optional[str]) -> int:
+    # Like a numeric quantity column in pandas: "2.7" truncates to 2, anything unparseable is 0
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        try:
+            return int(float(value))
+        except (ValueError, TypeError, OverflowError):
+            return 0
+
+
+def _arrow_strings(array: Any) -> List[Optional[str]]:
+    """A pyarrow string array as Python strings, None for nulls.
+    
+    Slices the offsets and data buffers directly: about three times faster than
+    Array.to_pylist(), and unlike to_numpy() it doesn't import pandas.
+    """
+    import pyarrow.compute as pc
+    
+    _, offsets, data = array.buffers()
+    bounds = memoryview(offsets).cast("i")[array.offset:array.offset + len(array) + 1].tolist()
+    data = bytes(data) if data is not None else b""
+    values = [data[start:end].decode('utf-8') for start, end in zip(bounds, bounds[1:])]
+    if array.null_count:
+        for position in pc.indices_nonzero(array.is_null()).to_pylist():
+            values[position] = None
+    return values
+
+
+# Fields a catalog sync compares; sku identifies the row and id is ours
+CONTENT_FIELDS = ['name', 'brand', 'color', 'size', 'mrp', 'price', 'quantity']
+
+
+def content_hash(product_data: Dict[str, Any]) -> str:
+    values = tuple(product_data.get(field) for field in CONTENT_FIELDS)
+    return hashlib.blake2b(repr(values).encode('utf-8'), digest_size=16).hexdigest()
 
 
 class CSVService:
     REQUIRED_FIELDS = ['sku', 'name', 'brand', 'mrp', 'price']
+    TEXT_FIELDS = ['sku', 'name', 'brand', 'color', 'size']
+    # Read as strings: otherwise pandas infers types per chunk, and a chunk whose
+    # SKUs all look numeric would store "00123" as 123
+    TEXT_DTYPES = dict.fromkeys(TEXT_FIELDS, str)
+    # Rows per existence check / executemany insert; keeps IN (...) under SQLite's variable limit
+    STORE_CHUNK_SIZE = 500
+    # Rows per DataFrame when an upload is streamed instead of loaded whole
+    CHUNK_SIZE = 10_000
+    ENGINE = CSV_ENGINE
+    
     @staticmethod
-    def parse_csv(file_content: bytes) -> pd.DataFrame:
+    @csv_stage("parse")
+    def parse_csv(file_content: bytes) -> Any:
+        import pandas as pd
+        
         try:
-            return pd.read_csv(io.StringIO(file_content.decode('utf-8')))
+            return pd.read_csv(io.StringIO(file_content.decode('utf-8')), dtype=CSVService.TEXT_DTYPES)
         except Exception as e:
             raise ValueError(f"Invalid CSV format: {str(e)}")
     
     @classmethod
-    def validate_row(cls, row: pd.Series, index: int, existing_skus: set = None) -> List[str]:
+    def validate_row(cls, row: Any, index: int, existing_skus: set = None) -> List[str]:
+        import pandas as pd
+        
         errors = []
         
         for field in cls.REQUIRED_FIELDS:
@@ -30,7 +132,7 @@ class CSVService:
                     errors.append("Price must be less than or equal to MRP")
             except (ValueError, TypeError):
                 pass
-     
+        
         if 'quantity' in row and pd.notna(row['quantity']):
             try:
                 quantity = float(row['quantity'])
@@ -42,38 +144,460 @@ class CSVService:
         return errors
     
     @classmethod
-    def process_csv(cls, df: pd.DataFrame, db: Session) -> Dict[str, Any]:
+    def iter_csv_chunks(cls, file_obj: BinaryIO, chunk_size: int) -> Iterator[Any]:
+        """Yield DataFrames of at most chunk_size rows; the index keeps counting across chunks."""
+        import pandas as pd
+        
+        try:
+            reader = pd.read_csv(file_obj, encoding='utf-8', chunksize=chunk_size, dtype=cls.TEXT_DTYPES)
+        except Exception as e:
+            raise ValueError(f"Invalid CSV format: {str(e)}")
+        
+        with reader:
+            while True:
+                try:
+                    with csv_stage("parse"):
+                        chunk = next(reader)
+                except StopIteration:
+                    return
+                except Exception as e:
+                    raise ValueError(f"Invalid CSV format: {str(e)}")
+                yield chunk
+    
+    @classmethod
+    def process_csv(cls, df: Any, db: Session, sync: bool = False) -> Dict[str, Any]:
+        valid_products, validation_errors = cls.validate_dataframe(df)
+        
+        counts = cls._store_chunk(db, valid_products, validation_errors, sync)
+        cls._commit_stored(db, counts)
+        
+        return cls._summarize(len(df), counts, validation_errors)
+    
+    @classmethod
+    def process_csv_stream(
+        cls,
+        file_obj: BinaryIO,
+        db: Session,
+        chunk_size: Optional[int] = None,
+        on_chunk: Optional[Callable[[Dict[str, Any], List[Dict]], None]] = None,
+        sync: bool = False,
+        atomic: bool = True
+    ) -> Dict[str, Any]:
+        """Store the file chunk by chunk; memory stays bounded by chunk_size rows.
+        
+        With atomic (the default) the whole file is one transaction, committed
+        after the last chunk, so an error in any chunk leaves the catalog as it
+        was. atomic=False commits every chunk before calling on_chunk, for
+        background jobs whose progress has to be visible while they run.
+        """
+        total_rows = 0
+        counts = {}
+        validation_errors = []
+        seen_skus = set()
+        
+        try:
+            for row_count, valid_products, chunk_errors in cls.iter_validated_chunks(file_obj, chunk_size):
+                total_rows += row_count
+                chunk_counts = cls._store_chunk(db, valid_products, chunk_errors, sync, seen_skus)
+                cls._add_counts(counts, chunk_counts)
+                validation_errors.extend(chunk_errors)
+                if not atomic:
+                    cls._commit_stored(db, chunk_counts)
+        
+                if on_chunk:
+                    on_chunk(cls._summarize(total_rows, counts, validation_errors), chunk_errors)
+            if atomic:
+                cls._commit_stored(db, counts)
+        except Exception:
+            db.rollback()
+            raise
+        
+        return cls._summarize(total_rows, counts, validation_errors)
+    
+    @classmethod
+    async def process_csv_async(cls, df: Any, db: AsyncSession, sync: bool = False) -> Dict[str, Any]:
+        """process_csv on an AsyncSession: validation runs in a worker thread so the event loop stays free."""
+        valid_products, validation_errors = await run_in_threadpool(cls.validate_dataframe, df)
+        counts = await db.run_sync(cls._store_chunk, valid_products, validation_errors, sync)
+        await db.run_sync(cls._commit_stored, counts)
+        
+        return cls._summarize(len(df), counts, validation_errors)
+    
+    @classmethod
+    async def process_csv_bytes_async(cls, file_content: bytes, db: AsyncSession, sync: bool = False) -> Dict[str, Any]:
+        """Whole-file upload on an AsyncSession with the configured engine; parsing runs in a worker thread."""
+        total_rows, valid_products, validation_errors = await run_in_threadpool(cls.validate_csv, file_content)
+        counts = await db.run_sync(cls._store_chunk, valid_products, validation_errors, sync)
+        await db.run_sync(cls._commit_stored, counts)
+        
+        return cls._summarize(total_rows, counts, validation_errors)
+    
+    @classmethod
+    async def process_csv_stream_async(
+        cls,
+        file_obj: BinaryIO,
+        db: AsyncSession,
+        chunk_size: Optional[int] = None,
+        sync: bool = False
+    ) -> Dict[str, Any]:
+        """process_csv_stream on an AsyncSession: chunks are read and validated in a worker thread.
+        
+        Always atomic: the file is committed once, after its last chunk.
+        """
+        total_rows = 0
+        counts = {}
+        validation_errors = []
+        seen_skus = set()
+        
+        chunks = cls.iter_validated_chunks(file_obj, chunk_size)
+        try:
+            while True:
+                validated = await run_in_threadpool(next, chunks, None)
+                if validated is None:
+                    break
+                chunk_rows, valid_products, chunk_errors = validated
+                chunk_counts = await db.run_sync(cls._store_chunk, valid_products, chunk_errors, sync, seen_skus)
+        
+                total_rows += chunk_rows
+                cls._add_counts(counts, chunk_counts)
+                validation_errors.extend(chunk_errors)
+            await db.run_sync(cls._commit_stored, counts)
+        except Exception:
+            await db.rollback()
+            raise
+        
+        return cls._summarize(total_rows, counts, validation_errors)
+    
+    @classmethod
+    def validate_csv(cls, file_content: bytes, engine: Optional[str] = None) -> ValidatedChunk:
+        """Parse and validate a whole file: its row count, valid products and validation errors."""
+        engine = engine or cls.ENGINE
+        if engine == "pandas":
+            df = cls.parse_csv(file_content)
+            valid_products, validation_errors = cls.validate_dataframe(df)
+            return len(df), valid_products, validation_errors
+        
+        total_rows = 0
+        valid_products = []
+        validation_errors = []
+        for row_count, chunk_products, chunk_errors in cls.iter_validated_chunks(io.BytesIO(file_content), engine=engine):
+            total_rows += row_count
+            valid_products.extend(chunk_products)
+            validation_errors.extend(chunk_errors)
+        return total_rows, valid_products, validation_errors
+    
+    @classmethod
+    def iter_validated_chunks(
+        cls,
+        file_obj: BinaryIO,
+        chunk_size: Optional[int] = None,
+        engine: Optional[str] = None
+    ) -> Iterator[ValidatedChunk]:
+        """Row count, valid products and validation errors for each chunk_size rows; row numbers are global."""
+        engine = engine or cls.ENGINE
+        chunk_size = chunk_size or cls.CHUNK_SIZE
+        if engine == "pandas":
+            for df in cls.iter_csv_chunks(file_obj, chunk_size):
+                valid_products, validation_errors = cls.validate_dataframe(df)
+                yield len(df), valid_products, validation_errors
+            return
+        
+        read_rows = cls.iter_pyarrow_rows if engine == "pyarrow" else cls.iter_stdlib_rows
+        first_row = 1
+        for rows in read_rows(file_obj, chunk_size):
+            valid_products, validation_errors = cls.validate_rows(rows, first_row)
+            first_row += len(rows)
+            yield len(rows), valid_products, validation_errors
+    
+    @classmethod
+    def iter_stdlib_rows(cls, file_obj: BinaryIO, chunk_size: int) -> Iterator[List[RawRow]]:
+        """Lists of at most chunk_size RawRows read with the csv module."""
+        text = io.TextIOWrapper(file_obj, encoding='utf-8-sig', newline='')
+        try:
+            reader = csv.reader(text)
+            with csv_stage("parse"):
+                header = cls._read_records(reader, 1)
+            if not header:
+                raise ValueError("Invalid CSV format: No columns to parse from file")
+            header = header[0]
+            width = len(header)
+            # Records get padded to width + 1; fields missing from the header read that last, empty cell
+            pick = itemgetter(*[header.index(field) if field in header else width for field in CSV_FIELDS])
+            padding = [''] * (width + 1)
+        
+            while True:
+                with csv_stage("parse"):
+                    records = cls._read_records(reader, chunk_size, width)
+                    for record in records:
+                        record.extend(padding[len(record):])
+                    rows = [pick(record) for record in records]
+                if not rows:
+                    return
+                yield rows
+        finally:
+            # Leave the caller's file open
+            text.detach()
+    
+    @staticmethod
+    def _read_records(reader: Iterator[List[str]], limit: int, width: Optional[int] = None) -> List[List[str]]:
+        records = []
+        try:
+            for record in reader:
+                if not record:
+                    # pandas skips blank lines without counting them as rows
+                    continue
+                if width is not None and len(record) > width:
+                    raise ValueError(f"Expected {width} fields in line {reader.line_num}, saw {len(record)}")
+                records.append(record)
+                if len(records) >= limit:
+                    break
+        except (csv.Error, UnicodeDecodeError, ValueError) as e:
+            raise ValueError(f"Invalid CSV format: {str(e)}")
+        return records
+    
+    @staticmethod
+    def iter_pyarrow_rows(file_obj: BinaryIO, chunk_size: int) -> Iterator[List[RawRow]]:
+        """iter_stdlib_rows with pyarrow.csv's multithreaded tokenizer; every column is read as text."""
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        
+        convert_options = pa_csv.ConvertOptions(
+            column_types={field: pa.string() for field in CSV_FIELDS},
+            include_columns=CSV_FIELDS,
+            include_missing_columns=True,
+            null_values=sorted(NA_VALUES),
+            strings_can_be_null=True
+        )
+        try:
+            with csv_stage("parse"):
+                reader = pa_csv.open_csv(
+                    file_obj,
+                    parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+                    convert_options=convert_options
+                )
+            while True:
+                with csv_stage("parse"):
+                    try:
+                        batch = reader.read_next_batch()
+                    except StopIteration:
+                        return
+                for start in range(0, batch.num_rows, chunk_size):
+                    part = batch.slice(start, chunk_size)
+                    columns = [_arrow_strings(part.column(field)) for field in CSV_FIELDS]
+                    yield list(zip(*columns))
+        except pa.ArrowInvalid as e:
+            message = "No columns to parse from file" if "Empty CSV file" in str(e) else str(e)
+            raise ValueError(f"Invalid CSV format: {message}")
+    
+    @classmethod
+    @csv_stage("validate")
+    def validate_rows(cls, rows: List[RawRow], first_row: int = 1) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """validate_dataframe for RawRows, without building a DataFrame."""
         valid_products = []
         validation_errors = []
+        for row, (sku, name, brand, color, size, mrp, price, quantity) in enumerate(rows, first_row):
+            sku = '' if sku in MISSING else sku.strip()
+            name = '' if name in MISSING else name.strip()
+            brand = '' if brand in MISSING else brand.strip()
+            # NA tokens and non-numeric text both become NaN here, and NaN compares False as in validate_row
+            mrp_value = _safe_float(mrp)
+            price_value = _safe_float(price)
+            mrp_missing = mrp_value != mrp_value and (mrp in MISSING or not mrp.strip())
+            price_missing = price_value != price_value and (price in MISSING or not price.strip())
+            price_over_mrp = price_value > mrp_value
+            negative_quantity = _safe_float(quantity) < 0
         
-        for index, row in df.iterrows():
-            row_errors = cls.validate_row(row, index)
-            
-            if row_errors:
-                validation_errors.append({"row": index + 1, "errors": row_errors})
-            else:
-                product_data = cls._create_product_data(row)
-                valid_products.append(product_data)
+            if sku and name and brand and not (mrp_missing or price_missing or price_over_mrp or negative_quantity):
+                valid_products.append({
+                    'sku': sku,
+                    'name': name,
+                    'brand': brand,
+                    'color': None if color in MISSING else color.strip(),
+                    'size': None if size in MISSING else size.strip(),
+                    # float() again only to raise pandas' error for a non-numeric price or MRP
+                    'mrp': mrp_value if mrp_value == mrp_value else float(mrp),
+                    'price': price_value if price_value == price_value else float(price),
+                    'quantity': _parse_quantity(quantity),
+                })
+                continue
         
-        stored_count = cls._store_products(valid_products, db, validation_errors)
-        skipped_duplicates = len(valid_products) - stored_count
+            missing = {'sku': not sku, 'name': not name, 'brand': not brand, 'mrp': mrp_missing, 'price': price_missing}
+            row_errors = [f"Missing required field: {field}" for field in cls.REQUIRED_FIELDS if missing[field]]
+            if price_over_mrp:
+                row_errors.append("Price must be less than or equal to MRP")
+            if negative_quantity:
+                row_errors.append("Quantity must be greater than or equal to 0")
+            validation_errors.append({"row": row, "errors": row_errors})
+        return valid_products, validation_errors
+    
+    @classmethod
+    @csv_stage("store")
+    def _store_chunk(
+        cls,
+        db: Session,
+        valid_products: List[Dict[str, Any]],
+        errors: List[Dict],
+        sync: bool = False,
+        seen_skus: Optional[set] = None
+    ) -> Dict[str, int]:
+        """Store one batch of validated rows and return its counts; session-first for AsyncSession.run_sync.
         
-        return {
+        Nothing is committed: see _commit_stored. Chunked callers pass one
+        seen_skus set for the whole file, so a sync skips a repeated SKU no
+        matter which chunk its first occurrence was in.
+        """
+        if sync:
+            return cls._sync_products(valid_products, db, errors, seen_skus)
+        stored_count = cls._store_products(valid_products, db, errors)
+        return {"stored": stored_count, "skipped_duplicates": len(valid_products) - stored_count}
+    
+    @staticmethod
+    @csv_stage("store")
+    def _commit_stored(db: Session, counts: Dict[str, int]) -> None:
+        """Commit what _store_chunk wrote; readers and other workers see the rows from here on."""
+        if counts.get("stored"):
+            CatalogStateService.bump_version(db)
+        db.commit()
+        if counts.get("stored"):
+            invalidate_read_caches()
+    
+    @staticmethod
+    def _add_counts(totals: Dict[str, int], counts: Dict[str, int]) -> None:
+        for key, value in counts.items():
+            totals[key] = totals.get(key, 0) + value
+    
+    @staticmethod
+    def _summarize(total_rows: int, counts: Dict[str, int], validation_errors: List[Dict]) -> Dict[str, Any]:
+        summary = {
             "message": "Successfully processed CSV file",
-            "total_rows": len(df),
-            "valid_products_stored": stored_count,
+            "total_rows": total_rows,
+            "valid_products_stored": counts.get("stored", 0),
             "validation_errors_count": len(validation_errors),
-            "skipped_duplicates": skipped_duplicates,
-            "errors": validation_errors
+            "skipped_duplicates": counts.get("skipped_duplicates", 0),
         }
+        if "unchanged" in counts:
+            summary.update(
+                inserted=counts["inserted"],
+                updated=counts["updated"],
+                unchanged=counts["unchanged"]
+            )
+        summary["errors"] = validation_errors
+        return summary
+    
+    @classmethod
+    @csv_stage("validate")
+    def validate_dataframe(cls, df: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Column-wise equivalent of running validate_row and _create_product_data over every row."""
+        import numpy as np
+        
+        # Each text column is stripped once and shared by the missing-field
+        # masks and the product dicts built for the valid rows.
+        text = {
+            field: df[field].astype(str).str.strip()
+            for field in cls.TEXT_FIELDS
+            if field in df.columns
+        }
+        missing = {field: cls._missing_mask(df, field, text.get(field)) for field in cls.REQUIRED_FIELDS}
+        
+        if 'price' in df.columns and 'mrp' in df.columns:
+            price_over_mrp = (cls._to_float(df['price']) > cls._to_float(df['mrp'])).to_numpy()
+        else:
+            price_over_mrp = np.zeros(len(df), dtype=bool)
+        
+        if 'quantity' in df.columns:
+            negative_quantity = (cls._to_float(df['quantity']) < 0).to_numpy()
+        else:
+            negative_quantity = np.zeros(len(df), dtype=bool)
+        
+        has_errors = price_over_mrp | negative_quantity
+        for mask in missing.values():
+            has_errors = has_errors | mask
+        
+        validation_errors = []
+        for position in np.flatnonzero(has_errors):
+            row_errors = [
+                f"Missing required field: {field}"
+                for field in cls.REQUIRED_FIELDS
+                if missing[field][position]
+            ]
+            if price_over_mrp[position]:
+                row_errors.append("Price must be less than or equal to MRP")
+            if negative_quantity[position]:
+                row_errors.append("Quantity must be greater than or equal to 0")
+            validation_errors.append({"row": int(df.index[position]) + 1, "errors": row_errors})
+        
+        valid = ~has_errors
+        valid_products = cls._create_products_data(
+            df[valid], {field: column[valid] for field, column in text.items()}
+        )
+        return valid_products, validation_errors
     
     @staticmethod
-    def _create_product_data(row: pd.Series) -> Dict[str, Any]:
-        quantity = row.get('quantity', 0)
-        try:
-            quantity = int(quantity) if pd.notna(quantity) else 0
-        except (ValueError, TypeError):
-            quantity = 0
+    def _missing_mask(df: Any, field: str, stripped: Optional[Any]) -> Any:
+        import numpy as np
+        
+        if field not in df.columns:
+            return np.ones(len(df), dtype=bool)
+        mask = df[field].isna()
+        if stripped is not None:
+            mask |= stripped.eq('')
+        elif df[field].dtype == object:
+            mask |= df[field].astype(str).str.strip().eq('')
+        return mask.to_numpy()
+    
+    @staticmethod
+    def _to_float(column: Any) -> Any:
+        # Values that float() rejects become NaN, so comparisons on them are False
+        # exactly like the try/except in validate_row.
+        import pandas as pd
+        
+        if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+            return column.astype(float)
+        return column.map(_safe_float).astype(float)
+    
+    @classmethod
+    def _create_products_data(cls, df: Any, text: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if df.empty:
+            return []
+        
+        columns = {
+            'sku': text['sku'].tolist(),
+            'name': text['name'].tolist(),
+            'brand': text['brand'].tolist(),
+            'color': cls._optional_text(df, text, 'color'),
+            'size': cls._optional_text(df, text, 'size'),
+            'mrp': df['mrp'].astype(float).tolist(),
+            'price': df['price'].astype(float).tolist(),
+            'quantity': cls._quantities(df),
+        }
+        keys = list(columns)
+        return [dict(zip(keys, values)) for values in zip(*columns.values())]
+    
+    @staticmethod
+    def _optional_text(df: Any, text: Dict[str, Any], field: str) -> List[Any]:
+        if field not in text:
+            return [None] * len(df)
+        return text[field].astype(object).where(df[field].notna(), None).tolist()
+    
+    @staticmethod
+    def _quantities(df: Any) -> List[int]:
+        import pandas as pd
+        import numpy as np
+        
+        if 'quantity' not in df.columns:
+            return [0] * len(df)
+        column = df['quantity']
+        if pd.api.types.is_integer_dtype(column):
+            return column.tolist()
+        if pd.api.types.is_float_dtype(column):
+            return column.fillna(0).astype(np.int64).tolist()
+        return column.map(_coerce_quantity).tolist()
+    
+    @staticmethod
+    def _create_product_data(row: Any) -> Dict[str, Any]:
+        import pandas as pd
+        
+        quantity = _coerce_quantity(row.get('quantity', 0))
         
         return {
             'sku': str(row['sku']).strip(),
@@ -86,21 +610,102 @@ class CSVService:
             'quantity': quantity
         }
     
-    @staticmethod
-    def _store_products(valid_products: List[Dict[str, Any]], db: Session, errors: List[Dict]) -> int:
+    @classmethod
+    def _store_products(cls, valid_products: List[Dict[str, Any]], db: Session, errors: List[Dict]) -> int:
         stored_count = 0
-        skipped_duplicates = 0
+        seen_skus = set()
+        
+        for start in range(0, len(valid_products), cls.STORE_CHUNK_SIZE):
+            chunk = valid_products[start:start + cls.STORE_CHUNK_SIZE]
+            chunk_skus = {product_data['sku'] for product_data in chunk} - seen_skus
+            seen_skus |= cls._existing_skus(db, chunk_skus)
         
-        for product_data in valid_products:
-            existing_product = db.query(Product).filter(Product.sku == product_data['sku']).first()
-            if existing_product:
-                # Skip duplicates but don't count as validation errors
-                skipped_duplicates += 1
+            new_products = []
+            for product_data in chunk:
+                if product_data['sku'] in seen_skus:
+                    # Skip duplicates (in the database or earlier in the file)
+                    # but don't count them as validation errors
+                    continue
+                seen_skus.add(product_data['sku'])
+                new_products.append(dict(product_data, content_hash=content_hash(product_data)))
+        
+            if new_products:
+                # Another writer may commit one of these SKUs after the lookup above;
+                # the rowcount leaves rows it already stored out of stored_count
+                stored_count += db.execute(cls._insert_new_statement(), new_products).rowcount
+        
+        CatalogStateService.adjust_product_count(db, stored_count)
+        return stored_count
+    
+    @classmethod
+    def _sync_products(
+        cls,
+        valid_products: List[Dict[str, Any]],
+        db: Session,
+        errors: List[Dict],
+        seen_skus: Optional[set] = None
+    ) -> Dict[str, int]:
+        """Upsert rows whose content hash differs from the stored one; identical rows aren't written.
+        
+        Later occurrences of a SKU within the file are skipped like in a normal
+        upload; seen_skus carries the SKUs of earlier chunks.
+        """
+        counts = {"stored": 0, "skipped_duplicates": 0, "inserted": 0, "updated": 0, "unchanged": 0}
+        seen_skus = set() if seen_skus is None else seen_skus
+        
+        for start in range(0, len(valid_products), cls.STORE_CHUNK_SIZE):
+            chunk = []
+            for product_data in valid_products[start:start + cls.STORE_CHUNK_SIZE]:
+                if product_data['sku'] in seen_skus:
+                    counts["skipped_duplicates"] += 1
+                    continue
+                seen_skus.add(product_data['sku'])
+                chunk.append(dict(product_data, content_hash=content_hash(product_data)))
+            if not chunk:
                 continue
-            
-            product = Product(**product_data)
-            db.add(product)
-            stored_count += 1
         
-        db.commit()
-        return stored_count
\ No newline at end of file
+            stored_hashes = cls._stored_hashes(db, {product_data['sku'] for product_data in chunk})
+            changed = []
+            for product_data in chunk:
+                sku = product_data['sku']
+                if sku not in stored_hashes:
+                    counts["inserted"] += 1
+                elif stored_hashes[sku] != product_data['content_hash']:
+                    counts["updated"] += 1
+                else:
+                    counts["unchanged"] += 1
+                    continue
+                changed.append(product_data)
+        
+            if changed:
+                db.execute(cls._upsert_statement(), changed)
+        
+        counts["stored"] = counts["inserted"] + counts["updated"]
+        CatalogStateService.adjust_product_count(db, counts["inserted"])
+        return counts
+    
+    @staticmethod
+    def _insert_new_statement():
+        # On the Core table: the ORM bulk insert path doesn't report a rowcount
+        return sqlite_insert(Product.__table__).on_conflict_do_nothing(index_elements=[Product.sku])
+    
+    @staticmethod
+    def _upsert_statement():
+        statement = sqlite_insert(Product)
+        excluded = statement.excluded
+        # The WHERE keeps a row that became identical since the hash lookup from being rewritten
+        return statement.on_conflict_do_update(
+            index_elements=[Product.sku],
+            set_={field: excluded[field] for field in CONTENT_FIELDS + ['content_hash']},
+            where=Product.content_hash.is_distinct_from(excluded.content_hash)
+        )
+    
+    @staticmethod
+    def _stored_hashes(db: Session, skus: set) -> Dict[str, Optional[str]]:
+        return dict(db.execute(select(Product.sku, Product.content_hash).where(Product.sku.in_(skus))).all())
+    
+    @staticmethod
+    def _existing_skus(db: Session, skus: set) -> set:
+        if not skus:
+            return set()
+        return set(db.scalars(select(Product.sku).where(Product.sku.in_(skus))))
@@ -0,0 +1,169 @@
+import os
+from typing import Any, Iterator, List, Optional
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.models import Product
+from app.services.product_service import ProductService
+
+# Rows per pd.read_sql chunk, Parquet row group and Arrow record batch
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "10000"))
+
+# The /upload CSV columns, so an export can be uploaded again as-is
+EXPORT_COLUMNS = [
+    Product.sku,
+    Product.name,
+    Product.brand,
+    Product.color,
+    Product.size,
+    Product.mrp,
+    Product.price,
+    Product.quantity,
+]
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+}
+
+
+class _ChunkSink:
+    """Write-only file object that hands back what was written since the last drain.
+    
+    tell() keeps counting across drains, which the Parquet writer relies on for
+    the offsets in its footer.
+    """
+    
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+        self.closed = False
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def flush(self) -> None:
+        pass
+    
+    def close(self) -> None:
+        self.closed = True
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+class ExportService:
+    @staticmethod
+    def export_statement(
+        db: Session,
+        brand: Optional[str] = None,
+        color: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        exact: bool = False
+    ):
+        """The search plan for the given filters, selecting the upload CSV columns."""
+        filters, order_by = ProductService._plan_search(db, brand, color, min_price, max_price, exact)
+        return select(*EXPORT_COLUMNS).where(*filters).order_by(order_by)
+    
+    @classmethod
+    def iter_export(
+        cls,
+        engine: Engine,
+        format: str = "csv",
+        brand: Optional[str] = None,
+        color: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        exact: bool = False,
+        chunk_size: int = EXPORT_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Encoded export of the matching products, read and yielded chunk_size rows at a time.
+        
+        The whole export reads from one connection, so it is a consistent snapshot
+        even while uploads commit.
+        """
+        import pandas as pd
+        
+        encode = {"csv": cls._encode_csv, "parquet": cls._encode_parquet, "arrow": cls._encode_arrow}[format]
+        with Session(bind=engine) as db:
+            statement = cls.export_statement(db, brand, color, min_price, max_price, exact)
+            chunks = pd.read_sql(
+                statement,
+                db.connection(),
+                chunksize=chunk_size,
+                dtype={"quantity": "Int64"}
+            )
+            yield from encode(cls._with_columns(chunks))
+    
+    @staticmethod
+    def _with_columns(chunks: Iterator[Any]) -> Iterator[Any]:
+        # read_sql yields nothing for an empty result; exports still get a header / schema
+        import pandas as pd
+        
+        empty = True
+        for df in chunks:
+            empty = False
+            yield df
+        if empty:
+            yield pd.DataFrame({column.key: pd.Series(dtype=object) for column in EXPORT_COLUMNS})
+    
+    @staticmethod
+    def _encode_csv(chunks: Iterator[Any]) -> Iterator[bytes]:
+        header = True
+        for df in chunks:
+            yield df.to_csv(index=False, header=header).encode('utf-8')
+            header = False
+    
+    @classmethod
+    def _encode_parquet(cls, chunks: Iterator[Any]) -> Iterator[bytes]:
+        import pyarrow.parquet as pq
+        
+        sink = _ChunkSink()
+        with pq.ParquetWriter(sink, cls._arrow_schema()) as writer:
+            for df in chunks:
+                writer.write_table(cls._to_arrow(df))
+                yield sink.drain()
+        yield sink.drain()
+    
+    @classmethod
+    def _encode_arrow(cls, chunks: Iterator[Any]) -> Iterator[bytes]:
+        import pyarrow as pa
+        
+        sink = _ChunkSink()
+        with pa.ipc.new_stream(sink, cls._arrow_schema()) as writer:
+            for df in chunks:
+                writer.write_table(cls._to_arrow(df))
+                yield sink.drain()
+        yield sink.drain()
+    
+    @staticmethod
+    def _arrow_schema() -> Any:
+        # Fixed up front: a chunk whose colors are all NULL would otherwise infer a null-typed column
+        import pyarrow as pa
+        
+        return pa.schema([
+            ("sku", pa.string()),
+            ("name", pa.string()),
+            ("brand", pa.string()),
+            ("color", pa.string()),
+            ("size", pa.string()),
+            ("mrp", pa.float64()),
+            ("price", pa.float64()),
+            ("quantity", pa.int64()),
+        ])
+    
+    @classmethod
+    def _to_arrow(cls, df: Any) -> Any:
+        import pyarrow as pa
+        
+        return pa.Table.from_pandas(df, schema=cls._arrow_schema(), preserve_index=False)
@@ -0,0 +1,112 @@
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import func, literal, select
+from sqlalchemy.orm import Session
+from app.models import PRICE_BAND_BOUNDS, Product, ProductFacet, price_band_range
+from app.services.product_service import ProductService
+
+# (brand, color, price band, count); color is '' for products without one
+FacetCount = Tuple[str, str, int, int]
+
+
+class FacetService:
+    @staticmethod
+    def get_facets(
+        db: Session,
+        brand: Optional[str] = None,
+        color: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        exact: bool = False,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """Brand, color and price-band counts over the products the same search would return.
+        
+        Price bands that lie entirely inside the price range are read from
+        product_facets. Only the (at most two) bands the range cuts through are
+        counted on products, using the search plan narrowed to that band.
+        """
+        full_bands, partial_bands = FacetService._split_bands(min_price, max_price)
+        counts: List[FacetCount] = []
+        if full_bands:
+            counts.extend(db.execute(
+                select(ProductFacet.brand, ProductFacet.color, ProductFacet.price_band, ProductFacet.product_count)
+                .where(
+                    ProductFacet.price_band.in_(full_bands),
+                    ProductFacet.product_count > 0,
+                    *FacetService._facet_filters(brand, color, exact)
+                )
+            ).all())
+        for band in partial_bands:
+            counts.extend(FacetService._count_band(db, band, brand, color, min_price, max_price, exact))
+        return FacetService._summarize(counts, sorted(full_bands + partial_bands), limit)
+    
+    @staticmethod
+    def _split_bands(min_price: Optional[float], max_price: Optional[float]) -> Tuple[List[int], List[int]]:
+        """Bands the price range covers completely, and bands it only overlaps."""
+        full_bands, partial_bands = [], []
+        for band in range(len(PRICE_BAND_BOUNDS) + 1):
+            lower, upper = price_band_range(band)
+            if (max_price is not None and lower is not None and max_price < lower) or \
+                    (min_price is not None and upper is not None and min_price >= upper):
+                continue
+            covers_lower = min_price is None or (lower is not None and min_price <= lower)
+            covers_upper = max_price is None or (upper is not None and max_price >= upper)
+            (full_bands if covers_lower and covers_upper else partial_bands).append(band)
+        return full_bands, partial_bands
+    
+    @staticmethod
+    def _facet_filters(brand: Optional[str], color: Optional[str], exact: bool) -> list:
+        # The same matching as ProductService._plan_search, on the facet values
+        filters = []
+        if brand:
+            filters.append(ProductFacet.brand == brand if exact else ProductFacet.brand.ilike(f"%{brand}%"))
+        if color:
+            filters.append(ProductFacet.color == color if exact else ProductFacet.color.ilike(f"%{color}%"))
+        return filters
+    
+    @staticmethod
+    def _count_band(
+        db: Session,
+        band: int,
+        brand: Optional[str],
+        color: Optional[str],
+        min_price: Optional[float],
+        max_price: Optional[float],
+        exact: bool
+    ) -> List[FacetCount]:
+        filters, _ = ProductService._plan_search(db, brand, color, min_price, max_price, exact)
+        lower, upper = price_band_range(band)
+        if lower is not None:
+            filters.append(Product.price >= lower)
+        if upper is not None:
+            filters.append(Product.price < upper)
+        
+        color_value = func.coalesce(Product.color, '')
+        return db.execute(
+            select(Product.brand, color_value, literal(band), func.count())
+            .where(*filters)
+            .group_by(Product.brand, color_value)
+        ).all()
+    
+    @staticmethod
+    def _summarize(counts: List[FacetCount], bands: List[int], limit: int) -> Dict[str, Any]:
+        brands, colors, band_counts = Counter(), Counter(), Counter()
+        for brand, color, band, count in counts:
+            brands[brand] += count
+            colors[color or None] += count
+            band_counts[band] += count
+        
+        def top(counter: Counter) -> List[Dict[str, Any]]:
+            ordered = sorted(counter.items(), key=lambda item: (-item[1], item[0] is None, item[0] or ''))
+            return [{"value": value, "count": count} for value, count in ordered[:limit]]
+        
+        return {
+            "total_products": sum(band_counts.values()),
+            "brands": top(brands),
+            "colors": top(colors),
+            "price_bands": [
+                {"min": lower, "max": upper, "count": band_counts[band]}
+                for band, (lower, upper) in ((band, price_band_range(band)) for band in bands)
+            ],
+        }
@@ -0,0 +1,212 @@
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from sqlalchemy import insert, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.models import ImportJob, ImportJobError
+from app.schemas import ImportJobResponse
+
+IMPORT_WORKERS = int(os.getenv("IMPORT_WORKERS", "2"))
+IMPORT_JOB_DIR = os.getenv("IMPORT_JOB_DIR", os.path.join(tempfile.gettempdir(), "product-import-jobs"))
+# With MIGRATE_ON_STARTUP, a running job whose progress hasn't moved for this long
+# belonged to a worker that died; python -m app.migrate fails all running jobs
+IMPORT_JOB_STALE_SECONDS = int(os.getenv("IMPORT_JOB_STALE_SECONDS", "300"))
+
+_executor = ThreadPoolExecutor(max_workers=IMPORT_WORKERS, thread_name_prefix="import-job")
+
+
+class JobService:
+    @classmethod
+    def create_job(
+        cls,
+        db: Session,
+        filename: str,
+        file_obj: BinaryIO,
+        workers: int = 1,
+        sync: bool = False
+    ) -> ImportJob:
+        """Copy the upload out of the request's spooled file and record a queued job."""
+        job_id, file_path = cls.save_upload(file_obj)
+        return cls.record_job(db, job_id, filename, file_path, workers, sync)
+    
+    @staticmethod
+    def save_upload(file_obj: BinaryIO) -> Tuple[str, str]:
+        os.makedirs(IMPORT_JOB_DIR, exist_ok=True)
+        job_id = str(uuid.uuid4())
+        file_path = os.path.join(IMPORT_JOB_DIR, f"{job_id}.csv")
+        with open(file_path, "wb") as f:
+            shutil.copyfileobj(file_obj, f)
+        return job_id, file_path
+    
+    @staticmethod
+    def record_job(
+        db: Session,
+        job_id: str,
+        filename: str,
+        file_path: str,
+        workers: int = 1,
+        sync: bool = False
+    ) -> ImportJob:
+        now = datetime.utcnow()
+        job = ImportJob(
+            id=job_id,
+            filename=filename,
+            file_path=file_path,
+            status="queued",
+            sync=sync,
+            workers=workers,
+            created_at=now,
+            updated_at=now
+        )
+        db.add(job)
+        db.commit()
+        return job
+    
+    @classmethod
+    def submit(cls, job_id: str, engine: Engine, workers: int = 1, sync: bool = False) -> Future:
+        return _executor.submit(cls.run_job, job_id, engine, workers, sync)
+    
+    @classmethod
+    def run_job(cls, job_id: str, engine: Engine, workers: int = 1, sync: bool = False) -> None:
+        with Session(bind=engine) as db:
+            now = datetime.utcnow()
+            # Claiming with a conditional UPDATE keeps two workers from running the same job
+            claimed = db.execute(
+                update(ImportJob)
+                .where(ImportJob.id == job_id, ImportJob.status == "queued")
+                .values(status="running", started_at=now, updated_at=now)
+            ).rowcount
+            db.commit()
+            if not claimed:
+                return
+            
+            file_path = db.get(ImportJob, job_id).file_path
+            
+            def record_progress(summary: Dict[str, Any], chunk_errors: List[Dict]) -> None:
+                cls._record_progress(db, job_id, summary, chunk_errors)
+            
+            # Imported here so API workers only load pandas once an import actually runs
+            from app.services.csv_service import CSVService
+            from app.services.parallel_csv import ParallelCSVService
+            
+            try:
+                if workers > 1:
+                    ParallelCSVService.process_csv_parallel(file_path, db, workers, on_chunk=record_progress, sync=sync, atomic=False)
+                else:
+                    with open(file_path, "rb") as f:
+                        CSVService.process_csv_stream(f, db, on_chunk=record_progress, sync=sync, atomic=False)
+            except Exception as e:
+                db.rollback()
+                cls._finish(db, job_id, "failed", str(e))
+            else:
+                cls._finish(db, job_id, "completed")
+            finally:
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+    
+    @staticmethod
+    def _record_progress(db: Session, job_id: str, summary: Dict[str, Any], chunk_errors: List[Dict]) -> None:
+        if chunk_errors:
+            db.execute(insert(ImportJobError), [
+                {"job_id": job_id, "row": error["row"], "errors": json.dumps(error["errors"])}
+                for error in chunk_errors
+            ])
+        db.execute(
+            update(ImportJob)
+            .where(ImportJob.id == job_id)
+            .values(
+                rows_processed=summary["total_rows"],
+                valid_products_stored=summary["valid_products_stored"],
+                skipped_duplicates=summary["skipped_duplicates"],
+                validation_errors_count=summary["validation_errors_count"],
+                inserted=summary.get("inserted"),
+                updated=summary.get("updated"),
+                unchanged=summary.get("unchanged"),
+                updated_at=datetime.utcnow()
+            )
+        )
+        db.commit()
+    
+    @staticmethod
+    def _finish(db: Session, job_id: str, status: str, detail: Optional[str] = None) -> None:
+        now = datetime.utcnow()
+        db.execute(
+            update(ImportJob)
+            .where(ImportJob.id == job_id)
+            .values(status=status, detail=detail, updated_at=now, finished_at=now)
+        )
+        db.commit()
+    
+    @staticmethod
+    def get_job(db: Session, job_id: str) -> Optional[ImportJobResponse]:
+        job = db.get(ImportJob, job_id)
+        if job is None:
+            return None
+        
+        rows_per_second = None
+        if job.started_at is not None:
+            elapsed = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+            if elapsed > 0:
+                rows_per_second = round(job.rows_processed / elapsed, 1)
+        
+        errors = db.query(ImportJobError).filter(ImportJobError.job_id == job_id).order_by(ImportJobError.id).all()
+        
+        return ImportJobResponse(
+            job_id=job.id,
+            status=job.status,
+            filename=job.filename,
+            rows_processed=job.rows_processed or 0,
+            valid_products_stored=job.valid_products_stored or 0,
+            skipped_duplicates=job.skipped_duplicates or 0,
+            validation_errors_count=job.validation_errors_count or 0,
+            sync=bool(job.sync),
+            workers=job.workers or 1,
+            inserted=job.inserted,
+            updated=job.updated,
+            unchanged=job.unchanged,
+            rows_per_second=rows_per_second,
+            detail=job.detail,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            errors=[{"row": error.row, "errors": json.loads(error.errors)} for error in errors]
+        )
+    
+    @staticmethod
+    def fail_interrupted_jobs(engine: Engine, stale_seconds: int = 0) -> int:
+        """Fail running jobs whose progress is older than stale_seconds; returns how many.
+        
+        With the default of 0 every running job is failed, which is only right
+        while no API worker is up, i.e. in ``python -m app.migrate``.
+        """
+        with Session(bind=engine) as db:
+            stale_before = datetime.utcnow() - timedelta(seconds=stale_seconds)
+            failed = db.execute(
+                update(ImportJob)
+                .where(ImportJob.status == "running", ImportJob.updated_at <= stale_before)
+                .values(status="failed", detail="Interrupted by a worker restart", finished_at=datetime.utcnow())
+            ).rowcount
+            db.commit()
+            return failed
+    
+    @classmethod
+    def recover_jobs(cls, engine: Engine) -> None:
+        """Submit jobs a previous process accepted but never started.
+        
+        Every API worker calls this on startup; run_job's conditional claim lets
+        exactly one of them run each job.
+        """
+        with Session(bind=engine) as db:
+            queued = db.query(ImportJob).filter(ImportJob.status == "queued").all()
+            for job in queued:
+                if job.file_path and os.path.exists(job.file_path):
+                    # Columns added to an existing import_jobs table are NULL on older rows
+                    cls.submit(job.id, engine, job.workers or 1, bool(job.sync))
+                else:
+                    cls._finish(db, job.id, "failed", "Uploaded file is no longer available")
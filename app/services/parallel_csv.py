@@ -0,0 +1,180 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.metrics import csv_stage
+from app.services.csv_service import CSVService
+
+# Bytes of CSV handed to one worker at a time
+CSV_PARTITION_BYTES = int(os.getenv("CSV_PARTITION_BYTES", str(8 * 1024 * 1024)))
+
+ValidatedPartition = Tuple[int, List[Dict[str, Any]], List[Dict[str, Any]]]
+
+
+def _validate_partition(file_path: str, header: bytes, start: int, end: int, engine: str) -> ValidatedPartition:
+    """Parse and validate file_path[start:end] in a worker process; row numbers are partition-local."""
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return CSVService.validate_csv(header + data, engine)
+
+
+class ParallelCSVService:
+    @staticmethod
+    def split_partitions(file_path: str, partition_bytes: int = CSV_PARTITION_BYTES) -> Tuple[bytes, List[Tuple[int, int]]]:
+        """Return the header line and (start, end) byte ranges that each hold whole records.
+        
+        A range only ends on a newline preceded by an even number of quote characters
+        in the file, so quoted fields that contain newlines are never cut in two.
+        """
+        with open(file_path, "rb") as f:
+            header = f.readline()
+            if not header.strip():
+                raise ValueError("Invalid CSV format: No columns to parse from file")
+            quotes = header.count(b'"')
+        
+            partitions = []
+            start = f.tell()
+            while True:
+                block = f.read(partition_bytes)
+                if not block:
+                    break
+                end = start + len(block)
+                quotes += block.count(b'"')
+                at_boundary = block.endswith(b"\n")
+                # Extend to the next newline that isn't inside a quoted field
+                while not (at_boundary and quotes % 2 == 0):
+                    line = f.readline()
+                    if not line:
+                        break
+                    end += len(line)
+                    quotes += line.count(b'"')
+                    at_boundary = line.endswith(b"\n")
+                partitions.append((start, end))
+                start = end
+        return header, partitions
+    
+    @classmethod
+    def iter_validated_partitions(
+        cls,
+        file_path: str,
+        workers: int,
+        partition_bytes: int = CSV_PARTITION_BYTES
+    ) -> Iterator[ValidatedPartition]:
+        """Validate partitions across worker processes, yielding them in file order with global row numbers.
+        
+        At most two partitions per worker are in flight, so memory stays bounded no
+        matter how far the workers get ahead of the caller.
+        """
+        header, partitions = cls.split_partitions(file_path, partition_bytes)
+        if not partitions:
+            return
+        
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            pending = deque()
+            remaining = iter(partitions)
+            row_offset = 0
+            try:
+                for start, end in remaining:
+                    pending.append(executor.submit(_validate_partition, file_path, header, start, end, CSVService.ENGINE))
+                    if len(pending) >= workers * 2:
+                        break
+        
+                while pending:
+                    # Parsing and validation happen in the workers; this is the writer waiting on them
+                    with csv_stage("validate"):
+                        row_count, valid_products, validation_errors = pending.popleft().result()
+                    next_partition = next(remaining, None)
+                    if next_partition is not None:
+                        pending.append(executor.submit(_validate_partition, file_path, header, *next_partition, CSVService.ENGINE))
+        
+                    for error in validation_errors:
+                        error["row"] += row_offset
+                    row_offset += row_count
+                    yield row_count, valid_products, validation_errors
+            finally:
+                for future in pending:
+                    future.cancel()
+    
+    @classmethod
+    def process_csv_parallel(
+        cls,
+        file_path: str,
+        db: Session,
+        workers: int,
+        on_chunk: Optional[Callable[[Dict[str, Any], List[Dict]], None]] = None,
+        partition_bytes: int = CSV_PARTITION_BYTES,
+        sync: bool = False,
+        atomic: bool = True
+    ) -> Dict[str, Any]:
+        """process_csv_stream with parsing and validation spread over worker processes; this process is the only writer.
+        
+        atomic works like in process_csv_stream.
+        """
+        total_rows = 0
+        counts = {}
+        validation_errors = []
+        seen_skus = set()
+        
+        try:
+            for row_count, valid_products, chunk_errors in cls.iter_validated_partitions(file_path, workers, partition_bytes):
+                total_rows += row_count
+                chunk_counts = CSVService._store_chunk(db, valid_products, chunk_errors, sync, seen_skus)
+                CSVService._add_counts(counts, chunk_counts)
+                validation_errors.extend(chunk_errors)
+                if not atomic:
+                    CSVService._commit_stored(db, chunk_counts)
+        
+                if on_chunk:
+                    on_chunk(CSVService._summarize(total_rows, counts, validation_errors), chunk_errors)
+            if atomic:
+                CSVService._commit_stored(db, counts)
+        except Exception:
+            db.rollback()
+            raise
+        
+        return CSVService._summarize(total_rows, counts, validation_errors)
+    
+    @classmethod
+    async def process_csv_parallel_async(
+        cls,
+        file_path: str,
+        db: AsyncSession,
+        workers: int,
+        partition_bytes: int = CSV_PARTITION_BYTES,
+        sync: bool = False
+    ) -> Dict[str, Any]:
+        """process_csv_parallel on an AsyncSession: waiting on the workers happens in a worker thread.
+        
+        Always atomic: the file is committed once, after its last partition.
+        """
+        total_rows = 0
+        counts = {}
+        validation_errors = []
+        seen_skus = set()
+        
+        partitions = cls.iter_validated_partitions(file_path, workers, partition_bytes)
+        try:
+            while True:
+                validated = await run_in_threadpool(next, partitions, None)
+                if validated is None:
+                    break
+                row_count, valid_products, chunk_errors = validated
+                chunk_counts = await db.run_sync(CSVService._store_chunk, valid_products, chunk_errors, sync, seen_skus)
+        
+                total_rows += row_count
+                CSVService._add_counts(counts, chunk_counts)
+                validation_errors.extend(chunk_errors)
+            await db.run_sync(CSVService._commit_stored, counts)
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await run_in_threadpool(partitions.close)
+        
+        return CSVService._summarize(total_rows, counts, validation_errors)
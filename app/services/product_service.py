@@ -1,31 +1,111 @@
-from typing import List, Optional
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import Select, literal_column, select
 from sqlalchemy.orm import Session
-from app.models import Product
-from app.schemas import ProductResponse, PaginatedProductResponse, PaginationInfo
+from app.models import Product, ProductFacet
+from app.schemas import PaginatedProductResponse
+from app.services.catalog_state import CatalogStateService
+from app.services.result_cache import invalidate_read_caches, sku_cache
+from app.services.search_index import SearchIndex
+
+# Columns in ProductResponse field order, for paths that skip ORM entities
+PRODUCT_COLUMNS = [
+    Product.sku,
+    Product.name,
+    Product.brand,
+    Product.color,
+    Product.size,
+    Product.mrp,
+    Product.price,
+    Product.quantity,
+    Product.id,
+]
+PRODUCT_FIELDS = [column.key for column in PRODUCT_COLUMNS]
+
+# SKUs per IN (...) in lookup_skus; stays under SQLite's bound-variable limit
+LOOKUP_CHUNK_SIZE = 500
+
+# Same ordering as Product.id, but not satisfiable from the rowid, so SQLite keeps
+# the index chosen for the WHERE clause and sorts the (small) result instead
+UNINDEXED_ID_ORDER = Product.id + literal_column("0")
+
 
 class ProductService:
+    @staticmethod
+    def encode_cursor(last_id: int) -> str:
+        return base64.urlsafe_b64encode(json.dumps({"id": last_id}).encode()).decode()
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> int:
+        try:
+            last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))["id"]
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise ValueError("Invalid cursor")
+        if not isinstance(last_id, int):
+            raise ValueError("Invalid cursor")
+        return last_id
+    
     @staticmethod
     def get_products_paginated(
         db: Session, 
         page: int = 1, 
         limit: int = 10
     ) -> PaginatedProductResponse:
+        return PaginatedProductResponse.model_validate(ProductService.get_product_rows_paginated(db, page, limit))
+    
+    @staticmethod
+    def get_product_rows_paginated(db: Session, page: int = 1, limit: int = 10) -> Dict[str, Any]:
+        """A page/limit page as plain dicts in the PaginatedProductResponse schema, read without ORM entities."""
         offset = (page - 1) * limit
         
-        products = db.query(Product).offset(offset).limit(limit).all()
-        total_count = db.query(Product).count()
+        products = ProductService._product_rows(
+            db, select(*PRODUCT_COLUMNS).order_by(Product.id).offset(offset).limit(limit)
+        )
+        total_count = CatalogStateService.get_product_count(db)
         
         total_pages = (total_count + limit - 1) // limit
+        has_more = bool(products) and offset + len(products) < total_count
         
-        return PaginatedProductResponse(
-            products=products,
-            pagination=PaginationInfo(
-                current_page=page,
-                total_pages=total_pages,
-                total_products=total_count,
-                products_per_page=limit
-            )
+        return {
+            "products": products,
+            "pagination": {
+                "current_page": page,
+                "total_pages": total_pages,
+                "total_products": total_count,
+                "products_per_page": limit,
+                "next_cursor": ProductService.encode_cursor(products[-1]["id"]) if has_more else None
+            }
+        }
+    
+    @staticmethod
+    def get_product_rows_after_cursor(
+        db: Session,
+        cursor: str,
+        limit: int = 10,
+        include_total: bool = False
+    ) -> Dict[str, Any]:
+        """Keyset page as plain dicts in the CursorPaginatedProductResponse schema.
+        
+        Seeks past the cursor's id on the primary key instead of using OFFSET.
+        """
+        last_id = ProductService.decode_cursor(cursor)
+        
+        rows = ProductService._product_rows(
+            db, select(*PRODUCT_COLUMNS).where(Product.id > last_id).order_by(Product.id).limit(limit + 1)
         )
+        products = rows[:limit]
+        has_more = len(rows) > limit
+        
+        return {
+            "products": products,
+            "pagination": {
+                "next_cursor": ProductService.encode_cursor(products[-1]["id"]) if has_more else None,
+                "products_per_page": limit,
+                "total_products": CatalogStateService.get_product_count(db) if include_total else None
+            }
+        }
     
     @staticmethod
     def search_products(
@@ -33,27 +113,132 @@ class ProductService:
         brand: Optional[str] = None,
         color: Optional[str] = None,
         min_price: Optional[float] = None,
-        max_price: Optional[float] = None
+        max_price: Optional[float] = None,
+        exact: bool = False
     ) -> List[Product]:
-        query = db.query(Product)
+        """ORM entities for the same planned statement search_product_rows runs."""
+        statement = ProductService.search_rows_statement(db, brand, color, min_price, max_price, exact=exact)
+        return db.scalars(select(Product).from_statement(statement)).all()
+    
+    @staticmethod
+    def search_product_rows(
+        db: Session,
+        brand: Optional[str] = None,
+        color: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        exact: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Search results as plain dicts in the response schema, plus the next cursor when limit is set."""
+        fetch = limit + 1 if limit is not None else None
+        statement = ProductService.search_rows_statement(db, brand, color, min_price, max_price, fetch, cursor, exact)
+        rows = ProductService._product_rows(db, statement)
+        if limit is None or len(rows) <= limit:
+            return rows, None
+        products = rows[:limit]
+        return products, ProductService.encode_cursor(products[-1]["id"])
+    
+    @staticmethod
+    def _product_rows(db: Session, statement: Select) -> List[Dict[str, Any]]:
+        return [dict(zip(PRODUCT_FIELDS, row)) for row in db.execute(statement)]
+    
+    @staticmethod
+    def search_rows_statement(
+        db: Session,
+        brand: Optional[str] = None,
+        color: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        exact: bool = False
+    ) -> Select:
+        """Planned search over plain columns in ProductResponse order, for streaming callers."""
+        filters, order_by = ProductService._plan_search(db, brand, color, min_price, max_price, exact)
+        if cursor is not None:
+            filters.append(Product.id > ProductService.decode_cursor(cursor))
         
-        if brand:
-            query = query.filter(Product.brand.ilike(f"%{brand}%"))
-        if color:
-            query = query.filter(Product.color.ilike(f"%{color}%"))
+        statement = select(*PRODUCT_COLUMNS).where(*filters).order_by(order_by)
+        if limit is not None:
+            statement = statement.limit(limit)
+        return statement
+    
+    @staticmethod
+    def _plan_search(
+        db: Session,
+        brand: Optional[str],
+        color: Optional[str],
+        min_price: Optional[float],
+        max_price: Optional[float],
+        exact: bool = False
+    ) -> Tuple[list, Any]:
+        """Choose the index a search is driven by; returns its WHERE clauses and ORDER BY.
+        
+        Exact brand/color lookups lead the (brand, price) / (color, price) composite
+        indexes, substring terms go to the trigram index as one combined lookup, and
+        a bare price range uses ix_products_price. Index-driven plans order by
+        ``id + 0`` so SQLite doesn't fall back to scanning products in rowid order
+        just to avoid sorting.
+        """
+        price_filters = []
         if min_price is not None:
-            query = query.filter(Product.price >= min_price)
+            price_filters.append(Product.price >= min_price)
         if max_price is not None:
-            query = query.filter(Product.price <= max_price)
-        return query.all()
+            price_filters.append(Product.price <= max_price)
+        
+        if exact and (brand or color):
+            filters = []
+            if brand:
+                filters.append(Product.brand == brand)
+            if color:
+                filters.append(Product.color == color)
+            return filters + price_filters, UNINDEXED_ID_ORDER
+        
+        terms = {field: term for field, term in (("brand", brand), ("color", color)) if term}
+        filters, fts_driven = SearchIndex.substring_filters(db, terms)
+        if fts_driven:
+            return filters + price_filters, Product.id
+        if price_filters:
+            return filters + price_filters, UNINDEXED_ID_ORDER
+        return filters, Product.id
     
     @staticmethod
     def get_product_by_sku(db: Session, sku: str) -> Optional[Product]:
         return db.query(Product).filter(Product.sku == sku).first()
     
+    @staticmethod
+    def lookup_skus(db: Session, skus: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Product rows for the given SKUs, keyed by SKU; unknown SKUs are left out.
+        
+        Cached rows come from sku_cache, the rest from one IN (...) query per
+        LOOKUP_CHUNK_SIZE SKUs.
+        """
+        found = {}
+        pending = []
+        for sku in dict.fromkeys(skus):
+            row = sku_cache.get(sku)
+            if row is None:
+                pending.append(sku)
+            else:
+                found[sku] = row
+        
+        generation = sku_cache.generation
+        for start in range(0, len(pending), LOOKUP_CHUNK_SIZE):
+            chunk = pending[start:start + LOOKUP_CHUNK_SIZE]
+            for row in ProductService._product_rows(db, select(*PRODUCT_COLUMNS).where(Product.sku.in_(chunk))):
+                found[row["sku"]] = row
+                sku_cache.set(row["sku"], row, generation)
+        return found
+    
     @staticmethod
     def clear_all_products(db: Session) -> dict:
-        deleted_count = db.query(Product).count()
-        db.query(Product).delete()
+        deleted_count = db.query(Product).delete()
+        # The delete trigger leaves zero counts behind
+        db.query(ProductFacet).delete()
+        CatalogStateService.reset_product_count(db)
+        CatalogStateService.bump_version(db)
         db.commit()
+        invalidate_read_caches()
         return {"message": f"Deleted {deleted_count} products from database"}
\ No newline at end of file
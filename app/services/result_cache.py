@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class ResultCache:
+    """Bounded LRU cache with a TTL for serialized read responses.
+
+    Entries are tagged with the generation they were computed in. Writers call
+    invalidate() to bump the generation, which drops everything cached so far and
+    makes set() discard results that were computed before the bump.
+    """
+    
+    def __init__(self, max_entries: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+    
+    @staticmethod
+    def make_key(endpoint: str, **params: Any) -> Hashable:
+        return (endpoint, tuple(sorted((name, value) for name, value in params.items() if value is not None)))
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key: Hashable, value: Any, generation: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "generation": self.generation,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+result_cache = ResultCache(
+    max_entries=int(os.getenv("RESULT_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("RESULT_CACHE_TTL_SECONDS", "30"))
+)
+
+# SKU -> product row for /products/{sku} and /products/lookup; only found SKUs are cached
+sku_cache = ResultCache(
+    max_entries=int(os.getenv("SKU_CACHE_SIZE", "50000")),
+    ttl_seconds=float(os.getenv("SKU_CACHE_TTL_SECONDS", "300"))
+)
+
+
+def invalidate_read_caches() -> None:
+    """Drop cached reads after the catalog changed."""
+    result_cache.invalidate()
+    sku_cache.invalidate()
@@ -0,0 +1,57 @@
+import weakref
+from typing import Dict, Tuple
+from sqlalchemy import column, select, table
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.models import Product, create_products_fts
+
+products_fts = table("products_fts", column("rowid"), column("brand"), column("color"))
+
+
+class SearchIndex:
+    """Routes brand/color substring filters through the products_fts trigram index."""
+    
+    enabled = True
+    # Trigram lookups need at least three characters; shorter terms fall back to ILIKE
+    MIN_TERM_LENGTH = 3
+    
+    _available = weakref.WeakKeyDictionary()
+    
+    @classmethod
+    def is_available(cls, db: Session) -> bool:
+        engine = db.get_bind()
+        if engine not in cls._available:
+            cls._available[engine] = db.execute(
+                select(column("name")).select_from(table("sqlite_master")).where(column("name") == "products_fts")
+            ).first() is not None
+        return cls._available[engine]
+    
+    @classmethod
+    def ensure(cls, engine: Engine) -> bool:
+        """Create and backfill the index on a database whose products table predates it."""
+        available = False
+        if engine.dialect.name == "sqlite":
+            with engine.begin() as connection:
+                exists = connection.exec_driver_sql(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'products_fts'"
+                ).first() is not None
+                available = exists or create_products_fts(connection, rebuild=True)
+        cls._available[engine] = available
+        return available
+    
+    @classmethod
+    def substring_filters(cls, db: Session, terms: Dict[str, str]) -> Tuple[list, bool]:
+        """ILIKE filters for each field's term, led by one trigram lookup when the index can serve it.
+
+        Returns the clauses and whether the trigram index drives the query.
+        """
+        rechecks = [getattr(Product, field).ilike(f"%{term}%") for field, term in terms.items()]
+        indexable = {field: term for field, term in terms.items() if len(term) >= cls.MIN_TERM_LENGTH}
+        if not (cls.enabled and indexable and cls.is_available(db)):
+            return rechecks, False
+        # A single FTS query with every term intersects the candidates inside the
+        # index; the ILIKE re-checks keep results identical to a plain scan.
+        candidates = select(products_fts.c.rowid).where(
+            *[products_fts.c[field].like(f"%{term}%") for field, term in indexable.items()]
+        )
+        return [Product.id.in_(candidates)] + rechecks, True
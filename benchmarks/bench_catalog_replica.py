@@ -0,0 +1,66 @@
+"""Search throughput on one core: SQLite (ProductService) vs the in-memory CatalogReplica.
+
+Usage: python -m benchmarks.bench_catalog_replica [rows] [seconds_per_query]
+"""
+import io
+import json
+import sys
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.services.catalog_replica import CatalogReplica
+from app.services.csv_service import CSVService
+from app.services.product_service import ProductService
+from benchmarks.synthetic import generate_catalog_csv
+
+QUERIES = {
+    "brand_page": {"brand": "denim", "limit": 100},
+    "color_price_page": {"color": "blue", "min_price": 500, "max_price": 2000, "limit": 100},
+    "exact_brand_price_page": {"brand": "DenimWorks", "max_price": 1000, "limit": 100, "exact": True},
+    "price_range_all": {"min_price": 1000, "max_price": 1100},
+    "tail_brand_all": {"brand": "label12", "color": "red"},
+}
+
+
+def _qps(search, seconds):
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        search()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return round(calls / elapsed, 1)
+
+
+def run(rows, seconds):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    CSVService.process_csv_stream(io.BytesIO(generate_catalog_csv(rows, skew=1.1).encode()), db)
+
+    start = time.perf_counter()
+    replica = CatalogReplica.rebuild(db)
+    rebuild_seconds = round(time.perf_counter() - start, 3)
+
+    queries = {}
+    for name, filters in QUERIES.items():
+        sql_rows, _ = ProductService.search_product_rows(db, **filters)
+        replica_rows, _ = replica.search_product_rows(**filters)
+        assert replica_rows == sql_rows, name
+        queries[name] = {
+            "matches": len(sql_rows),
+            "sql_qps": _qps(lambda: ProductService.search_product_rows(db, **filters), seconds),
+            "replica_qps": _qps(lambda: replica.search_product_rows(**filters), seconds),
+        }
+    db.close()
+    return {"rows": rows, "rebuild_seconds": rebuild_seconds, "queries": queries}
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    print(json.dumps(run(rows, seconds), indent=2))
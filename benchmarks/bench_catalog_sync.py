@@ -0,0 +1,68 @@
+"""Refreshing a catalog from a daily feed: clear + re-upload vs sync upload.
+
+The feed is the original catalog with a fraction of prices changed.
+Usage: python -m benchmarks.bench_catalog_sync [rows] [changed_fraction]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_catalog_csv
+
+
+def _changed_feed(catalog_csv, fraction, seed=7):
+    rng = random.Random(seed)
+    header, *lines = catalog_csv.splitlines()
+    price_column = header.split(",").index("price")
+    for i in rng.sample(range(len(lines)), int(len(lines) * fraction)):
+        fields = lines[i].split(",")
+        try:
+            fields[price_column] = str(round(float(fields[price_column]) * 0.9, 2))
+        except ValueError:
+            continue
+        lines[i] = ",".join(fields)
+    return "\n".join([header] + lines) + "\n"
+
+
+def run(rows, fraction):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base, apply_sqlite_profile
+    from app.services.csv_service import CSVService
+    from app.services.product_service import ProductService
+
+    catalog = generate_catalog_csv(rows)
+    feed = _changed_feed(catalog, fraction).encode()
+    results = {"rows": rows, "changed_fraction": fraction}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("clear_and_reupload", "sync"):
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, mode + '.db')}")
+            apply_sqlite_profile(engine)
+            Base.metadata.create_all(bind=engine)
+            db = sessionmaker(bind=engine)()
+            CSVService.process_csv(CSVService.parse_csv(catalog.encode()), db)
+
+            start = time.perf_counter()
+            if mode == "sync":
+                summary = CSVService.process_csv(CSVService.parse_csv(feed), db, sync=True)
+            else:
+                ProductService.clear_all_products(db)
+                summary = CSVService.process_csv(CSVService.parse_csv(feed), db)
+            elapsed = time.perf_counter() - start
+            db.close()
+
+            entry = {"seconds": round(elapsed, 2), "rows_written": summary["valid_products_stored"]}
+            if mode == "sync":
+                entry.update(updated=summary["updated"], unchanged=summary["unchanged"], inserted=summary["inserted"])
+            results[mode] = entry
+    return results
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    fraction = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+    print(json.dumps(run(rows, fraction), indent=2))
@@ -0,0 +1,80 @@
+"""Read latency on the async request path while a large upload is running.
+
+Runs the app in-process behind httpx's ASGI transport, so any handler that blocks
+the event loop shows up directly in the readers' tail latency.
+Usage: python -m benchmarks.bench_concurrency [upload_rows] [readers]
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    pick = lambda q: round(ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000, 2)
+    return {"requests": len(ordered), "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "max_ms": pick(1.0)}
+
+
+async def _reader(client, latencies, stop, rng):
+    while not stop.is_set():
+        if rng.random() < 0.5:
+            url = f"/products?page={rng.randint(1, 50)}&limit=20"
+        else:
+            url = f"/products/search?brand={rng.choice(['stream', 'denim', 'urban'])}&limit=50"
+        start = time.perf_counter()
+        response = await client.get(url)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+
+
+async def _measure(client, readers, seconds=None, upload=None):
+    latencies, stop = [], asyncio.Event()
+    tasks = [asyncio.create_task(_reader(client, latencies, stop, random.Random(i))) for i in range(readers)]
+    upload_seconds = None
+    if upload is not None:
+        start = time.perf_counter()
+        response = await client.post("/upload?stream=true", files={"file": ("catalog.csv", upload, "text/csv")}, timeout=None)
+        upload_seconds = round(time.perf_counter() - start, 2)
+        assert response.status_code == 200, response.text
+    else:
+        await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return _percentiles(latencies), upload_seconds
+
+
+async def run(upload_rows, readers):
+    import httpx
+    from app.main import app
+    from app.migrate import migrate
+    from benchmarks.synthetic import generate_catalog_csv
+
+    # ASGITransport doesn't run the lifespan hook that sets up the schema
+    migrate()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        seed = generate_catalog_csv(20_000, prefix="SEED").encode()
+        await client.post("/upload", files={"file": ("seed.csv", seed, "text/csv")}, timeout=None)
+
+        idle, _ = await _measure(client, readers, seconds=3)
+        upload = generate_catalog_csv(upload_rows, seed=7, prefix="BULK").encode()
+        busy, upload_seconds = await _measure(client, readers, upload=upload)
+
+    return {"upload_rows": upload_rows, "readers": readers, "upload_seconds": upload_seconds,
+            "reads_idle": idle, "reads_during_upload": busy}
+
+
+if __name__ == "__main__":
+    upload_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    readers = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    # Measure the database path, not the result cache
+    os.environ.setdefault("RESULT_CACHE_SIZE", "0")
+    os.chdir(tempfile.mkdtemp(prefix="bench-concurrency-"))
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    print(json.dumps(asyncio.run(run(upload_rows, readers)), indent=2))
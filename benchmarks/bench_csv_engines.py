@@ -0,0 +1,80 @@
+"""pandas vs stdlib csv vs pyarrow.csv ingestion: throughput and peak memory.
+
+Each engine runs in a fresh interpreter, so ru_maxrss only reflects its own work:
+parse + validate of the whole file, then a streamed upload into an empty database.
+pandas_loaded reports whether the engine pulled pandas into the process at all.
+Usage: python -m benchmarks.bench_csv_engines [rows ...]
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_catalog_csv
+
+ENGINES = ("pandas", "stdlib", "pyarrow")
+
+
+def _child(engine, csv_path, db_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base
+    from app.services.csv_service import CSVService
+
+    engine_db = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine_db)
+    db = sessionmaker(bind=engine_db)()
+    CSVService.ENGINE = engine
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    with open(csv_path, "rb") as f:
+        rows = sum(row_count for row_count, _, _ in CSVService.iter_validated_chunks(f))
+    validate_seconds = time.perf_counter() - start
+    validate_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    with open(csv_path, "rb") as f:
+        result = CSVService.process_csv_stream(f, db)
+    ingest_seconds = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps({
+        "parse_validate_rows_per_second": round(rows / validate_seconds),
+        "parse_validate_rss_mb": round((validate_kb - baseline_kb) / 1024, 1),
+        "stream_upload_seconds": round(ingest_seconds, 2),
+        "stream_upload_rows_per_second": round(rows / ingest_seconds),
+        "peak_rss_mb": round(peak_kb / 1024, 1),
+        "rows_stored": result["valid_products_stored"],
+        "pandas_loaded": "pandas" in sys.modules,
+    }))
+
+
+def run(sizes):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            csv_path = os.path.join(tmp, f"catalog_{rows}.csv")
+            with open(csv_path, "w") as f:
+                write_catalog_csv(f, rows, error_rate=0.01)
+            entry = {"rows": rows, "file_mb": round(os.path.getsize(csv_path) / 2**20, 1)}
+            for engine in ENGINES:
+                db_path = os.path.join(tmp, f"{engine}_{rows}.db")
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_csv_engines", "--child", engine, csv_path, db_path],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                entry[engine] = json.loads(output)
+            results.append(entry)
+    return results
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        _child(*sys.argv[2:5])
+    else:
+        sizes = [int(arg) for arg in sys.argv[1:]] or [100_000, 500_000]
+        print(json.dumps(run(sizes), indent=2))
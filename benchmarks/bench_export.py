@@ -0,0 +1,46 @@
+"""Pulling the full catalog: paging /products at 100 rows vs one /products/export stream.
+
+Usage: python -m benchmarks.bench_export [rows]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+
+def run(rows):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from benchmarks.synthetic import generate_catalog_csv
+
+    results = {"rows": rows}
+    with TestClient(app) as client:
+        client.delete("/products/clear")
+        client.post("/upload?stream=true", files={"file": ("catalog.csv", generate_catalog_csv(rows).encode(), "text/csv")})
+
+        start = time.perf_counter()
+        requests, fetched, page = 0, 0, 1
+        while True:
+            body = client.get("/products", params={"page": page, "limit": 100}).json()
+            requests += 1
+            fetched += len(body["products"])
+            if page >= body["pagination"]["total_pages"]:
+                break
+            page += 1
+        results["offset_pages"] = {"seconds": round(time.perf_counter() - start, 2), "requests": requests, "rows": fetched}
+
+        for format in ("csv", "parquet", "arrow"):
+            start = time.perf_counter()
+            response = client.get("/products/export", params={"format": format})
+            results[f"export_{format}"] = {"seconds": round(time.perf_counter() - start, 2), "mb": round(len(response.content) / 2**20, 2)}
+    return results
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    # Measure the database path, not the result cache
+    os.environ.setdefault("RESULT_CACHE_SIZE", "0")
+    os.chdir(tempfile.mkdtemp(prefix="bench-export-"))
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    print(json.dumps(run(rows), indent=2))
@@ -0,0 +1,76 @@
+"""Filter sidebar counts: GET /products/facets vs fetching /products/search and counting client-side.
+
+Also times the catalog upload with and without the product_facets triggers.
+Usage: python -m benchmarks.bench_facets [rows] [repeats]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+FILTERS = {
+    "none": {},
+    "brand": {"brand": "nik"},
+    "color_price": {"color": "bla", "minPrice": 500, "maxPrice": 2000},
+    "unaligned_price": {"minPrice": 750, "maxPrice": 4321.5},
+}
+
+
+def _median_ms(call, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return round(samples[len(samples) // 2] * 1000, 2)
+
+
+def run(rows, repeats):
+    from fastapi.testclient import TestClient
+    from sqlalchemy import text
+    from app.database import engine
+    from app.main import app
+    from app.models import PRODUCT_FACETS_DDL
+    from benchmarks.synthetic import generate_catalog_csv
+
+    catalog = generate_catalog_csv(rows, skew=1.1).encode()
+    results = {"rows": rows, "upload_seconds": {}, "median_ms": {}}
+    with TestClient(app) as client:
+        def upload():
+            client.delete("/products/clear")
+            start = time.perf_counter()
+            client.post("/upload?stream=true", files={"file": ("catalog.csv", catalog, "text/csv")})
+            return round(time.perf_counter() - start, 2)
+
+        with engine.begin() as connection:
+            for trigger in ("product_facets_ai", "product_facets_ad", "product_facets_au"):
+                connection.execute(text(f"DROP TRIGGER {trigger}"))
+        results["upload_seconds"]["without_facet_triggers"] = upload()
+        with engine.begin() as connection:
+            for statement in PRODUCT_FACETS_DDL:
+                connection.exec_driver_sql(statement)
+        results["upload_seconds"]["with_facet_triggers"] = upload()
+
+        def client_side(params):
+            products = client.get("/products/search", params=params).json()
+            return Counter(p["brand"] for p in products), Counter(p["color"] for p in products)
+
+        for name, params in FILTERS.items():
+            results["median_ms"][name] = {
+                "search_and_count": _median_ms(lambda: client_side(params), repeats),
+                "facets": _median_ms(lambda: client.get("/products/facets", params=params), repeats),
+            }
+    return results
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    # Measure the database path, not the result cache
+    os.environ.setdefault("RESULT_CACHE_SIZE", "0")
+    os.chdir(tempfile.mkdtemp(prefix="bench-facets-"))
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    print(json.dumps(run(rows, repeats), indent=2))
@@ -0,0 +1,63 @@
+"""Ingest throughput of parallel CSV validation across worker counts.
+
+The sequential streaming path is the baseline; every run writes to a fresh
+database file so duplicate checks see the same empty catalog.
+Usage: python -m benchmarks.bench_parallel_ingest [rows] [workers ...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import generate_catalog_csv
+
+
+def _session(db_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base, apply_sqlite_profile
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    apply_sqlite_profile(engine)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def run(rows, worker_counts):
+    from app.services.csv_service import CSVService
+    from app.services.parallel_csv import ParallelCSVService
+
+    results = {"rows": rows, "cpus": os.cpu_count(), "runs": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "catalog.csv")
+        with open(csv_path, "w") as f:
+            f.write(generate_catalog_csv(rows, error_rate=0.01))
+        results["file_mb"] = round(os.path.getsize(csv_path) / 2**20, 1)
+
+        def measure(label, ingest):
+            db = _session(os.path.join(tmp, f"{label}.db"))
+            start = time.perf_counter()
+            summary = ingest(db)
+            elapsed = time.perf_counter() - start
+            db.close()
+            return {"mode": label, "seconds": round(elapsed, 2), "rows_per_second": round(rows / elapsed),
+                    "stored": summary["valid_products_stored"], "errors": summary["validation_errors_count"]}
+
+        def stream(db):
+            with open(csv_path, "rb") as f:
+                return CSVService.process_csv_stream(f, db)
+
+        baseline = measure("stream", stream)
+        results["runs"].append(baseline)
+        for workers in worker_counts:
+            entry = measure(f"parallel_{workers}", lambda db: ParallelCSVService.process_csv_parallel(csv_path, db, workers))
+            entry["speedup"] = round(baseline["seconds"] / entry["seconds"], 2)
+            results["runs"].append(entry)
+    return results
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    worker_counts = [int(arg) for arg in sys.argv[2:]] or [1, 2, 4, 8]
+    print(json.dumps(run(rows, worker_counts), indent=2))
@@ -0,0 +1,74 @@
+"""Brand/color substring search latency: trigram FTS index vs plain ILIKE scan.
+
+Usage: python -m benchmarks.bench_search_index [rows ...]
+"""
+import json
+import random
+import sys
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Product
+from app.services.product_service import ProductService
+from app.services.search_index import SearchIndex
+from benchmarks.synthetic import COLORS
+
+QUERIES = {
+    "selective_brand": {"brand": "label0042"},
+    "broad_brand": {"brand": "label00"},
+    "color": {"color": "navy"},
+    "brand_and_color": {"brand": "label0042", "color": "blue"},
+}
+
+
+def build_catalog(rows, seed=42):
+    rng = random.Random(seed)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Product), [
+            {
+                "sku": f"SKU-{i:08d}",
+                "name": "Product",
+                "brand": f"Label{rng.randrange(max(rows // 50, 1)):04d}",
+                "color": rng.choice(COLORS),
+                "mrp": 1000.0,
+                "price": float(rng.randrange(100, 1000)),
+                "quantity": 1,
+            }
+            for i in range(rows)
+        ])
+    return sessionmaker(bind=engine)()
+
+
+def _median_ms(db, filters, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ProductService.search_product_rows(db, **filters)
+        timings.append(time.perf_counter() - start)
+    return round(sorted(timings)[len(timings) // 2] * 1000, 2)
+
+
+def run(sizes, repeat=7):
+    results = []
+    for rows in sizes:
+        db = build_catalog(rows)
+        for name, filters in QUERIES.items():
+            entry = {"rows": rows, "query": name}
+            for label, enabled in (("fts_ms", True), ("ilike_ms", False)):
+                SearchIndex.enabled = enabled
+                entry[label] = _median_ms(db, filters, repeat)
+            SearchIndex.enabled = True
+            entry["matches"] = len(ProductService.search_product_rows(db, **filters)[0])
+            results.append(entry)
+        db.close()
+    return results
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 500_000]
+    print(json.dumps(run(sizes), indent=2))
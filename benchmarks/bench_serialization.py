@@ -0,0 +1,76 @@
+"""Response building time: ORM entities + pydantic vs column tuples + orjson.
+
+Both paths run the same query plan against the same database; the timings cover
+query, object construction and JSON encoding, i.e. everything a cache miss pays.
+Usage: python -m benchmarks.bench_serialization [rows] [repeats]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+
+def _timed(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        body = fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {"median_ms": round(samples[len(samples) // 2] * 1000, 2), "bytes": len(body)}
+
+
+def run(rows, repeats):
+    import orjson
+    from pydantic import TypeAdapter
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base
+    from app.models import Product
+    from app.schemas import PaginatedProductResponse, ProductResponse
+    from app.services.csv_service import CSVService
+    from app.services.product_service import ProductService
+    from app.services.search_index import SearchIndex
+    from benchmarks.synthetic import generate_catalog_csv
+
+    product_list = TypeAdapter(List[ProductResponse])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'catalog.db')}")
+        Base.metadata.create_all(bind=engine)
+        SearchIndex.ensure(engine)
+        db = sessionmaker(bind=engine)()
+        CSVService.process_csv(CSVService.parse_csv(generate_catalog_csv(rows).encode()), db)
+
+        def orm_page():
+            products = db.query(Product).order_by(Product.id).offset(500).limit(100).all()
+            response = PaginatedProductResponse(
+                products=products,
+                pagination={"current_page": 6, "total_pages": rows // 100, "total_products": rows, "products_per_page": 100,
+                            "next_cursor": ProductService.encode_cursor(products[-1].id)},
+            )
+            return response.model_dump_json().encode()
+
+        def orm_search():
+            products = ProductService.search_products(db, brand="denim")
+            return product_list.dump_json(product_list.validate_python(products, from_attributes=True))
+
+        cases = {
+            "list_page_100": (orm_page, lambda: orjson.dumps(ProductService.get_product_rows_paginated(db, 6, 100))),
+            "search_all_matches": (orm_search, lambda: orjson.dumps(ProductService.search_product_rows(db, brand="denim")[0])),
+        }
+        results = {"rows": rows, "repeats": repeats}
+        for name, (orm_fn, rows_fn) in cases.items():
+            orm, fast = _timed(orm_fn, repeats), _timed(rows_fn, repeats)
+            results[name] = {"orm_pydantic": orm, "rows_orjson": fast,
+                             "speedup": round(orm["median_ms"] / fast["median_ms"], 2)}
+        db.close()
+    return results
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(json.dumps(run(rows, repeats), indent=2))
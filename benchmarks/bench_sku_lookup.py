@@ -0,0 +1,56 @@
+"""Resolving a cart of SKUs: one GET /products/{sku} per SKU vs one POST /products/lookup.
+
+Usage: python -m benchmarks.bench_sku_lookup [rows] [cart_size] [carts]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+
+def run(rows, cart_size, carts):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.services.result_cache import sku_cache
+    from benchmarks.synthetic import generate_catalog_csv
+
+    rng = random.Random(3)
+    cart_list = [[f"SKU-{rng.randrange(rows):08d}" for _ in range(cart_size)] for _ in range(carts)]
+
+    def timed(resolve, warm):
+        samples = []
+        for cart in cart_list:
+            if not warm:
+                sku_cache.invalidate()
+            start = time.perf_counter()
+            resolve(cart)
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        return round(samples[len(samples) // 2] * 1000, 2)
+
+    with TestClient(app) as client:
+        client.delete("/products/clear")
+        client.post("/upload?stream=true", files={"file": ("catalog.csv", generate_catalog_csv(rows).encode(), "text/csv")})
+
+        per_sku = lambda cart: [client.get(f"/products/{sku}") for sku in cart]
+        batch = lambda cart: client.post("/products/lookup", json={"skus": cart})
+        return {
+            "rows": rows,
+            "cart_size": cart_size,
+            "median_ms_per_cart": {
+                "get_per_sku_cold": timed(per_sku, warm=False),
+                "lookup_batch_cold": timed(batch, warm=False),
+                "lookup_batch_warm": timed(batch, warm=True),
+            },
+        }
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    cart_size = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    carts = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    os.chdir(tempfile.mkdtemp(prefix="bench-sku-lookup-"))
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    print(json.dumps(run(rows, cart_size, carts), indent=2))
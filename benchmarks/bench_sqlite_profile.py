@@ -0,0 +1,117 @@
+"""Reader latency and writer throughput under each SQLITE_PROFILE.
+
+Each profile runs in a fresh interpreter against its own database file, since the
+PRAGMAs are applied when app.database creates its engines. A writer thread keeps
+committing product chunks while reader threads page and search the catalog.
+Usage: python -m benchmarks.bench_sqlite_profile [seconds] [readers]
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.bench_concurrency import _percentiles
+
+PROFILES = ("default", "performance")
+
+
+def _writer(stop, stats):
+    from app.database import SessionLocal
+    from app.services.csv_service import CSVService
+    from benchmarks.synthetic import BRANDS, COLORS, SIZES
+
+    batch = 0
+    while not stop.is_set():
+        products = [
+            {"sku": f"W{batch}-{i}", "name": "Writer Tee", "brand": BRANDS[i % len(BRANDS)],
+             "color": COLORS[i % len(COLORS)], "size": SIZES[i % len(SIZES)],
+             "mrp": 999.0, "price": 499.0 + i % 500, "quantity": 5}
+            for i in range(500)
+        ]
+        db = SessionLocal()
+        try:
+            CSVService._commit_stored(db, CSVService._store_chunk(db, products, []))
+            stats["rows"] += len(products)
+        except Exception:
+            db.rollback()
+            stats["errors"] += 1
+        finally:
+            db.close()
+        batch += 1
+
+
+def _reader(stop, latencies, errors, rng):
+    from app.database import SessionLocal
+    from app.services.product_service import ProductService
+
+    while not stop.is_set():
+        db = SessionLocal()
+        start = time.perf_counter()
+        try:
+            if rng.random() < 0.5:
+                ProductService.get_product_rows_paginated(db, page=rng.randint(1, 50), limit=20)
+            else:
+                ProductService.search_product_rows(db, brand=rng.choice(["denim", "urban", "stream"]), limit=50)
+            latencies.append(time.perf_counter() - start)
+        except Exception:
+            errors.append(1)
+        finally:
+            db.close()
+
+
+def _child(seconds, readers):
+    from app.database import Base, SessionLocal, engine
+    from app.services.csv_service import CSVService
+    from app.services.search_index import SearchIndex
+    from benchmarks.synthetic import generate_catalog_csv
+
+    Base.metadata.create_all(bind=engine)
+    SearchIndex.ensure(engine)
+    db = SessionLocal()
+    CSVService.process_csv(CSVService.parse_csv(generate_catalog_csv(20_000, prefix="SEED").encode()), db)
+    db.close()
+
+    stop = threading.Event()
+    writer_stats = {"rows": 0, "errors": 0}
+    latencies, reader_errors = [], []
+    threads = [threading.Thread(target=_writer, args=(stop, writer_stats))]
+    threads += [threading.Thread(target=_reader, args=(stop, latencies, reader_errors, random.Random(i))) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(json.dumps({
+        "reads": _percentiles(latencies),
+        "reader_errors": len(reader_errors),
+        "writer_rows_per_second": round(writer_stats["rows"] / seconds),
+        "writer_errors": writer_stats["errors"],
+    }))
+
+
+def run(seconds, readers):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in PROFILES:
+            env = dict(os.environ, SQLITE_PROFILE=profile, DATABASE_URL=f"sqlite:///{os.path.join(tmp, profile + '.db')}")
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_sqlite_profile", "--child", str(seconds), str(readers)],
+                check=True, capture_output=True, text=True, env=env,
+            ).stdout
+            results[profile] = json.loads(output)
+    return {"seconds": seconds, "readers": readers, "profiles": results}
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        _child(float(sys.argv[2]), int(sys.argv[3]))
+    else:
+        seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+        readers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+        print(json.dumps(run(seconds, readers), indent=2))
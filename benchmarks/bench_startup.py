@@ -0,0 +1,87 @@
+"""Cold start: import time of app.main and time from launching uvicorn to the first /products response.
+
+Each measurement runs in a fresh interpreter against a database that `python -m app.migrate`
+has already set up, once with the lifespan migration (MIGRATE_ON_STARTUP=1) and once without.
+Usage: python -m benchmarks.bench_startup [repeats]
+"""
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import sys, time
+started = time.perf_counter()
+import app.main
+print(time.perf_counter() - started, "pandas" in sys.modules)
+"""
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _import_app(env):
+    output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], env=env, capture_output=True, text=True, check=True)
+    seconds, pandas_loaded = output.stdout.split()
+    return float(seconds), pandas_loaded == "True"
+
+
+def _first_response(env):
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/products?limit=1"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                if process.poll() is not None:
+                    raise RuntimeError("uvicorn exited before serving")
+                time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run(repeats):
+    directory = tempfile.mkdtemp(prefix="bench-startup-")
+    base_env = dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        DATABASE_URL=f"sqlite:///{os.path.join(directory, 'products.db')}",
+        IMPORT_JOB_DIR=os.path.join(directory, "jobs"),
+    )
+    subprocess.run([sys.executable, "-m", "app.migrate"], env=base_env, check=True, capture_output=True)
+
+    results = {"repeats": repeats}
+    for label, migrate_on_startup in (("migrate_on_startup", "1"), ("migrated_beforehand", "0")):
+        env = dict(base_env, MIGRATE_ON_STARTUP=migrate_on_startup)
+        imports = [_import_app(env) for _ in range(repeats)]
+        first = [_first_response(env) for _ in range(repeats)]
+        results[label] = {
+            "import_ms": round(statistics.median(seconds for seconds, _ in imports) * 1000, 1),
+            "pandas_loaded_on_import": any(loaded for _, loaded in imports),
+            "first_response_ms": round(statistics.median(first) * 1000, 1),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(json.dumps(run(repeats), indent=2))
@@ -0,0 +1,65 @@
+"""Peak RSS of whole-file vs streamed CSV ingestion.
+
+Every measurement runs in a fresh interpreter so ru_maxrss only reflects that
+one upload. Usage: python -m benchmarks.bench_upload_memory [rows ...]
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.synthetic import generate_catalog_csv
+
+
+def _child(mode, csv_path, db_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base
+    from app.services.csv_service import CSVService
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    with open(csv_path, "rb") as f:
+        if mode == "stream":
+            result = CSVService.process_csv_stream(f, db)
+        else:
+            result = CSVService.process_csv(CSVService.parse_csv(f.read()), db)
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({
+        "rows_stored": result["valid_products_stored"],
+        "peak_rss_mb": round(peak_kb / 1024, 1),
+        "ingest_rss_mb": round((peak_kb - baseline_kb) / 1024, 1),
+    }))
+
+
+def run(sizes):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            csv_path = os.path.join(tmp, f"catalog_{rows}.csv")
+            with open(csv_path, "w") as f:
+                f.write(generate_catalog_csv(rows))
+            entry = {"rows": rows, "file_mb": round(os.path.getsize(csv_path) / 2**20, 1)}
+            for mode in ("whole", "stream"):
+                db_path = os.path.join(tmp, f"{mode}_{rows}.db")
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_upload_memory", "--child", mode, csv_path, db_path],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                entry[mode] = json.loads(output)
+            results.append(entry)
+    return results
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        _child(*sys.argv[2:5])
+    else:
+        sizes = [int(arg) for arg in sys.argv[1:]] or [50_000, 200_000, 500_000]
+        print(json.dumps(run(sizes), indent=2))
@@ -0,0 +1,49 @@
+"""Compare the column-wise validation engine with the legacy iterrows() loop.
+
+Usage: python -m benchmarks.bench_validation [rows ...]
+"""
+import json
+import sys
+import time
+
+from app.services.csv_service import CSVService
+from benchmarks.synthetic import generate_catalog_csv
+
+
+def legacy_validate(df):
+    valid_products = []
+    validation_errors = []
+    for index, row in df.iterrows():
+        row_errors = CSVService.validate_row(row, index)
+        if row_errors:
+            validation_errors.append({"row": index + 1, "errors": row_errors})
+        else:
+            valid_products.append(CSVService._create_product_data(row))
+    return valid_products, validation_errors
+
+
+def _timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df)
+    return result, time.perf_counter() - start
+
+
+def run(sizes):
+    results = []
+    for rows in sizes:
+        df = CSVService.parse_csv(generate_catalog_csv(rows, error_rate=0.05).encode("utf-8"))
+        legacy, legacy_seconds = _timed(legacy_validate, df)
+        vectorized, vectorized_seconds = _timed(CSVService.validate_dataframe, df)
+        assert legacy == vectorized, "vectorized engine diverged from iterrows() path"
+        results.append({
+            "rows": rows,
+            "iterrows_seconds": round(legacy_seconds, 4),
+            "vectorized_seconds": round(vectorized_seconds, 4),
+            "speedup": round(legacy_seconds / vectorized_seconds, 1),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    print(json.dumps(run(sizes), indent=2))
@@ -0,0 +1,79 @@
+"""Mixed-traffic throughput with 1..N uvicorn workers, and whether workers serve stale reads after an upload.
+
+Each worker count replays the same synthetic log (searches, listings, SKU lookups
+and periodic uploads) as fast as --concurrency connections allow against a fresh
+server. The coherence probe then primes every worker's result cache with a
+search, uploads a matching product through one worker and repeats the search on
+new connections; any response without the product is a stale read. The last
+worker count is probed again with CATALOG_SYNC=0 for comparison.
+
+Usage: python -m benchmarks.bench_workers [--workers 1 2 4] [--seconds 20] [--rate 100]
+       [--catalog-rows 50000] [--concurrency 16] [--probes 40]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+PROBE_CSV = "sku,name,brand,color,size,mrp,price,quantity\nPROBE-{n},Probe,Probe{n}Brand,Blue,M,100,90,1\n"
+
+
+def _stale_reads(base_url, probes, n):
+    import httpx
+
+    params = {"brand": f"probe{n}brand"}
+
+    def search():
+        # A fresh connection per request, so the kernel spreads them over the workers
+        with httpx.Client(base_url=base_url, timeout=30.0) as client:
+            return client.get("/products/search", params=params).json()
+
+    for _ in range(probes):
+        search()
+    with httpx.Client(base_url=base_url, timeout=30.0) as client:
+        client.post("/upload", files={"file": ("probe.csv", PROBE_CSV.format(n=n), "text/csv")}).raise_for_status()
+    return sum(1 for _ in range(probes) if not search())
+
+
+def run(worker_counts, seconds, rate, catalog_rows, concurrency, probes, port=8790):
+    from benchmarks.replay import LocalServer, Replayer, load_log, synthesize
+
+    log_path = synthesize(tempfile.mkdtemp(prefix="bench-workers-"), seconds, rate, catalog_rows)
+    seed_csv = os.path.join(os.path.dirname(log_path), "seed.csv")
+    requests = load_log(log_path)
+
+    async def replay(base_url):
+        replayer = Replayer(base_url)
+        elapsed = await replayer.replay_concurrent(requests, concurrency)
+        report = replayer.report(elapsed)
+        return {key: report[key] for key in ("requests", "throughput_rps", "errors", "latency")}
+
+    results = {"cpus": os.cpu_count(), "catalog_rows": catalog_rows, "concurrency": concurrency, "runs": []}
+    for workers in worker_counts:
+        with LocalServer(workers, port, seed_csv) as server:
+            entry = {"workers": workers, **asyncio.run(replay(server.base_url))}
+            entry["stale_reads"] = f"{_stale_reads(server.base_url, probes, workers)}/{probes}"
+        results["runs"].append(entry)
+
+    os.environ["CATALOG_SYNC"] = "0"
+    try:
+        with LocalServer(worker_counts[-1], port) as server:
+            results["stale_reads_without_sync"] = f"{_stale_reads(server.base_url, probes, 0)}/{probes}"
+    finally:
+        del os.environ["CATALOG_SYNC"]
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_workers")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--seconds", type=float, default=20.0, help="length of the synthetic log at --rate")
+    parser.add_argument("--rate", type=float, default=100.0)
+    parser.add_argument("--catalog-rows", type=int, default=50_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--probes", type=int, default=40)
+    args = parser.parse_args()
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    print(json.dumps(run(args.workers, args.seconds, args.rate, args.catalog_rows, args.concurrency, args.probes), indent=2))
@@ -0,0 +1,365 @@
+"""Replay a JSONL request log against a running (or spawned) uvicorn instance.
+
+Log format: one JSON object per line.
+
+    {"ts": 0.0, "method": "GET", "path": "/products/search", "params": {"brand": "denim", "limit": 100}}
+    {"ts": 0.4, "method": "POST", "path": "/products/lookup", "json": {"skus": ["SKU-00000001"]}}
+    {"ts": 1.2, "method": "POST", "path": "/upload", "params": {"stream": "true"},
+     "upload": {"file": "catalog.csv", "content_type": "text/csv"}, "expect_status": 200}
+
+- ts: seconds; only differences between lines matter. Lines are replayed in file order.
+- method, path: required. path may carry a query string; params are merged into it.
+- params, json, headers: optional query parameters, JSON body and extra headers.
+- upload: multipart file for /upload; file is relative to the log's directory.
+- name: optional endpoint label for the report; by default the path is mapped to
+  its route template (/products/{sku}, /upload/jobs/{job_id}).
+- expect_status: optional; without it any status below 400 counts as success.
+
+Lines without method and path (comments, other JSONL such as a backlog) are skipped.
+
+    python -m benchmarks.replay synthesize traffic/ --seconds 60 --rate 50
+    python -m benchmarks.replay run traffic/requests.jsonl --serve-workers 2 --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+ROUTE_TEMPLATES = [
+    (re.compile(r"^/upload/jobs/[^/]+$"), "/upload/jobs/{job_id}"),
+    (re.compile(r"^/products/(?!search$|facets$|export$|lookup$|clear$|cache/)[^/]+$"), "/products/{sku}"),
+]
+
+
+@dataclass
+class LoggedRequest:
+    ts: float
+    method: str
+    path: str
+    name: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    json: Any = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    upload: Optional[Dict[str, str]] = None
+    expect_status: Optional[int] = None
+
+
+def endpoint_name(method: str, path: str) -> str:
+    path = path.split("?", 1)[0]
+    for pattern, template in ROUTE_TEMPLATES:
+        if pattern.match(path):
+            path = template
+            break
+    return f"{method} {path}"
+
+
+def load_log(path: str) -> List[LoggedRequest]:
+    base_dir = os.path.dirname(os.path.abspath(path))
+    requests = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(entry, dict) or "method" not in entry or "path" not in entry:
+                continue
+            method = entry["method"].upper()
+            upload = entry.get("upload")
+            if upload is not None:
+                upload = {**upload, "file": os.path.join(base_dir, upload["file"])}
+            requests.append(LoggedRequest(
+                ts=float(entry.get("ts", 0.0)),
+                method=method,
+                path=entry["path"],
+                name=entry.get("name") or endpoint_name(method, entry["path"]),
+                params=entry.get("params") or {},
+                json=entry.get("json"),
+                headers=entry.get("headers") or {},
+                upload=upload,
+                expect_status=entry.get("expect_status"),
+            ))
+    return requests
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+    pick = lambda q: round(ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000, 2)
+    return {"p50_ms": pick(0.50), "p90_ms": pick(0.90), "p99_ms": pick(0.99), "max_ms": pick(1.0)}
+
+
+class Replayer:
+    def __init__(self, base_url: str, timeout: float = 60.0):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.results: List[Dict[str, Any]] = []
+        self._files: Dict[str, bytes] = {}
+
+    async def send(self, client, request: LoggedRequest) -> None:
+        kwargs: Dict[str, Any] = {"params": request.params or None, "headers": request.headers or None}
+        if request.json is not None:
+            kwargs["json"] = request.json
+        if request.upload is not None:
+            content = self._files.get(request.upload["file"])
+            if content is None:
+                with open(request.upload["file"], "rb") as f:
+                    content = self._files[request.upload["file"]] = f.read()
+            filename = request.upload.get("filename") or os.path.basename(request.upload["file"])
+            kwargs["files"] = {"file": (filename, content, request.upload.get("content_type", "text/csv"))}
+
+        start = time.perf_counter()
+        status, error = None, None
+        try:
+            response = await client.request(request.method, request.path, **kwargs)
+            status = response.status_code
+        except Exception as e:
+            error = type(e).__name__
+        elapsed = time.perf_counter() - start
+
+        if error is None:
+            ok = status == request.expect_status if request.expect_status is not None else status < 400
+            if not ok:
+                error = f"HTTP {status}"
+        self.results.append({"name": request.name, "seconds": elapsed, "status": status, "error": error})
+
+    async def replay_recorded(self, requests: List[LoggedRequest], speed: float = 1.0) -> float:
+        """Send each request at its logged offset (divided by speed), regardless of earlier responses."""
+        import httpx
+
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout) as client:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            first_ts = requests[0].ts if requests else 0.0
+            tasks = []
+            for request in requests:
+                delay = (request.ts - first_ts) / speed - (loop.time() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(self.send(client, request)))
+            await asyncio.gather(*tasks)
+            return loop.time() - started
+
+    async def replay_concurrent(self, requests: List[LoggedRequest], concurrency: int) -> float:
+        """Send the log as fast as concurrency connections allow, in log order."""
+        import httpx
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for request in requests:
+            queue.put_nowait(request)
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limits) as client:
+            async def worker():
+                while not queue.empty():
+                    await self.send(client, queue.get_nowait())
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            return time.perf_counter() - started
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        endpoints: Dict[str, Dict[str, Any]] = {}
+        for result in self.results:
+            entry = endpoints.setdefault(result["name"], {"requests": 0, "errors": 0, "statuses": {}, "_samples": []})
+            entry["requests"] += 1
+            entry["_samples"].append(result["seconds"])
+            status = str(result["status"]) if result["status"] is not None else "transport_error"
+            entry["statuses"][status] = entry["statuses"].get(status, 0) + 1
+            if result["error"]:
+                entry["errors"] += 1
+        for entry in endpoints.values():
+            entry["error_rate"] = round(entry["errors"] / entry["requests"], 4)
+            entry["latency"] = _percentiles(entry.pop("_samples"))
+
+        total = len(self.results)
+        errors = sum(1 for result in self.results if result["error"])
+        return {
+            "requests": total,
+            "seconds": round(elapsed, 3),
+            "throughput_rps": round(total / elapsed, 1) if elapsed > 0 else None,
+            "errors": errors,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "latency": _percentiles([result["seconds"] for result in self.results]),
+            "endpoints": dict(sorted(endpoints.items())),
+        }
+
+
+class LocalServer:
+    """uvicorn app.main:app on a fresh database in a temp dir, for the duration of a replay."""
+
+    def __init__(self, workers: int, port: int, seed_csv: Optional[str] = None):
+        self.workers = workers
+        self.port = port
+        self.seed_csv = seed_csv
+        self._process = None
+        self._tmp = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self):
+        import httpx
+
+        self._tmp = tempfile.TemporaryDirectory(prefix="replay-server-")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{os.path.join(self._tmp.name, 'products.db')}",
+            IMPORT_JOB_DIR=os.path.join(self._tmp.name, "jobs"),
+            PYTHONPATH=root,
+            # Like the Docker image: migrate once, then start the workers with catalog sync on
+            MIGRATE_ON_STARTUP="0",
+            WEB_CONCURRENCY=str(self.workers),
+        )
+        subprocess.run([sys.executable, "-m", "app.migrate"], cwd=self._tmp.name, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+             "--port", str(self.port), "--workers", str(self.workers), "--log-level", "warning"],
+            cwd=self._tmp.name, env=env,
+        )
+        deadline = time.time() + 60
+        while True:
+            try:
+                httpx.get(self.base_url + "/", timeout=1.0).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if self._process.poll() is not None or time.time() > deadline:
+                    self.__exit__(None, None, None)
+                    raise RuntimeError("uvicorn did not start")
+                time.sleep(0.2)
+        if self.seed_csv:
+            with open(self.seed_csv, "rb") as f:
+                httpx.post(self.base_url + "/upload", params={"stream": "true"},
+                           files={"file": ("seed.csv", f, "text/csv")}, timeout=None).raise_for_status()
+        return self
+
+    def __exit__(self, *exc):
+        if self._process is not None and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        if self._tmp is not None:
+            self._tmp.cleanup()
+
+
+def synthesize(out_dir: str, seconds: float, rate: float, catalog_rows: int, seed: int = 5) -> str:
+    """Write a mixed-traffic log (search-heavy, with listings, SKU lookups and periodic uploads)."""
+    from benchmarks.synthetic import SKEWED_BRANDS, SKEWED_COLORS, write_catalog_csv
+
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    with open(os.path.join(out_dir, "seed.csv"), "w") as f:
+        write_catalog_csv(f, catalog_rows, skew=1.1)
+
+    lines, ts, uploads = [], 0.0, 0
+    while ts < seconds:
+        ts += rng.expovariate(rate)
+        kind = rng.random()
+        sku = f"SKU-{rng.randrange(catalog_rows):08d}"
+        if kind < 0.55:
+            params = {"limit": 100}
+            if rng.random() < 0.7:
+                params["brand"] = rng.choice(SKEWED_BRANDS[:12]).lower()[:6]
+            if rng.random() < 0.4:
+                params["color"] = rng.choice(SKEWED_COLORS).lower()
+            if rng.random() < 0.3:
+                params["minPrice"] = rng.randrange(100, 3000)
+                params["maxPrice"] = params["minPrice"] + rng.randrange(100, 3000)
+            entry = {"method": "GET", "path": "/products/search", "params": params}
+        elif kind < 0.80:
+            entry = {"method": "GET", "path": "/products", "params": {"page": rng.randint(1, 50), "limit": 20}}
+        elif kind < 0.92:
+            entry = {"method": "GET", "path": f"/products/{sku}", "expect_status": 200}
+        elif kind < 0.99:
+            skus = [f"SKU-{rng.randrange(catalog_rows):08d}" for _ in range(rng.randint(5, 300))]
+            entry = {"method": "POST", "path": "/products/lookup", "json": {"skus": skus}}
+        else:
+            uploads += 1
+            name = f"update_{uploads:03d}.csv"
+            with open(os.path.join(out_dir, name), "w") as f:
+                write_catalog_csv(f, rng.randint(500, 5000), seed=seed + uploads, prefix=f"NEW{uploads:03d}", skew=1.1)
+            entry = {"method": "POST", "path": "/upload", "params": {"stream": "true"},
+                     "upload": {"file": name, "content_type": "text/csv"}}
+        lines.append(json.dumps({"ts": round(ts, 4), **entry}))
+
+    log_path = os.path.join(out_dir, "requests.jsonl")
+    with open(log_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return log_path
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.replay")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="replay a log and print a JSON report")
+    run_parser.add_argument("log")
+    run_parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    run_parser.add_argument("--concurrency", type=int, help="send as fast as N connections allow instead of at logged times")
+    run_parser.add_argument("--speed", type=float, default=1.0, help="time compression for recorded-timing replay")
+    run_parser.add_argument("--timeout", type=float, default=60.0)
+    run_parser.add_argument("--serve-workers", type=int, help="start a local uvicorn with N workers on a fresh database")
+    run_parser.add_argument("--port", type=int, default=8765)
+    run_parser.add_argument("--seed-csv", help="CSV uploaded to the spawned server before replaying (default: seed.csv next to the log)")
+    run_parser.add_argument("--output")
+
+    synth_parser = commands.add_parser("synthesize", help="write a synthetic mixed-traffic log")
+    synth_parser.add_argument("out_dir")
+    synth_parser.add_argument("--seconds", type=float, default=60.0)
+    synth_parser.add_argument("--rate", type=float, default=50.0, help="mean requests per second")
+    synth_parser.add_argument("--catalog-rows", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    if args.command == "synthesize":
+        print(synthesize(args.out_dir, args.seconds, args.rate, args.catalog_rows))
+        return 0
+
+    requests = load_log(args.log)
+    if not requests:
+        print(f"No replayable requests in {args.log}", file=sys.stderr)
+        return 1
+
+    async def replay(base_url: str) -> Dict[str, Any]:
+        replayer = Replayer(base_url, args.timeout)
+        if args.concurrency:
+            elapsed = await replayer.replay_concurrent(requests, args.concurrency)
+        else:
+            elapsed = await replayer.replay_recorded(requests, args.speed)
+        report = replayer.report(elapsed)
+        report["mode"] = {"concurrency": args.concurrency} if args.concurrency else {"recorded_speed": args.speed}
+        return report
+
+    if args.serve_workers:
+        seed_csv = args.seed_csv or os.path.join(os.path.dirname(os.path.abspath(args.log)), "seed.csv")
+        with LocalServer(args.serve_workers, args.port, seed_csv if os.path.exists(seed_csv) else None) as server:
+            report = asyncio.run(replay(server.base_url))
+        report["server_workers"] = args.serve_workers
+    else:
+        report = asyncio.run(replay(args.base_url))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
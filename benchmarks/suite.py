@@ -0,0 +1,202 @@
+"""Reproducible throughput / latency suite for ingestion, listing and search.
+
+Each catalog size and upload mode runs in a fresh interpreter against its own
+database (so peak RSS only reflects that upload) and drives the app through the
+in-process TestClient. Results are JSON, so runs from two commits can be diffed:
+
+    python -m benchmarks.suite run --rows 10000 100000 --output base.json
+    python -m benchmarks.suite compare base.json head.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+SEARCH_CASES = {
+    "brand": {"brand": "streamthreads"},
+    "brand_rare": {"brand": "label150"},
+    "color": {"color": "navy"},
+    "brand_color": {"brand": "denim", "color": "black"},
+    "price_range": {"minPrice": 1000, "maxPrice": 1100},
+    "brand_price": {"brand": "streamthreads", "minPrice": 500, "maxPrice": 900},
+    "color_price": {"color": "blue", "maxPrice": 300},
+    "brand_color_price": {"brand": "urban", "color": "red", "minPrice": 200, "maxPrice": 5000},
+    "brand_exact": {"brand": "DenimWorks", "exact": "true"},
+}
+
+# Lower is better for everything except these
+HIGHER_IS_BETTER = ("rows_per_second",)
+
+
+def _latency(client, url, params, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        response = client.get(url, params=params)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+    samples.sort()
+    pick = lambda q: round(samples[min(int(q * len(samples)), len(samples) - 1)] * 1000, 3)
+    return {"p50_ms": pick(0.5), "p95_ms": pick(0.95)}, response
+
+
+def _child(rows, mode, skew, repeats):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from benchmarks.synthetic import write_catalog_csv
+
+    csv_path = "catalog.csv"
+    with open(csv_path, "w") as f:
+        write_catalog_csv(f, rows, error_rate=0.01, skew=skew)
+
+    result = {"rows": rows, "mode": mode}
+    with TestClient(app) as client, open(csv_path, "rb") as f:
+        baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        response = client.post("/upload", params={"stream": str(mode == "stream").lower()},
+                               files={"file": ("catalog.csv", f, "text/csv")})
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 200, response.text
+        peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        result["upload"] = {
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(rows / elapsed),
+            "stored": response.json()["valid_products_stored"],
+            "peak_rss_mb": round(peak_kb / 1024, 1),
+            "ingest_rss_mb": round((peak_kb - baseline_kb) / 1024, 1),
+        }
+        if mode != "stream":
+            return result
+
+        total_pages = client.get("/products", params={"limit": 100}).json()["pagination"]["total_pages"]
+        listing = {}
+        for name, page in (("page_first", 1), ("page_middle", max(1, total_pages // 2)), ("page_last", total_pages)):
+            listing[name], _ = _latency(client, "/products", {"page": page, "limit": 100}, repeats)
+        _, first = _latency(client, "/products", {"limit": 100}, 1)
+        listing["cursor_page"], _ = _latency(
+            client, "/products", {"limit": 100, "cursor": first.json()["pagination"]["next_cursor"]}, repeats
+        )
+        result["listing"] = listing
+
+        search = {}
+        for name, params in SEARCH_CASES.items():
+            timings, response = _latency(client, "/products/search", {**params, "limit": 100}, repeats)
+            search[name] = {**timings, "returned": len(response.json())}
+        result["search"] = search
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, modes, skew, repeats):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for rows in sizes:
+        for mode in modes:
+            with tempfile.TemporaryDirectory(prefix="bench-suite-") as tmp:
+                env = dict(
+                    os.environ,
+                    DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'products.db')}",
+                    IMPORT_JOB_DIR=os.path.join(tmp, "jobs"),
+                    # Measure the database path, not the result caches
+                    RESULT_CACHE_SIZE="0",
+                    SKU_CACHE_SIZE="0",
+                    PYTHONPATH=root,
+                )
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.suite", "child", str(rows), mode, str(skew), str(repeats)],
+                    check=True, capture_output=True, text=True, env=env, cwd=tmp,
+                ).stdout
+                results.append(json.loads(output))
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "skew": skew,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def _flatten(value, prefix=""):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, value
+
+
+def compare(base, head, threshold):
+    """Per-metric change from base to head; metrics that got worse by more than threshold are flagged."""
+    key = lambda entry: f"{entry['rows']}/{entry['mode']}"
+    base_metrics = {f"{key(e)}.{name}": value for e in base["results"] for name, value in _flatten(e)}
+    rows = []
+    for entry in head["results"]:
+        for name, value in _flatten(entry):
+            metric = f"{key(entry)}.{name}"
+            if metric not in base_metrics or not metric.endswith(("_ms", "seconds", "_mb", "rows_per_second")):
+                continue
+            before = base_metrics[metric]
+            change = (value - before) / before if before else 0.0
+            worse = -change if metric.endswith(HIGHER_IS_BETTER) else change
+            rows.append({"metric": metric, "base": before, "head": value,
+                         "change": round(change, 3), "regression": worse > threshold})
+    return {"base": base["meta"].get("commit"), "head": head["meta"].get("commit"), "threshold": threshold,
+            "regressions": sum(row["regression"] for row in rows), "metrics": rows}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run")
+    run_parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    run_parser.add_argument("--modes", nargs="+", choices=["whole", "stream"], default=["whole", "stream"])
+    run_parser.add_argument("--skew", type=float, default=1.1)
+    run_parser.add_argument("--repeats", type=int, default=20)
+    run_parser.add_argument("--output")
+    compare_parser = commands.add_parser("compare")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+    child_parser = commands.add_parser("child")
+    child_parser.add_argument("rows", type=int)
+    child_parser.add_argument("mode")
+    child_parser.add_argument("skew", type=float)
+    child_parser.add_argument("repeats", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "child":
+        print(json.dumps(_child(args.rows, args.mode, args.skew, args.repeats)))
+        return 0
+    if args.command == "compare":
+        with open(args.base) as f_base, open(args.head) as f_head:
+            report = compare(json.load(f_base), json.load(f_head), args.threshold)
+        print(json.dumps(report, indent=2))
+        return 1 if report["regressions"] else 0
+
+    report = run(args.rows, args.modes, args.skew, args.repeats)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,84 @@
+import itertools
+import random
+from typing import IO, Iterator, List, Optional
+
+HEADER = "sku,name,brand,color,size,mrp,price,quantity"
+
+BRANDS = ["StreamThreads", "DenimWorks", "UrbanStep", "KidsJoy", "CozyHome", "FitPro"]
+COLORS = ["Red", "Black", "Green", "Blue", "White", "Grey", "Navy", "Yellow"]
+SIZES = ["S", "M", "L", "XL", "32", "34", "9", "10"]
+NAMES = ["Classic Cotton T-Shirt", "Heritage Polo", "Slim Fit Jeans", "Running Shoes", "Hoodie"]
+
+# Skewed catalogs draw from products.csv's brands and colors plus a long tail,
+# most popular first, so a few brands dominate like in a real storefront
+SKEWED_BRANDS = (
+    ["StreamThreads", "UrbanEdge", "DenimWorks", "StrideLab", "BloomWear", "CarryCo", "Ethniq", "ButtonUp", "SnugWear"]
+    + [f"Label{i:03d}" for i in range(200)]
+)
+SKEWED_COLORS = [
+    "Blue", "Black", "Red", "White", "Green", "Pink", "Yellow", "Navy", "Beige",
+    "Brown", "Olive", "Grey", "Multi", "Charcoal", "Cream",
+]
+
+
+def _zipf_cum_weights(count: int, skew: float) -> List[float]:
+    return list(itertools.accumulate(1 / (rank + 1) ** skew for rank in range(count)))
+
+
+def iter_catalog_lines(
+    rows: int,
+    seed: int = 42,
+    error_rate: float = 0.0,
+    prefix: Optional[str] = None,
+    skew: float = 0.0
+) -> Iterator[str]:
+    """Yield the header and rows of a products.csv-shaped catalog, without newlines.
+
+    error_rate of rows break a validation rule. skew > 0 draws brands and colors
+    from SKEWED_BRANDS / SKEWED_COLORS with Zipf weights of that exponent; skew 0
+    keeps the uniform BRANDS / COLORS catalog.
+    """
+    rng = random.Random(seed)
+    prefix = prefix or "SKU"
+    if skew:
+        brand_weights = _zipf_cum_weights(len(SKEWED_BRANDS), skew)
+        color_weights = _zipf_cum_weights(len(SKEWED_COLORS), skew)
+        pick_brand = lambda: rng.choices(SKEWED_BRANDS, cum_weights=brand_weights)[0]
+        pick_color = lambda: rng.choices(SKEWED_COLORS, cum_weights=color_weights)[0]
+    else:
+        pick_brand = lambda: rng.choice(BRANDS)
+        pick_color = lambda: rng.choice(COLORS)
+    
+    yield HEADER
+    for i in range(rows):
+        mrp = rng.randrange(299, 9999)
+        price = rng.randrange(99, mrp + 1)
+        quantity = rng.randrange(0, 200)
+        name = rng.choice(NAMES)
+        if error_rate and rng.random() < error_rate:
+            kind = rng.randrange(3)
+            if kind == 0:
+                name = ""
+            elif kind == 1:
+                price = mrp + 100
+            else:
+                quantity = -quantity - 1
+        yield (
+            f"{prefix}-{i:08d},{name},{pick_brand()},{pick_color()},"
+            f"{rng.choice(SIZES)},{mrp},{price},{quantity}"
+        )
+
+
+def generate_catalog_csv(rows: int, seed: int = 42, error_rate: float = 0.0, prefix: Optional[str] = None, skew: float = 0.0) -> str:
+    """Build a products.csv-shaped catalog; error_rate of rows break a validation rule."""
+    return "\n".join(iter_catalog_lines(rows, seed, error_rate, prefix, skew)) + "\n"
+
+
+def write_catalog_csv(f: IO[str], rows: int, seed: int = 42, error_rate: float = 0.0, prefix: Optional[str] = None, skew: float = 0.0) -> None:
+    """generate_catalog_csv streamed to a text file, for catalogs too large to build in memory."""
+    lines = iter_catalog_lines(rows, seed, error_rate, prefix, skew)
+    while True:
+        batch = list(itertools.islice(lines, 10_000))
+        if not batch:
+            return
+        f.write("\n".join(batch) + "\n")
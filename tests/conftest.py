@@ -2,6 +2,67 @@ import pytest
 import tempfile
 import os
 
+# Point the app at a throwaway database before app.database creates its engines
+_TEST_DIR = tempfile.mkdtemp(prefix="product-api-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_TEST_DIR, 'products.db')}")
+os.environ.setdefault("IMPORT_JOB_DIR", os.path.join(_TEST_DIR, "jobs"))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+from app.services.csv_service import CSVService
+from benchmarks.synthetic import generate_catalog_csv
+
+
+def store_csv(db_session, csv_content, sync=False):
+    """Import a CSV string into db_session through CSVService.process_csv."""
+    return CSVService.process_csv(CSVService.parse_csv(csv_content.encode('utf-8')), db_session, sync=sync)
+
+
+def upload_csv(client, csv_content, **params):
+    """POST a CSV string or bytes to /upload; params become query parameters."""
+    if isinstance(csv_content, str):
+        csv_content = csv_content.encode('utf-8')
+    return client.post("/upload", params=params, files={"file": ("products.csv", csv_content, "text/csv")})
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def client():
+    from app.main import app
+    with TestClient(app) as test_client:
+        test_client.delete("/products/clear")
+        yield test_client
+
+
+@pytest.fixture
+def catalog_csv():
+    """Rows seeded by `catalog`; override in a test module to seed a different catalog."""
+    return generate_catalog_csv(1200)
+
+
+@pytest.fixture
+def catalog(db_session, catalog_csv):
+    store_csv(db_session, catalog_csv)
+    return db_session
+
 
 @pytest.fixture
 def sample_product_data():
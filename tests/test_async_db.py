@@ -0,0 +1,61 @@
+import asyncio
+import io
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+from app.services.csv_service import CSVService
+from app.services.product_service import ProductService
+
+
+def run_with_async_session(scenario):
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                return await scenario(db)
+        finally:
+            await engine.dispose()
+    return asyncio.run(main())
+
+
+class TestAsyncSession:
+    """CSVService and ProductService running on an aiosqlite AsyncSession."""
+
+    def test_stream_upload_and_search(self, sample_csv_invalid):
+        async def scenario(db):
+            result = await CSVService.process_csv_stream_async(
+                io.BytesIO(sample_csv_invalid.encode('utf-8')), db, chunk_size=2
+            )
+            rows, _ = await db.run_sync(ProductService.search_product_rows, "testbrand")
+            return result, rows
+
+        result, rows = run_with_async_session(scenario)
+
+        assert result["valid_products_stored"] == 1
+        assert [error["row"] for error in result["errors"]] == [2, 3, 4]
+        assert [row["sku"] for row in rows] == ["TEST001"]
+
+    def test_whole_file_upload_matches_sync_path(self, db_session, sample_csv_valid):
+        async def scenario(db):
+            df = CSVService.parse_csv(sample_csv_valid.encode('utf-8'))
+            first = await CSVService.process_csv_async(df, db)
+            second = await CSVService.process_csv_async(df, db)
+            page = await db.run_sync(ProductService.get_product_rows_paginated, 1, 2)
+            return first, second, page
+
+        first, second, page = run_with_async_session(scenario)
+        df = CSVService.parse_csv(sample_csv_valid.encode('utf-8'))
+
+        assert first == CSVService.process_csv(df, db_session)
+        assert second["skipped_duplicates"] == 3
+        assert page["pagination"]["total_products"] == 3
+
+    def test_invalid_csv_raises_value_error(self):
+        async def scenario(db):
+            return await CSVService.process_csv_stream_async(io.BytesIO(b""), db)
+
+        with pytest.raises(ValueError, match="Invalid CSV format"):
+            run_with_async_session(scenario)
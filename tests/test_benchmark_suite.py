@@ -0,0 +1,49 @@
+import pytest
+import io
+import pandas as pd
+from benchmarks.suite import compare
+from benchmarks.synthetic import SKEWED_BRANDS, generate_catalog_csv, write_catalog_csv
+
+
+def report(commit, rows_per_second, p50_ms):
+    return {
+        "meta": {"commit": commit},
+        "results": [{
+            "rows": 1000, "mode": "stream",
+            "upload": {"rows_per_second": rows_per_second, "stored": 990},
+            "search": {"brand": {"p50_ms": p50_ms, "returned": 100}},
+        }],
+    }
+
+
+class TestSyntheticCatalog:
+    """The generator behind the benchmark suite."""
+
+    def test_skewed_catalog_is_long_tailed(self):
+        df = pd.read_csv(io.StringIO(generate_catalog_csv(20_000, skew=1.1)))
+        counts = df["brand"].value_counts()
+
+        assert counts.index[0] == SKEWED_BRANDS[0]
+        assert counts.iloc[0] > 10 * counts.iloc[20]
+        assert df["sku"].is_unique
+
+    def test_streamed_file_matches_in_memory_catalog(self):
+        buffer = io.StringIO()
+        write_catalog_csv(buffer, 25_000, error_rate=0.01, skew=1.1)
+        assert buffer.getvalue() == generate_catalog_csv(25_000, error_rate=0.01, skew=1.1)
+
+
+class TestCompare:
+    """Regression report between two suite runs."""
+
+    def test_flags_metrics_that_got_worse(self):
+        result = compare(report("a", 10_000, 5.0), report("b", 8_000, 5.2), threshold=0.10)
+
+        by_metric = {row["metric"]: row for row in result["metrics"]}
+        assert by_metric["1000/stream.upload.rows_per_second"]["regression"] is True
+        assert by_metric["1000/stream.search.brand.p50_ms"]["regression"] is False
+        assert "1000/stream.upload.stored" not in by_metric
+        assert result["regressions"] == 1
+
+    def test_improvements_are_not_regressions(self):
+        assert compare(report("a", 10_000, 5.0), report("b", 20_000, 2.0), threshold=0.10)["regressions"] == 0
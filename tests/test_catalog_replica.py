@@ -0,0 +1,120 @@
+import pytest
+from app.database import get_sync_engine
+from app.models import Product
+from app.routers import products as products_router
+from app.services.catalog_replica import CatalogReplica
+from app.services.product_service import ProductService
+from app.services.result_cache import result_cache
+from benchmarks.synthetic import generate_catalog_csv
+from tests.conftest import upload_csv
+
+FILTERS = [
+    {},
+    {"brand": "denim"},
+    {"brand": "DENIMWORKS"},
+    {"brand": "a"},
+    {"color": "bl"},
+    {"color": "_lue"},
+    {"brand": "50%"},
+    {"brand": "ÜBER"},
+    {"brand": "über"},
+    {"min_price": 500},
+    {"max_price": 999.5},
+    {"min_price": 800, "max_price": 800},
+    {"brand": "e", "color": "r", "min_price": 200, "max_price": 4000},
+    {"brand": "DenimWorks", "exact": True},
+    {"color": "Blue", "max_price": 3000, "exact": True},
+    {"brand": "denimworks", "exact": True},
+]
+
+
+def current_snapshot(engine):
+    """Start a rebuild if needed, wait for it and return the snapshot."""
+    CatalogReplica.snapshot(engine)
+    with CatalogReplica._rebuilding:
+        pass
+    return CatalogReplica.snapshot(engine)
+
+
+@pytest.fixture
+def catalog_csv():
+    return generate_catalog_csv(2000)
+
+
+@pytest.fixture
+def catalog(catalog):
+    # Edge cases for matching: LIKE wildcards, non-ASCII case folding, NULL colour and quantity
+    catalog.add_all([
+        Product(sku="ODD-1", name="Odd", brand="50% Off", color=None, size="M", mrp=900, price=800, quantity=None),
+        Product(sku="ODD-2", name="Odd", brand="Über", color="Blue", size="M", mrp=900, price=800, quantity=1),
+        Product(sku="ODD-3", name="Odd", brand="über", color="Glue", size="L", mrp=900, price=999.5, quantity=2),
+    ])
+    catalog.commit()
+    return catalog
+
+
+class TestCatalogReplica:
+    """The in-memory replica returns exactly what the SQL search returns."""
+
+    @pytest.mark.parametrize("filters", FILTERS)
+    def test_matches_sql_search(self, catalog, filters):
+        replica = CatalogReplica.rebuild(catalog)
+
+        expected, _ = ProductService.search_product_rows(catalog, **filters)
+        rows, next_cursor = replica.search_product_rows(**filters)
+
+        assert rows == expected
+        assert next_cursor is None
+
+    def test_pages_like_sql_search(self, catalog):
+        replica = CatalogReplica.rebuild(catalog)
+        filters = {"brand": "e", "min_price": 300}
+
+        cursor = None
+        while True:
+            expected = ProductService.search_product_rows(catalog, **filters, limit=150, cursor=cursor)
+            page = replica.search_product_rows(**filters, limit=150, cursor=cursor)
+            assert page == expected
+            cursor = page[1]
+            if cursor is None:
+                break
+
+    def test_rejects_invalid_cursor(self, catalog):
+        with pytest.raises(ValueError):
+            CatalogReplica.rebuild(catalog).search_product_rows(cursor="not-a-cursor")
+
+    def test_rebuilds_in_the_background_after_writes(self, catalog):
+        engine = catalog.get_bind()
+        first = current_snapshot(engine)
+        assert CatalogReplica.snapshot(engine) is first
+
+        ProductService.clear_all_products(catalog)
+
+        assert CatalogReplica.snapshot(engine) is None
+        rebuilt = current_snapshot(engine)
+        assert rebuilt is not first
+        assert rebuilt.search_product_rows() == ([], None)
+
+    def test_falls_back_while_rebuilding(self, catalog):
+        ProductService.clear_all_products(catalog)
+        with CatalogReplica._rebuilding:
+            assert CatalogReplica.snapshot(catalog.get_bind()) is None
+
+    def test_search_endpoint(self, client, sample_csv_valid, monkeypatch):
+        upload_csv(client, sample_csv_valid)
+        params = {"brand": "brand", "maxPrice": 1500, "limit": 1}
+        expected = client.get("/products/search", params=params)
+
+        monkeypatch.setattr(products_router, "CATALOG_REPLICA", True)
+        # Without cached responses every search reaches the replica or SQLite
+        monkeypatch.setattr(result_cache, "max_entries", 0)
+        result_cache.invalidate()
+        # The first search after a write is answered by SQLite while the replica is built
+        assert client.get("/products/search", params=params).json() == expected.json()
+        current_snapshot(get_sync_engine())
+
+        monkeypatch.setattr(ProductService, "search_product_rows", None)
+        response = client.get("/products/search", params=params)
+
+        assert response.json() == expected.json()
+        assert response.headers["X-Next-Cursor"] == expected.headers["X-Next-Cursor"]
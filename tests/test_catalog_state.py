@@ -0,0 +1,133 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from app.database import engine
+from app.migrate import migrate
+from app.models import CatalogState, Product
+from app.services.catalog_state import CatalogStateService, CatalogVersionSync, catalog_sync
+from app.services.product_service import ProductService
+from app.services.result_cache import result_cache
+from tests.conftest import store_csv, upload_csv
+
+
+class TestCatalogState:
+    """The maintained product counter must always agree with the products table."""
+
+    def test_created_with_a_zero_row(self, db_session):
+        assert db_session.get(CatalogState, 1).product_count == 0
+
+    def test_migrate_seeds_from_existing_rows(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        Product.__table__.create(bind=engine)
+        with Session(bind=engine) as db:
+            db.add(Product(sku="OLD001", name="Old", brand="Brand", mrp=10.0, price=5.0))
+            db.commit()
+
+        migrate(engine)
+
+        with Session(bind=engine) as db:
+            assert CatalogStateService.get_product_count(db) == 1
+            db.query(CatalogState).delete()
+            db.commit()
+        migrate(engine)
+        with Session(bind=engine) as db:
+            assert CatalogStateService.get_product_count(db) == 1
+        engine.dispose()
+
+    def test_reading_the_count_does_not_write(self, db_session):
+        statements = []
+        event.listen(db_session.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        assert CatalogStateService.get_product_count(db_session) == 0
+        assert [statement.split()[0].upper() for statement in statements] == ["SELECT"]
+
+    def test_tracks_uploads_and_clear(self, db_session, sample_csv_valid, sample_csv_invalid):
+        assert CatalogStateService.get_product_count(db_session) == 0
+
+        store_csv(db_session, sample_csv_valid)
+        store_csv(db_session, sample_csv_invalid)
+        assert CatalogStateService.get_product_count(db_session) == db_session.query(Product).count() == 3
+
+        result = ProductService.clear_all_products(db_session)
+        assert result == {"message": "Deleted 3 products from database"}
+        assert CatalogStateService.get_product_count(db_session) == 0
+
+    def test_pagination_does_not_count_rows(self, db_session, sample_csv_valid):
+        store_csv(db_session, sample_csv_valid)
+        statements = []
+        event.listen(db_session.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        page = ProductService.get_product_rows_paginated(db_session, 1, 2)
+
+        assert page["pagination"]["total_products"] == 3
+        assert page["pagination"]["total_pages"] == 2
+        assert not any("count(" in statement.lower() for statement in statements)
+
+
+class TestCatalogVersionSync:
+    """Workers notice each other's writes through catalog_state.version."""
+
+    def test_writes_bump_the_version(self, db_session, sample_csv_valid):
+        assert CatalogStateService.get_version(db_session) == 0
+
+        store_csv(db_session, sample_csv_valid)
+        assert CatalogStateService.get_version(db_session) == 1
+
+        # Only duplicates: nothing stored, nothing for other workers to drop
+        store_csv(db_session, sample_csv_valid)
+        assert CatalogStateService.get_version(db_session) == 1
+
+        ProductService.clear_all_products(db_session)
+        assert CatalogStateService.get_version(db_session) == 2
+
+    def test_check_invalidates_on_foreign_writes(self, db_session):
+        sync = CatalogVersionSync(enabled=True, interval_seconds=0)
+        assert sync.check(db_session) is False
+        generation = result_cache.generation
+
+        # Another worker's write: the version moves without this process invalidating anything
+        CatalogStateService.bump_version(db_session)
+        db_session.commit()
+
+        assert sync.check(db_session) is True
+        assert result_cache.generation == generation + 1
+        assert sync.check(db_session) is False
+
+    def test_interval_limits_checks(self):
+        now = [100.0]
+        sync = CatalogVersionSync(enabled=True, interval_seconds=0.5, clock=lambda: now[0])
+        assert sync.due()
+        sync._checked_at = now[0]
+        assert not sync.due()
+        now[0] += 0.5
+        assert sync.due()
+        assert not CatalogVersionSync(enabled=False, interval_seconds=0).due()
+
+    def test_migrate_adds_and_seeds_the_version(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        with engine.begin() as connection:
+            connection.exec_driver_sql("CREATE TABLE catalog_state (id INTEGER PRIMARY KEY, product_count INTEGER NOT NULL)")
+            connection.exec_driver_sql("INSERT INTO catalog_state VALUES (1, 0)")
+
+        migrate(engine)
+
+        with Session(bind=engine) as db:
+            assert CatalogStateService.get_version(db) == 0
+            CatalogStateService.bump_version(db)
+            db.commit()
+            assert CatalogStateService.get_version(db) == 1
+        engine.dispose()
+
+    def test_search_sees_other_workers_uploads(self, client, sample_csv_valid, monkeypatch):
+        monkeypatch.setattr(catalog_sync, "enabled", True)
+        upload_csv(client, sample_csv_valid)
+        assert len(client.get("/products/search", params={"brand": "testbrand"}).json()) == 2
+
+        # Written by another worker: this process's result cache still holds the old answer
+        with Session(bind=engine) as db:
+            db.add(Product(sku="TEST004", name="New", brand="TestBrand", mrp=10.0, price=5.0))
+            CatalogStateService.bump_version(db)
+            db.commit()
+
+        assert len(client.get("/products/search", params={"brand": "testbrand"}).json()) == 3
@@ -0,0 +1,99 @@
+import io
+import pytest
+from sqlalchemy import create_engine, event, text
+from app.models import Product, add_missing_columns
+from app.services.catalog_state import CatalogStateService
+from app.services.csv_service import CSVService
+from app.services.product_service import ProductService
+from tests.conftest import store_csv
+
+
+HEADER = "sku,name,brand,color,size,mrp,price,quantity\n"
+
+
+class TestCatalogSync:
+    """sync=True upserts changed SKUs and leaves identical ones alone."""
+
+    def test_reports_inserted_updated_unchanged(self, db_session, sample_csv_valid):
+        store_csv(db_session, sample_csv_valid)
+        feed = HEADER + """TEST001,Test Product 1,TestBrand,Blue,M,1000,750,10
+TEST002,Test Product 2,TestBrand,Red,L,2000,1500,20
+TEST004,Test Product 4,OtherBrand,Black,S,500,400,1"""
+
+        result = store_csv(db_session, feed, sync=True)
+
+        assert (result["inserted"], result["updated"], result["unchanged"]) == (1, 1, 1)
+        assert result["valid_products_stored"] == 2
+        assert db_session.query(Product.price).filter(Product.sku == "TEST001").scalar() == 750.0
+        assert CatalogStateService.get_product_count(db_session) == 4
+
+    def test_unchanged_rows_are_not_written(self, db_session, sample_csv_valid):
+        store_csv(db_session, sample_csv_valid)
+        statements = []
+        connection = db_session.connection()
+
+        @event.listens_for(connection, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        result = store_csv(db_session, sample_csv_valid, sync=True)
+
+        assert result["unchanged"] == 3 and result["updated"] == 0
+        assert not any(statement.startswith("INSERT INTO products ") for statement in statements)
+
+    @pytest.mark.parametrize("chunk_size", [1, 2])
+    def test_repeated_sku_matches_whole_file_when_chunked(self, db_session, sample_csv_valid, chunk_size):
+        feed = HEADER + """A1,First,Brand,Blue,M,100,90,1
+A2,Other,Brand,Red,L,100,90,1
+A1,Second,Brand,Blue,M,100,80,1"""
+        store_csv(db_session, sample_csv_valid)
+        expected = store_csv(db_session, feed, sync=True)
+        expected_rows = db_session.query(Product.sku, Product.name, Product.price).order_by(Product.sku).all()
+        ProductService.clear_all_products(db_session)
+
+        store_csv(db_session, sample_csv_valid)
+        result = CSVService.process_csv_stream(io.BytesIO(feed.encode('utf-8')), db_session, chunk_size=chunk_size, sync=True)
+
+        assert result == expected
+        assert (result["skipped_duplicates"], result["inserted"], result["updated"]) == (1, 2, 0)
+        assert db_session.query(Product.sku, Product.name, Product.price).order_by(Product.sku).all() == expected_rows
+
+    def test_normal_upload_still_skips_existing(self, db_session, sample_csv_valid):
+        store_csv(db_session, sample_csv_valid)
+        changed = sample_csv_valid.replace("800", "700")
+
+        result = store_csv(db_session, changed)
+
+        assert result["skipped_duplicates"] == 3
+        assert "updated" not in result
+        assert db_session.query(Product.price).filter(Product.sku == "TEST001").scalar() == 800.0
+
+    def test_brand_change_reaches_search_index(self, db_session, sample_csv_valid):
+        store_csv(db_session, sample_csv_valid)
+
+        store_csv(db_session, sample_csv_valid.replace("TEST001,Test Product 1,TestBrand", "TEST001,Test Product 1,Renamed"), sync=True)
+
+        assert [row["sku"] for row in ProductService.search_product_rows(db_session, brand="renamed")[0]] == ["TEST001"]
+        assert [row["sku"] for row in ProductService.search_product_rows(db_session, brand="testbrand")[0]] == ["TEST002"]
+
+    def test_rows_without_hash_are_refreshed_once(self, db_session, sample_csv_valid):
+        store_csv(db_session, sample_csv_valid)
+        db_session.execute(text("UPDATE products SET content_hash = NULL"))
+        db_session.commit()
+
+        assert store_csv(db_session, sample_csv_valid, sync=True)["updated"] == 3
+        assert store_csv(db_session, sample_csv_valid, sync=True)["unchanged"] == 3
+
+
+class TestAddMissingColumns:
+    """Schema upgrade for databases created before a column existed."""
+
+    def test_adds_content_hash_to_old_products_table(self):
+        engine = create_engine("sqlite://")
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "CREATE TABLE products (id INTEGER PRIMARY KEY, sku VARCHAR(100), name VARCHAR(255), brand VARCHAR(100),"
+                " color VARCHAR(50), size VARCHAR(20), mrp FLOAT, price FLOAT, quantity INTEGER)"
+            )
+            assert add_missing_columns(connection, Product.__table__) == ["content_hash"]
+            assert add_missing_columns(connection, Product.__table__) == []
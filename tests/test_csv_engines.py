@@ -0,0 +1,114 @@
+import io
+import os
+import subprocess
+import sys
+import pytest
+from app.services.csv_service import CSVService, _arrow_strings
+from benchmarks.synthetic import generate_catalog_csv
+from tests.conftest import upload_csv
+
+ENGINES = ["stdlib", "pyarrow"]
+
+EDGE_CASES = [
+    # Missing optional and required columns
+    "sku,name,brand\nTEST001,Product 1,Brand1\nTEST002,Product 2,Brand2",
+    # Blank optional fields, whitespace-only required field, float quantities
+    "sku,name,brand,color,size,mrp,price,quantity\n"
+    "TEST001,Product 1,Brand1,,,1000,800,2.7\n"
+    "TEST002,   ,Brand2,Red,L,1000,800,\n"
+    "TEST003, Product 3 ,Brand3, Blue ,XL,1000,1000,0",
+    # Non-numeric values in numeric columns
+    "sku,name,brand,mrp,price,quantity\n"
+    "TEST001,Product 1,Brand1,1000,abc,ten\n"
+    "TEST002,Product 2,Brand2,1000,1200,-1\n"
+    "TEST003,Product 3,Brand3,1000,900,5",
+    # NA tokens, blank lines, quoted newlines and extra columns
+    "sku,name,brand,color,size,mrp,price,quantity,notes\n"
+    "TEST001,NA,Brand1,null,M,1000,800,1,x\n"
+    "\n"
+    "TEST002,\"Two\nlines\",Brand2,Red,L,1000,800,3,\"a, b\"\n"
+    "TEST003,Product 3,Brand3,,,1000,900,,\n",
+]
+
+SHORT_ROW = "sku,name,brand,mrp,price\nTEST001,Product 1,Brand1,1000,800\nTEST002,Product 2\n"
+
+
+def validate(content, engine):
+    try:
+        return CSVService.validate_csv(content.encode('utf-8'), engine)
+    except ValueError as e:
+        return str(e)
+
+
+class TestCSVEngines:
+    """The stdlib and pyarrow engines must give the pandas engine's results."""
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    @pytest.mark.parametrize("csv_content", EDGE_CASES)
+    def test_matches_pandas_on_edge_cases(self, engine, csv_content):
+        assert validate(csv_content, engine) == validate(csv_content, "pandas")
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_matches_pandas_on_generated_catalog(self, engine):
+        content = generate_catalog_csv(5_000, error_rate=0.05)
+        assert validate(content, engine) == validate(content, "pandas")
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_matches_pandas_on_sample_file(self, engine):
+        with open('products.csv') as f:
+            content = f.read()
+        assert validate(content, engine) == validate(content, "pandas")
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_chunks_keep_global_row_numbers(self, engine, sample_csv_invalid):
+        chunks = list(CSVService.iter_validated_chunks(io.BytesIO(sample_csv_invalid.encode()), chunk_size=2, engine=engine))
+
+        assert [row_count for row_count, _, _ in chunks] == [2, 2]
+        assert [error["row"] for _, _, errors in chunks for error in errors] == [2, 3, 4]
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_rejects_malformed_files(self, engine):
+        assert validate("", engine) == "Invalid CSV format: No columns to parse from file"
+        assert validate("sku,name\nA,B,C\n", engine).startswith("Invalid CSV format: ")
+
+    def test_short_rows(self):
+        # pandas and the csv module pad short rows with missing values; pyarrow rejects them
+        assert validate(SHORT_ROW, "stdlib") == validate(SHORT_ROW, "pandas")
+        # A known pyarrow limitation: its invalid-row handler can only skip a row
+        # and doesn't say where it was, so the row can't be padded in place
+        assert validate(SHORT_ROW, "pyarrow") == (
+            "Invalid CSV format: CSV parse error: Row #3: Expected 5 columns, got 2: TEST002,Product 2"
+        )
+
+    def test_arrow_strings_handles_slices_and_nulls(self):
+        import pyarrow as pa
+
+        array = pa.array(["skip", "a", None, "Über", "", None, "z"]).slice(1, 5)
+        assert _arrow_strings(array) == ["a", None, "Über", "", None]
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_does_not_load_pandas(self, engine, tmp_path):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=root, CSV_ENGINE=engine)
+        probe = (
+            "import sys\n"
+            "from app.services.csv_service import CSVService\n"
+            "CSVService.validate_csv(b'sku,name,brand,mrp,price\\nA,B,C,10,5\\n')\n"
+            "print('pandas' in sys.modules)"
+        )
+        output = subprocess.run([sys.executable, "-c", probe], env=env, cwd=tmp_path, capture_output=True, text=True, check=True)
+        assert output.stdout.strip() == "False"
+
+    def test_stdlib_leaves_the_callers_file_open(self, sample_csv_valid):
+        f = io.BytesIO(sample_csv_valid.encode())
+        list(CSVService.iter_validated_chunks(f, engine="stdlib"))
+        assert not f.closed
+
+    @pytest.mark.parametrize("engine", ENGINES)
+    def test_upload_uses_configured_engine(self, client, sample_csv_invalid, monkeypatch, engine):
+        monkeypatch.setattr(CSVService, "ENGINE", engine)
+        response = upload_csv(client, sample_csv_invalid)
+
+        assert response.status_code == 200
+        assert response.json()["valid_products_stored"] == 1
+        assert [error["row"] for error in response.json()["errors"]] == [2, 3, 4]
@@ -0,0 +1,89 @@
+import pytest
+import io
+import pandas as pd
+from app.database import engine
+from app.services.export_service import ExportService
+from benchmarks.synthetic import generate_catalog_csv
+from tests.conftest import upload_csv
+
+
+def read_parquet(content):
+    import pyarrow.parquet as pq
+    parquet = pq.ParquetFile(io.BytesIO(content))
+    tables = [parquet.read_row_group(i, use_threads=False) for i in range(parquet.num_row_groups)]
+    return pd.concat([table.to_pandas() for table in tables], ignore_index=True)
+
+
+def read_arrow(content):
+    import pyarrow as pa
+    return pa.ipc.open_stream(content).read_all().to_pandas()
+
+
+@pytest.fixture
+def catalog_csv():
+    return generate_catalog_csv(1200, error_rate=0.05)
+
+
+@pytest.fixture
+def catalog(client, catalog_csv):
+    """The seeded catalog behind the app's own database, served through `client`."""
+    upload_csv(client, catalog_csv)
+    return client
+
+
+class TestExportEndpoint:
+    """GET /products/export in every format."""
+
+    def test_csv_round_trips_through_upload(self, catalog):
+        before = catalog.get("/products/search").json()
+        export = catalog.get("/products/export")
+
+        assert export.headers["content-type"].startswith("text/csv")
+        assert export.headers["content-disposition"] == 'attachment; filename="products.csv"'
+        catalog.delete("/products/clear")
+        result = upload_csv(catalog, export.content).json()
+
+        assert result["validation_errors_count"] == 0
+        assert result["valid_products_stored"] == len(before)
+        after = catalog.get("/products/search").json()
+        strip_ids = lambda products: [{k: v for k, v in p.items() if k != "id"} for p in products]
+        assert strip_ids(after) == strip_ids(before)
+
+    @pytest.mark.parametrize("format, reader", [("parquet", read_parquet), ("arrow", read_arrow)])
+    def test_columnar_formats_match_csv(self, catalog, format, reader):
+        expected = pd.read_csv(io.BytesIO(catalog.get("/products/export").content))
+
+        exported = reader(catalog.get("/products/export", params={"format": format}).content)
+
+        pd.testing.assert_frame_equal(exported, expected, check_dtype=False)
+        assert str(exported["quantity"].dtype) == "int64"
+
+    def test_filters_follow_search(self, catalog):
+        params = {"brand": "denim", "maxPrice": 3000}
+        expected = [p["sku"] for p in catalog.get("/products/search", params=params).json()]
+
+        exported = pd.read_csv(io.BytesIO(catalog.get("/products/export", params=params).content))
+
+        assert exported["sku"].tolist() == expected
+
+    def test_empty_export_keeps_header_and_schema(self, catalog):
+        params = {"brand": "no-such-brand"}
+        assert catalog.get("/products/export", params=params).text == "sku,name,brand,color,size,mrp,price,quantity\n"
+        exported = read_arrow(catalog.get("/products/export", params={**params, "format": "arrow"}).content)
+        assert list(exported.columns) == ["sku", "name", "brand", "color", "size", "mrp", "price", "quantity"]
+        assert exported.empty
+
+    def test_rejects_unknown_format(self, catalog):
+        assert catalog.get("/products/export", params={"format": "xlsx"}).status_code == 422
+
+
+class TestExportChunks:
+    """The export is produced incrementally."""
+
+    @pytest.mark.parametrize("format", ["csv", "parquet", "arrow"])
+    def test_yields_one_piece_per_chunk(self, catalog, format):
+        pieces = [piece for piece in ExportService.iter_export(engine, format, chunk_size=100) if piece]
+
+        assert len(pieces) >= 10
+        if format == "parquet":
+            assert len(read_parquet(b"".join(pieces))) == len(read_parquet(catalog.get("/products/export?format=parquet").content))
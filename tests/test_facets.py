@@ -0,0 +1,107 @@
+import pytest
+from collections import Counter
+from sqlalchemy import create_engine, event, text
+from app.database import Base
+from app.models import Product, ProductFacet, price_band_range
+from app.services.facet_service import FacetService
+from app.services.product_service import ProductService
+from benchmarks.synthetic import generate_catalog_csv
+from tests.conftest import store_csv, upload_csv
+
+
+def brute_force(db_session, brand=None, color=None, min_price=None, max_price=None, exact=False):
+    rows, _ = ProductService.search_product_rows(db_session, brand, color, min_price, max_price, exact=exact)
+    return (
+        len(rows),
+        Counter(row["brand"] for row in rows),
+        Counter(row["color"] or None for row in rows),
+    )
+
+
+def observed(facets):
+    return (
+        facets["total_products"],
+        Counter({entry["value"]: entry["count"] for entry in facets["brands"]}),
+        Counter({entry["value"]: entry["count"] for entry in facets["colors"]}),
+    )
+
+
+@pytest.fixture
+def catalog_csv():
+    return generate_catalog_csv(3000, error_rate=0.02, skew=1.1)
+
+
+class TestFacets:
+    """/products/facets counts must equal counting the search results."""
+
+    @pytest.mark.parametrize("filters", [
+        {},
+        {"brand": "ni"},
+        {"color": "re", "min_price": 500, "max_price": 2000},
+        {"min_price": 750, "max_price": 4321.5},
+        {"brand": "Nike", "color": "Black", "exact": True},
+        {"min_price": 12000},
+        {"max_price": 499.99},
+    ])
+    def test_matches_search_results(self, catalog, filters):
+        facets = FacetService.get_facets(catalog, limit=1000, **filters)
+
+        assert observed(facets) == brute_force(catalog, **filters)
+        assert sum(band["count"] for band in facets["price_bands"]) == facets["total_products"]
+
+    def test_full_bands_come_from_the_aggregate_table(self, catalog):
+        statements = []
+        connection = catalog.connection()
+
+        @event.listens_for(connection, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        FacetService.get_facets(catalog, brand="ni", min_price=500)
+
+        assert len(statements) == 1
+        assert "FROM product_facets" in statements[0]
+
+    def test_price_bands_follow_updates_and_deletes(self, db_session, sample_csv_valid):
+        store_csv(db_session, sample_csv_valid)
+        # TEST001 moves from 800 to 300, i.e. from the 500-1000 band into the lowest one
+        store_csv(db_session, "sku,name,brand,color,size,mrp,price,quantity\n"
+                              "TEST001,Test Product 1,TestBrand,Blue,M,1000,300,10\n", sync=True)
+
+        bands = {(band["min"], band["max"]): band["count"] for band in FacetService.get_facets(db_session)["price_bands"]}
+        assert bands[(None, 500)] == 1
+        assert bands[(500, 1000)] == 0
+        assert bands[(1000, 2000)] == 2
+
+        ProductService.clear_all_products(db_session)
+        assert FacetService.get_facets(db_session)["total_products"] == 0
+        assert db_session.query(ProductFacet).count() == 0
+
+    def test_backfills_when_added_to_an_existing_database(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'products.db'}")
+        Base.metadata.create_all(bind=engine, tables=[Product.__table__])
+        with engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO products (sku, name, brand, color, mrp, price, quantity) "
+                "VALUES ('A', 'a', 'Brand', NULL, 100, 50, 1), ('B', 'b', 'Brand', 'Red', 100, 60, 1)"
+            ))
+
+        Base.metadata.create_all(bind=engine)
+
+        with engine.connect() as connection:
+            assert connection.execute(text(
+                "SELECT brand, color, price_band, product_count FROM product_facets ORDER BY color"
+            )).all() == [("Brand", "", 0, 1), ("Brand", "Red", 0, 1)]
+        engine.dispose()
+
+    def test_endpoint(self, client, sample_csv_valid):
+        upload_csv(client, sample_csv_valid)
+
+        response = client.get("/products/facets", params={"brand": "testbrand", "limit": 1})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["total_products"] == 2
+        assert body["brands"] == [{"value": "TestBrand", "count": 2}]
+        assert len(body["colors"]) == 1
+        assert [band["min"] for band in body["price_bands"]] == [None] + [price_band_range(band)[0] for band in range(1, 6)]
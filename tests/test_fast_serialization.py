@@ -0,0 +1,55 @@
+import pytest
+import orjson
+from typing import List
+from pydantic import TypeAdapter
+from app.models import Product
+from app.schemas import ProductResponse, PaginatedProductResponse, CursorPaginatedProductResponse
+from app.services.product_service import ProductService
+from benchmarks.synthetic import generate_catalog_csv
+
+
+product_list = TypeAdapter(List[ProductResponse])
+
+
+@pytest.fixture
+def catalog_csv():
+    return generate_catalog_csv(300, error_rate=0.1)
+
+
+def orm_json(products: List[Product]) -> bytes:
+    return product_list.dump_json(product_list.validate_python(products, from_attributes=True))
+
+
+class TestRowResponses:
+    """Column-tuple responses encode to the same bytes as the pydantic/ORM path."""
+
+    def test_search_rows_match_orm_serialization(self, catalog):
+        for filters in ({}, {"brand": "denim"}, {"color": "red", "max_price": 900}, {"min_price": 500}):
+            rows, next_cursor = ProductService.search_product_rows(catalog, **filters)
+
+            assert next_cursor is None
+            assert orjson.dumps(rows) == orm_json(ProductService.search_products(catalog, **filters))
+
+    def test_search_pages_match(self, catalog):
+        products = ProductService.search_products(catalog, brand="a")
+        cursor, offset = None, 0
+        while True:
+            rows, cursor = ProductService.search_product_rows(catalog, brand="a", limit=40, cursor=cursor)
+
+            assert orjson.dumps(rows) == orm_json(products[offset:offset + 40])
+            offset += 40
+            assert (cursor is None) == (offset >= len(products))
+            if cursor is None:
+                break
+
+    def test_listing_matches_response_models(self, catalog):
+        page = ProductService.get_product_rows_paginated(catalog, 2, 25)
+        assert orjson.dumps(page) == PaginatedProductResponse.model_validate(page).model_dump_json().encode()
+        orm_page = catalog.query(Product).order_by(Product.id).offset(25).limit(25).all()
+        assert orjson.dumps(page["products"]) == orm_json(orm_page)
+        assert ProductService.get_products_paginated(catalog, 2, 25) == PaginatedProductResponse.model_validate(page)
+        assert ProductService.get_product_by_sku(catalog, orm_page[0].sku) is orm_page[0]
+
+        after = ProductService.get_product_rows_after_cursor(catalog, page["pagination"]["next_cursor"], 25, include_total=True)
+        assert orjson.dumps(after) == CursorPaginatedProductResponse.model_validate(after).model_dump_json().encode()
+        assert after["products"][0]["id"] == page["products"][-1]["id"] + 1
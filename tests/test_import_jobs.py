@@ -0,0 +1,130 @@
+import io
+import time
+import pytest
+from datetime import datetime, timedelta
+from app.models import ImportJob, Product
+from app.services import job_service
+from app.services.csv_service import CSVService
+from app.services.job_service import JobService
+from tests.conftest import store_csv, upload_csv
+
+
+@pytest.fixture(autouse=True)
+def job_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_service, "IMPORT_JOB_DIR", str(tmp_path))
+    return tmp_path
+
+
+class TestImportJobs:
+    """Background CSV imports and their progress records."""
+
+    def test_job_runs_and_reports_progress(self, db_session, sample_csv_invalid, monkeypatch):
+        monkeypatch.setattr(CSVService, "CHUNK_SIZE", 2)
+        job = JobService.create_job(db_session, "products.csv", io.BytesIO(sample_csv_invalid.encode('utf-8')))
+        assert JobService.get_job(db_session, job.id).status == "queued"
+
+        JobService.run_job(job.id, db_session.get_bind())
+        db_session.expire_all()
+        status = JobService.get_job(db_session, job.id)
+
+        assert status.status == "completed"
+        assert status.rows_processed == 4
+        assert status.valid_products_stored == 1
+        assert status.validation_errors_count == 3
+        assert [error["row"] for error in status.errors] == [2, 3, 4]
+        assert status.errors[1]["errors"] == ["Price must be less than or equal to MRP"]
+        assert status.rows_per_second is not None
+        assert db_session.query(Product).count() == 1
+
+    def test_job_is_only_claimed_once(self, db_session, sample_csv_valid, job_dir):
+        job = JobService.create_job(db_session, "products.csv", io.BytesIO(sample_csv_valid.encode('utf-8')))
+        engine = db_session.get_bind()
+
+        JobService.run_job(job.id, engine)
+        JobService.run_job(job.id, engine)
+        db_session.expire_all()
+
+        assert JobService.get_job(db_session, job.id).valid_products_stored == 3
+        assert list(job_dir.iterdir()) == []
+
+    def test_invalid_csv_fails_job(self, db_session):
+        job = JobService.create_job(db_session, "empty.csv", io.BytesIO(b""))
+
+        JobService.run_job(job.id, db_session.get_bind())
+        db_session.expire_all()
+        status = JobService.get_job(db_session, job.id)
+
+        assert status.status == "failed"
+        assert "Invalid CSV format" in status.detail
+
+    def test_fail_interrupted_jobs(self, db_session):
+        now = datetime.utcnow()
+        long_ago = now - timedelta(hours=1)
+        db_session.add_all([
+            ImportJob(id="stale", status="running", created_at=long_ago, started_at=long_ago, updated_at=long_ago),
+            ImportJob(id="active", status="running", created_at=now, started_at=now, updated_at=now),
+        ])
+        db_session.commit()
+
+        assert JobService.fail_interrupted_jobs(db_session.get_bind(), stale_seconds=300) == 1
+        db_session.expire_all()
+        assert JobService.get_job(db_session, "stale").status == "failed"
+        assert JobService.get_job(db_session, "active").status == "running"
+
+        assert JobService.fail_interrupted_jobs(db_session.get_bind()) == 1
+        db_session.expire_all()
+        assert JobService.get_job(db_session, "active").status == "failed"
+
+    def test_recover_leaves_running_jobs_to_migrate(self, db_session):
+        long_ago = datetime.utcnow() - timedelta(hours=1)
+        db_session.add(ImportJob(id="stale", status="running", created_at=long_ago, started_at=long_ago, updated_at=long_ago))
+        db_session.commit()
+
+        JobService.recover_jobs(db_session.get_bind())
+        db_session.expire_all()
+
+        assert JobService.get_job(db_session, "stale").status == "running"
+
+    def test_recover_requeues_sync_job_with_its_options(self, db_session, sample_csv_valid, monkeypatch):
+        store_csv(db_session, sample_csv_valid)
+        changed = sample_csv_valid.replace("TEST001,Test Product 1,TestBrand,Blue,M,1000,800,10",
+                                           "TEST001,Test Product 1,TestBrand,Blue,M,1000,750,10")
+        job = JobService.create_job(db_session, "products.csv", io.BytesIO(changed.encode('utf-8')), sync=True)
+        submitted = []
+
+        def run_now(job_id, engine, workers=1, sync=False):
+            submitted.append((workers, sync))
+            JobService.run_job(job_id, engine, workers, sync)
+
+        monkeypatch.setattr(JobService, "submit", run_now)
+
+        JobService.recover_jobs(db_session.get_bind())
+        db_session.expire_all()
+        status = JobService.get_job(db_session, job.id)
+
+        assert submitted == [(1, True)]
+        assert status.status == "completed"
+        assert (status.sync, status.inserted, status.updated, status.unchanged) == (True, 0, 1, 2)
+        assert db_session.query(Product).filter(Product.sku == "TEST001").one().price == 750
+
+    def test_unknown_job(self, db_session):
+        assert JobService.get_job(db_session, "missing") is None
+
+
+class TestJobEndpoints:
+    """Queuing an upload over HTTP and polling its job."""
+
+    def test_background_upload_completes(self, client, sample_csv_valid):
+        response = upload_csv(client, sample_csv_valid, background="true")
+        assert response.status_code == 202
+
+        status_url = response.json()["status_url"]
+        for _ in range(50):
+            status = client.get(status_url).json()
+            if status["status"] in ("completed", "failed"):
+                break
+            time.sleep(0.05)
+
+        assert status["status"] == "completed"
+        assert status["valid_products_stored"] == 3
+        assert client.get("/upload/jobs/unknown").status_code == 404
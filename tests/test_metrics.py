@@ -0,0 +1,90 @@
+import pytest
+import re
+from sqlalchemy import create_engine, exc, text
+from app.metrics import Histogram, RequestStats, csv_stage, CSV_STAGE_LATENCY, QUERY_LATENCY
+from tests.conftest import upload_csv
+
+
+def server_timing(response):
+    return dict(
+        (entry.split(";")[0], entry)
+        for entry in response.headers["server-timing"].split(", ")
+    )
+
+
+def background_query_count():
+    count = re.search(r'db_query_duration_seconds_count\{route="background"\} (\d+)', "\n".join(QUERY_LATENCY.render()))
+    return int(count.group(1)) if count else 0
+
+
+class TestHistogram:
+    """Prometheus text rendering."""
+
+    def test_cumulative_buckets(self):
+        histogram = Histogram("demo_seconds", "Demo.", ["route"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "/a")
+
+        lines = histogram.render()
+
+        assert lines[:2] == ["# HELP demo_seconds Demo.", "# TYPE demo_seconds histogram"]
+        assert 'demo_seconds_bucket{route="/a",le="0.1"} 2' in lines
+        assert 'demo_seconds_bucket{route="/a",le="1.0"} 3' in lines
+        assert 'demo_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+        assert 'demo_seconds_count{route="/a"} 4' in lines
+        assert 'demo_seconds_sum{route="/a"} 3.65' in lines
+
+    def test_stage_timer_as_decorator(self):
+        @csv_stage("decorated")
+        def work():
+            return 42
+
+        assert work() == 42 and work() == 42
+        assert 'csv_ingest_stage_seconds_count{stage="decorated"} 2' in CSV_STAGE_LATENCY.render()
+
+
+class TestRequestMetrics:
+    """Middleware, SQL counters and /metrics over HTTP."""
+
+    def test_server_timing_counts_queries(self, client, sample_csv_valid):
+        upload_csv(client, sample_csv_valid)
+
+        timing = server_timing(client.get("/products/TEST001"))
+
+        assert timing["db"].startswith('db;desc="1 queries"')
+        assert "total" in timing
+
+    def test_upload_reports_csv_stages(self, client, sample_csv_valid):
+        for params in ({}, {"stream": "true"}):
+            timing = server_timing(upload_csv(client, sample_csv_valid, **params))
+            assert {"parse", "validate", "store"} <= set(timing)
+
+    def test_metrics_endpoint_labels_by_route_template(self, client, sample_csv_valid):
+        upload_csv(client, sample_csv_valid)
+        client.get("/products/TEST001")
+        client.get("/products/TEST002")
+
+        response = client.get("/metrics")
+
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        count = re.search(r'http_request_duration_seconds_count\{method="GET",route="/products/\{sku\}",status="200"\} (\d+)', response.text)
+        assert count and int(count.group(1)) >= 2
+        assert 'csv_ingest_stage_seconds_count{stage="store"}' in response.text
+        assert 'route="/products/TEST001"' not in response.text
+
+    def test_failing_statements_leave_no_timing_state(self):
+        engine = create_engine("sqlite://")
+        before = background_query_count()
+        with engine.connect() as connection:
+            for _ in range(3):
+                with pytest.raises(exc.OperationalError):
+                    connection.execute(text("SELECT * FROM missing"))
+            assert connection.execute(text("SELECT 1")).scalar() == 1
+            info = dict(connection.info)
+        engine.dispose()
+
+        assert "query_started" not in info
+        assert background_query_count() == before + 1
+
+    def test_unmatched_routes_share_a_label(self):
+        assert RequestStats({"path": "/nope"}).route == "unmatched"
@@ -0,0 +1,119 @@
+import json
+import pytest
+from app.services.product_service import ProductService
+from tests.conftest import upload_csv
+
+
+@pytest.fixture
+def catalog_csv():
+    return "sku,name,brand,color,size,mrp,price,quantity\n" + "".join(
+        f"SKU{i:03d},Product {i},Brand,,,1000,800,{i}\n" for i in range(25)
+    )
+
+
+class TestKeysetPagination:
+    """Cursor pages must walk the catalog exactly like page/limit does."""
+
+    def test_cursor_pages_match_offset_pages(self, catalog):
+        first = ProductService.get_product_rows_paginated(catalog, 1, 10)
+        offset_skus = [
+            p["sku"]
+            for page in (1, 2, 3)
+            for p in ProductService.get_product_rows_paginated(catalog, page, 10)["products"]
+        ]
+
+        cursor_skus = [p["sku"] for p in first["products"]]
+        cursor = first["pagination"]["next_cursor"]
+        while cursor:
+            page = ProductService.get_product_rows_after_cursor(catalog, cursor, 10)
+            cursor_skus.extend(p["sku"] for p in page["products"])
+            cursor = page["pagination"]["next_cursor"]
+
+        assert cursor_skus == offset_skus
+        assert len(cursor_skus) == 25
+
+    def test_last_page_has_no_cursor(self, catalog):
+        assert ProductService.get_product_rows_paginated(catalog, 3, 10)["pagination"]["next_cursor"] is None
+
+        exact = ProductService.get_product_rows_paginated(catalog, 1, 25)
+        assert exact["pagination"]["next_cursor"] is None
+
+    def test_total_is_optional(self, catalog):
+        cursor = ProductService.encode_cursor(0)
+
+        assert ProductService.get_product_rows_after_cursor(catalog, cursor, 5)["pagination"]["total_products"] is None
+        assert ProductService.get_product_rows_after_cursor(catalog, cursor, 5, include_total=True)["pagination"]["total_products"] == 25
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30=", ProductService.encode_cursor(0)[:-2] + "xx"])
+    def test_invalid_cursor(self, catalog, cursor):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            ProductService.get_product_rows_after_cursor(catalog, cursor, 5)
+
+
+class TestSearchPagination:
+    """Paged and streamed search must cover the same rows as the full result."""
+
+    def test_pages_cover_full_result(self, catalog):
+        rows, _ = ProductService.search_product_rows(catalog, brand="brand", min_price=100)
+        expected = [row["sku"] for row in rows]
+
+        skus, cursor = [], None
+        while True:
+            rows, cursor = ProductService.search_product_rows(catalog, brand="brand", min_price=100, limit=7, cursor=cursor)
+            skus.extend(row["sku"] for row in rows)
+            if cursor is None:
+                break
+
+        assert skus == expected
+        assert len(skus) == 25
+
+    def test_streamed_rows_match_search(self, catalog):
+        statement = ProductService.search_rows_statement(catalog, brand="brand")
+        rows = [dict(row) for row in catalog.execute(statement.execution_options(yield_per=4)).mappings()]
+
+        assert rows == ProductService.search_product_rows(catalog, brand="brand")[0]
+        assert list(rows[0]) == ["sku", "name", "brand", "color", "size", "mrp", "price", "quantity", "id"]
+
+    def test_streamed_rows_honour_cursor_and_limit(self, catalog):
+        _, cursor = ProductService.search_product_rows(catalog, limit=10)
+
+        statement = ProductService.search_rows_statement(catalog, limit=5, cursor=cursor)
+
+        assert [row.sku for row in catalog.execute(statement)] == [f"SKU{i:03d}" for i in range(10, 15)]
+
+
+class TestPaginationEndpoints:
+    """Cursor pages and NDJSON streaming over HTTP."""
+
+    def test_list_pages_and_cursor(self, client, sample_csv_valid):
+        upload_csv(client, sample_csv_valid)
+
+        first = client.get("/products", params={"limit": 2}).json()
+        assert first["pagination"]["total_products"] == 3
+        assert [p["sku"] for p in first["products"]] == ["TEST001", "TEST002"]
+
+        second = client.get("/products", params={"limit": 2, "cursor": first["pagination"]["next_cursor"]}).json()
+        assert [p["sku"] for p in second["products"]] == ["TEST003"]
+        assert second["pagination"]["next_cursor"] is None
+
+        assert client.get("/products", params={"cursor": "bad"}).status_code == 400
+
+    def test_search_paging_header(self, client, sample_csv_valid):
+        upload_csv(client, sample_csv_valid)
+
+        response = client.get("/products/search", params={"brand": "testbrand", "limit": 1})
+        assert [p["sku"] for p in response.json()] == ["TEST001"]
+
+        response = client.get("/products/search", params={"brand": "testbrand", "limit": 1, "cursor": response.headers["X-Next-Cursor"]})
+        assert [p["sku"] for p in response.json()] == ["TEST002"]
+        assert "X-Next-Cursor" not in response.headers
+
+    def test_search_ndjson(self, client, sample_csv_valid):
+        upload_csv(client, sample_csv_valid)
+
+        response = client.get("/products/search", params={"minPrice": 1000, "format": "ndjson"})
+
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["sku"] for row in rows] == ["TEST002", "TEST003"]
+        assert rows == client.get("/products/search", params={"minPrice": 1000}).json()
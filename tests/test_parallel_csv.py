@@ -0,0 +1,133 @@
+import pytest
+import io
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import Base
+from app.models import Product
+from app.services.csv_service import CSVService
+from app.services.parallel_csv import ParallelCSVService
+from benchmarks.synthetic import generate_catalog_csv
+from tests.conftest import store_csv
+
+
+def write_csv(tmp_path, content):
+    path = tmp_path / "upload.csv"
+    path.write_bytes(content.encode('utf-8'))
+    return str(path)
+
+
+def fresh_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+class TestSplitPartitions:
+    """Cutting the byte stream into whole-record ranges."""
+
+    def test_partitions_cover_all_records(self, tmp_path):
+        content = generate_catalog_csv(500)
+        path = write_csv(tmp_path, content)
+
+        header, partitions = ParallelCSVService.split_partitions(path, partition_bytes=1000)
+
+        assert len(partitions) > 1
+        with open(path, "rb") as f:
+            data = f.read()
+        assert header + b"".join(data[start:end] for start, end in partitions) == data
+        assert all(data[end - 1:end] == b"\n" for _, end in partitions[:-1])
+
+    def test_never_splits_quoted_newlines(self, tmp_path):
+        rows = [f'SKU{i},"Line one\nline two ""{i}""",Brand,Red,M,100,90,1' for i in range(50)]
+        path = write_csv(tmp_path, "sku,name,brand,color,size,mrp,price,quantity\n" + "\n".join(rows) + "\n")
+
+        header, partitions = ParallelCSVService.split_partitions(path, partition_bytes=64)
+
+        with open(path, "rb") as f:
+            data = f.read()
+        names = []
+        for start, end in partitions:
+            names += pd.read_csv(io.BytesIO(header + data[start:end]))["name"].tolist()
+        assert names == [f'Line one\nline two "{i}"' for i in range(50)]
+
+    def test_header_only_file_has_no_partitions(self, tmp_path):
+        path = write_csv(tmp_path, "sku,name,brand,color,size,mrp,price,quantity\n")
+        assert ParallelCSVService.split_partitions(path)[1] == []
+
+    def test_empty_file_is_invalid(self, tmp_path):
+        with pytest.raises(ValueError, match="Invalid CSV format"):
+            ParallelCSVService.split_partitions(write_csv(tmp_path, ""))
+
+
+class TestParallelIngest:
+    """Parallel ingestion matches the sequential streaming path."""
+
+    def test_matches_streaming_results(self, tmp_path):
+        content = generate_catalog_csv(3000, error_rate=0.05)
+        # Repeat some rows so duplicates span partitions
+        content += "\n".join(content.splitlines()[1:200]) + "\n"
+        path = write_csv(tmp_path, content)
+
+        sequential_db = fresh_session()
+        with open(path, "rb") as f:
+            expected = CSVService.process_csv_stream(f, sequential_db, chunk_size=500)
+        parallel_db = fresh_session()
+        progress = []
+        result = ParallelCSVService.process_csv_parallel(
+            path, parallel_db, workers=2, partition_bytes=20_000,
+            on_chunk=lambda summary, errors: progress.append(summary["total_rows"])
+        )
+
+        assert result == expected
+        assert len(progress) > 1 and progress[-1] == 3199
+        stored = lambda db: db.query(Product.sku, Product.price).order_by(Product.id).all()
+        assert stored(parallel_db) == stored(sequential_db)
+
+    def test_failing_partition_rolls_back_earlier_ones(self, tmp_path):
+        valid_rows = "\n".join(f"OK{i},Shirt,Brand,Red,M,100,90,1" for i in range(40))
+        path = write_csv(tmp_path, "sku,name,brand,color,size,mrp,price,quantity\n" + valid_rows + "\nBAD1,Shirt,Brand,Red,M,abc,90,1\n")
+        db = fresh_session()
+
+        with pytest.raises(ValueError):
+            ParallelCSVService.process_csv_parallel(path, db, workers=2, partition_bytes=200)
+
+        assert db.query(Product).count() == 0
+
+    def test_reports_global_row_numbers(self, tmp_path, sample_csv_invalid):
+        valid_rows = "\n".join(f"OK{i},Shirt,Brand,Red,M,100,90,1" for i in range(40))
+        lines = sample_csv_invalid.strip().splitlines()
+        path = write_csv(tmp_path, lines[0] + "\n" + valid_rows + "\n" + "\n".join(lines[1:]) + "\n")
+
+        result = ParallelCSVService.process_csv_parallel(path, fresh_session(), workers=2, partition_bytes=200)
+
+        assert result["total_rows"] == 44
+        assert [error["row"] for error in result["errors"]] == [42, 43, 44]
+
+
+class TestTextColumns:
+    """Text columns are stored as written, whichever path reads the file."""
+
+    def test_leading_zero_skus_match_across_paths(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(CSVService, "ENGINE", "pandas")
+        header = "sku,name,brand,color,size,mrp,price,quantity\n"
+        # The first chunk/partition has only numeric-looking SKUs, the last one doesn't
+        rows = [f"{i:05d},Product {i},Brand,Red,M,100,90,1" for i in range(40)] + ["ST-001,Product,Brand,Red,M,100,90,1"]
+        content = header + "\n".join(rows) + "\n"
+        path = write_csv(tmp_path, content)
+
+        stored = []
+        for load in (
+            lambda db: store_csv(db, content),
+            lambda db: CSVService.process_csv_stream(io.BytesIO(content.encode('utf-8')), db, chunk_size=10),
+            lambda db: ParallelCSVService.process_csv_parallel(path, db, workers=2, partition_bytes=200),
+        ):
+            db = fresh_session()
+            load(db)
+            stored.append(db.query(Product.sku, Product.name).order_by(Product.id).all())
+            db.close()
+
+        assert stored[0][0] == ("00000", "Product 0")
+        assert stored[0] == stored[1] == stored[2]
+        assert len(stored[0]) == 41
@@ -0,0 +1,49 @@
+import json
+from benchmarks.replay import Replayer, endpoint_name, load_log
+
+
+class TestRequestLog:
+    """Parsing the JSONL request-log format."""
+
+    def test_skips_lines_that_are_not_requests(self, tmp_path):
+        log = tmp_path / "requests.jsonl"
+        log.write_text("\n".join([
+            json.dumps({"ts": 0.5, "method": "get", "path": "/products/SKU1"}),
+            json.dumps({"request_id": "user-001", "title": "not a request"}),
+            "# comment",
+            "not json",
+            json.dumps({"ts": 1.0, "method": "POST", "path": "/upload", "upload": {"file": "a.csv"}, "name": "ingest"}),
+        ]) + "\n")
+
+        requests = load_log(str(log))
+
+        assert [request.name for request in requests] == ["GET /products/{sku}", "ingest"]
+        assert requests[1].upload["file"] == str(tmp_path / "a.csv")
+
+    def test_groups_paths_by_route(self):
+        assert endpoint_name("GET", "/products/ABC-1?x=1") == "GET /products/{sku}"
+        assert endpoint_name("GET", "/products/search") == "GET /products/search"
+        assert endpoint_name("GET", "/products/facets?brand=a") == "GET /products/facets"
+        assert endpoint_name("GET", "/products/cache/stats") == "GET /products/cache/stats"
+        assert endpoint_name("GET", "/upload/jobs/123") == "GET /upload/jobs/{job_id}"
+
+
+class TestReport:
+    """Aggregating replay results."""
+
+    def test_counts_errors_per_endpoint(self):
+        replayer = Replayer("http://test")
+        replayer.results = [
+            {"name": "GET /products", "seconds": 0.010, "status": 200, "error": None},
+            {"name": "GET /products", "seconds": 0.030, "status": 500, "error": "HTTP 500"},
+            {"name": "POST /upload", "seconds": 1.0, "status": None, "error": "ReadTimeout"},
+        ]
+
+        report = replayer.report(2.0)
+
+        assert report["requests"] == 3
+        assert report["throughput_rps"] == 1.5
+        assert report["endpoints"]["GET /products"]["error_rate"] == 0.5
+        assert report["endpoints"]["GET /products"]["statuses"] == {"200": 1, "500": 1}
+        assert report["endpoints"]["POST /upload"]["statuses"] == {"transport_error": 1}
+        assert report["endpoints"]["GET /products"]["latency"]["max_ms"] == 30.0
@@ -0,0 +1,94 @@
+import io
+import pytest
+from app.services.csv_service import CSVService
+from app.services.product_service import ProductService
+from app.services.result_cache import ResultCache, result_cache
+from tests.conftest import upload_csv
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    return ResultCache(max_entries=2, ttl_seconds=10, clock=clock)
+
+
+class TestResultCache:
+    """LRU/TTL behaviour and generation-based invalidation."""
+
+    def test_hit_and_miss_counters(self, cache):
+        assert cache.get("a") is None
+        cache.set("a", b"1", cache.generation)
+
+        assert cache.get("a") == b"1"
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self, cache):
+        cache.set("a", b"1", 0)
+        cache.set("b", b"2", 0)
+        cache.get("a")
+        cache.set("c", b"3", 0)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.get("c") == b"3"
+
+    def test_entries_expire(self, cache, clock):
+        cache.set("a", b"1", 0)
+        clock.now = 10.0
+
+        assert cache.get("a") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_invalidate_drops_entries_and_stale_results(self, cache):
+        cache.set("a", b"1", 0)
+        computed_in = cache.generation
+        cache.invalidate()
+        cache.set("b", b"2", computed_in)
+
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+        assert cache.generation == 1
+
+    def test_disabled_cache_stores_nothing(self):
+        cache = ResultCache(max_entries=0, ttl_seconds=10)
+        cache.set("a", b"1", 0)
+
+        assert cache.get("a") is None
+        assert cache.misses == 0
+
+    def test_key_normalizes_parameters(self):
+        assert ResultCache.make_key("search", brand="x", color=None) == ResultCache.make_key("search", brand="x")
+        assert ResultCache.make_key("search", brand="x", limit=5) == ResultCache.make_key("search", limit=5, brand="x")
+
+    def test_uploads_and_clear_invalidate(self, db_session, sample_csv_valid):
+        generation = result_cache.generation
+
+        CSVService.process_csv_stream(io.BytesIO(sample_csv_valid.encode('utf-8')), db_session)
+        assert result_cache.generation == generation + 1
+
+        CSVService.process_csv_stream(io.BytesIO(sample_csv_valid.encode('utf-8')), db_session)
+        assert result_cache.generation == generation + 1
+
+        ProductService.clear_all_products(db_session)
+        assert result_cache.generation == generation + 2
+
+    def test_endpoints_refresh_after_upload_and_clear(self, client, sample_csv_valid):
+        assert client.get("/products/search").json() == []
+        upload_csv(client, sample_csv_valid)
+        assert len(client.get("/products/search").json()) == 3
+        assert client.get("/products/cache/stats").json()["hits"] >= 0
+
+        assert client.delete("/products/clear").json() == {"message": "Deleted 3 products from database"}
+        assert client.get("/products/search").json() == []
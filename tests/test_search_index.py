@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import text
+from app.models import Product
+from app.services.product_service import ProductService
+from app.services.search_index import SearchIndex
+
+
+@pytest.fixture
+def catalog_csv():
+    return """sku,name,brand,color,size,mrp,price,quantity
+S1,Tee,StreamThreads,Sky Blue,,799,499,
+S2,Polo,StreamThreads,Green,,1299,999,
+D1,Jeans,DenimWorks,Dark Blue,,1999,1599,
+U1,Shoes,UrbanStep,,,2999,2499,
+K1,Hoodie,Kids_Joy 100%,Red,,999,599,"""
+
+
+def search_skus(db_session, use_index, **filters):
+    SearchIndex.enabled = use_index
+    try:
+        return sorted(row["sku"] for row in ProductService.search_product_rows(db_session, **filters)[0])
+    finally:
+        SearchIndex.enabled = True
+
+
+class TestSearchIndex:
+    """Indexed substring search must return exactly what ILIKE returns."""
+
+    @pytest.mark.parametrize("filters", [
+        {"brand": "stream"},
+        {"brand": "THREADS"},
+        {"brand": "works"},
+        {"brand": "st"},
+        {"brand": "s_j"},
+        {"brand": "100%"},
+        {"color": "blue"},
+        {"color": "BLUE", "brand": "denim"},
+        {"color": "blue", "min_price": 1000},
+        {"brand": "nomatch"},
+    ])
+    def test_matches_ilike(self, catalog, filters):
+        assert search_skus(catalog, True, **filters) == search_skus(catalog, False, **filters)
+
+    def test_query_uses_fts(self, catalog):
+        connection = catalog.connection()
+        plan = connection.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM products WHERE id IN "
+            "(SELECT rowid FROM products_fts WHERE brand LIKE '%stream%')"
+        )).fetchall()
+
+        assert any("products_fts VIRTUAL TABLE" in row[-1] for row in plan)
+        assert any("INTEGER PRIMARY KEY" in row[-1] for row in plan)
+
+    def test_index_follows_updates_and_deletes(self, catalog):
+        product = catalog.query(Product).filter(Product.sku == "S1").one()
+        product.brand = "FreshBrand"
+        catalog.commit()
+        assert search_skus(catalog, True, brand="fresh") == ["S1"]
+        assert search_skus(catalog, True, brand="stream") == ["S2"]
+
+        ProductService.clear_all_products(catalog)
+        assert search_skus(catalog, True, brand="fresh") == []
+
+    def test_ensure_backfills_existing_database(self, catalog):
+        engine = catalog.get_bind()
+        catalog.close()
+        with engine.begin() as connection:
+            for name in ("products_fts_ai", "products_fts_ad", "products_fts_au"):
+                connection.exec_driver_sql(f"DROP TRIGGER {name}")
+            connection.exec_driver_sql("DROP TABLE products_fts")
+
+        assert SearchIndex.ensure(engine)
+        assert search_skus(catalog, True, color="blue") == ["D1", "S1"]
@@ -0,0 +1,77 @@
+import itertools
+import re
+import pytest
+from sqlalchemy import select
+from app.models import Product
+from app.services.product_service import ProductService
+
+FILTER_VALUES = {
+    "brand": "StreamThreads",
+    "color": "Blue",
+    "min_price": 500.0,
+    "max_price": 1500.0,
+}
+
+COMBINATIONS = [
+    dict(zip(fields, (FILTER_VALUES[field] for field in fields)))
+    for size in range(1, len(FILTER_VALUES) + 1)
+    for fields in itertools.combinations(FILTER_VALUES, size)
+]
+
+
+@pytest.fixture
+def catalog_csv():
+    with open('products.csv', encoding='utf-8') as f:
+        return f.read()
+
+
+def query_plan(db_session, exact, filters):
+    where, order_by = ProductService._plan_search(
+        db_session,
+        filters.get("brand"),
+        filters.get("color"),
+        filters.get("min_price"),
+        filters.get("max_price"),
+        exact
+    )
+    statement = select(Product).where(*where).order_by(order_by)
+    sql = str(statement.compile(db_session.get_bind(), compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in db_session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + sql)]
+
+
+class TestSearchPlanner:
+    """Every filter combination must be answered from an index, never a products table scan."""
+
+    @pytest.mark.parametrize("exact", [False, True])
+    @pytest.mark.parametrize("filters", COMBINATIONS, ids=lambda f: "+".join(f))
+    def test_filters_are_index_backed(self, catalog, exact, filters):
+        plan = query_plan(catalog, exact, filters)
+        product_steps = [step for step in plan if re.search(r"\bproducts\b(?!_)", step)]
+
+        assert product_steps
+        assert all(step.startswith("SEARCH products") for step in product_steps), plan
+
+    def test_exact_uses_composite_index(self, catalog):
+        assert any("ix_products_brand_price" in step for step in query_plan(catalog, True, {"brand": "StreamThreads", "min_price": 500.0}))
+        assert any("ix_products_color_price" in step for step in query_plan(catalog, True, {"color": "Blue", "max_price": 900.0}))
+
+    def test_substring_terms_share_one_fts_lookup(self, catalog):
+        plan = query_plan(catalog, False, {"brand": "Stream", "color": "Blue"})
+
+        assert sum("products_fts VIRTUAL TABLE" in step for step in plan) == 1
+
+    @pytest.mark.parametrize("filters", COMBINATIONS, ids=lambda f: "+".join(f))
+    def test_planned_results_match_unplanned(self, catalog, filters):
+        rows, _ = ProductService.search_product_rows(catalog, **filters)
+        expected = [
+            p.id for p in catalog.query(Product).order_by(Product.id)
+            if ("brand" not in filters or filters["brand"].lower() in p.brand.lower())
+            and ("color" not in filters or (p.color and filters["color"].lower() in p.color.lower()))
+            and p.price >= filters.get("min_price", 0)
+            and p.price <= filters.get("max_price", float("inf"))
+        ]
+        assert [row["id"] for row in rows] == expected
+
+    def test_exact_match_is_case_sensitive_equality(self, catalog):
+        assert len(ProductService.search_product_rows(catalog, brand="StreamThreads", exact=True)[0]) == 3
+        assert ProductService.search_product_rows(catalog, brand="Stream", exact=True) == ([], None)
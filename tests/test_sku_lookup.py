@@ -0,0 +1,86 @@
+import pytest
+from sqlalchemy import event
+from app.services import product_service
+from app.services.product_service import ProductService
+from app.services.result_cache import ResultCache, sku_cache
+from tests.conftest import upload_csv
+
+
+@pytest.fixture
+def statements(catalog):
+    executed = []
+
+    @event.listens_for(catalog.get_bind(), "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    yield executed
+    event.remove(catalog.get_bind(), "before_cursor_execute", record)
+
+
+class TestLookupSkus:
+    """Batch resolution of SKUs with chunked IN queries and the SKU cache."""
+
+    def test_chunks_the_in_list(self, catalog, statements, monkeypatch):
+        monkeypatch.setattr(product_service, "sku_cache", ResultCache(max_entries=0, ttl_seconds=0))
+        skus = [f"SKU-{i:08d}" for i in range(1200)] + ["MISSING"]
+
+        found = ProductService.lookup_skus(catalog, skus)
+
+        assert len(found) == 1200
+        assert found["SKU-00000042"]["sku"] == "SKU-00000042"
+        assert len([s for s in statements if "products.sku IN" in s]) == 3
+
+    def test_cache_serves_repeat_lookups(self, catalog, statements, monkeypatch):
+        cache = ResultCache(max_entries=100, ttl_seconds=60)
+        monkeypatch.setattr(product_service, "sku_cache", cache)
+        skus = [f"SKU-{i:08d}" for i in range(10)]
+
+        first = ProductService.lookup_skus(catalog, skus)
+        queries = len(statements)
+        second = ProductService.lookup_skus(catalog, skus)
+
+        assert second == first
+        assert len(statements) == queries
+        assert cache.stats()["hits"] == 10
+
+    def test_writes_invalidate_the_cache(self, catalog):
+        ProductService.lookup_skus(catalog, ["SKU-00000001"])
+        generation = sku_cache.generation
+
+        ProductService.clear_all_products(catalog)
+
+        assert sku_cache.generation == generation + 1
+        assert ProductService.lookup_skus(catalog, ["SKU-00000001"]) == {}
+
+
+class TestSkuLookupEndpoints:
+    """GET /products/{sku} and POST /products/lookup."""
+
+    def test_get_by_sku(self, client, sample_csv_valid):
+        upload_csv(client, sample_csv_valid)
+
+        product = client.get("/products/TEST002").json()
+
+        assert (product["sku"], product["price"], product["quantity"]) == ("TEST002", 1500.0, 20)
+        assert client.get("/products/NOPE").status_code == 404
+        assert client.get("/products/search").status_code == 200
+
+    def test_batch_lookup_keeps_request_order(self, client, sample_csv_valid):
+        upload_csv(client, sample_csv_valid)
+
+        body = client.post("/products/lookup", json={"skus": ["TEST003", "NOPE", "TEST001", "TEST003"]}).json()
+
+        assert [p["sku"] for p in body["products"]] == ["TEST003", "TEST001"]
+        assert body["missing"] == ["NOPE"]
+        assert client.post("/products/lookup", json={"skus": []}).status_code == 422
+
+    def test_cached_rows_refresh_after_sync_and_clear(self, client, sample_csv_valid):
+        upload_csv(client, sample_csv_valid)
+        assert client.get("/products/TEST001").json()["price"] == 800.0
+
+        upload_csv(client, sample_csv_valid.replace(",800,", ",750,"), sync="true")
+        assert client.get("/products/TEST001").json()["price"] == 750.0
+
+        client.delete("/products/clear")
+        assert client.get("/products/TEST001").status_code == 404
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import pytest
+from sqlalchemy import create_engine, text
+from app import database
+from app.database import apply_sqlite_profile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PRAGMAS = ("journal_mode", "busy_timeout", "synchronous", "mmap_size", "cache_size", "temp_store")
+
+PERFORMANCE = {
+    "journal_mode": "wal",
+    "busy_timeout": 5000,
+    "synchronous": 1,
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -65536,
+    "temp_store": 2,
+}
+
+# Prints the engine URL and PRAGMAs a fresh interpreter ends up with under its environment
+PROBE = """
+import json
+from sqlalchemy import text
+from app.database import engine
+with engine.connect() as connection:
+    pragmas = {name: connection.execute(text(f"PRAGMA {name}")).scalar() for name in %r}
+print(json.dumps({"url": engine.url.render_as_string(), "pool": type(engine.pool).__name__, "pragmas": pragmas}))
+""" % (PRAGMAS,)
+
+
+def read_pragmas(connection):
+    return {name: connection.execute(text(f"PRAGMA {name}")).scalar() for name in PRAGMAS}
+
+
+def probe(tmp_path, **env):
+    env = dict(os.environ, PYTHONPATH=ROOT, **env)
+    return subprocess.run([sys.executable, "-c", PROBE], env=env, cwd=tmp_path, capture_output=True, text=True)
+
+
+class TestSQLiteProfile:
+    """PRAGMAs applied to every connection of the app's engines."""
+
+    def test_sync_engine_uses_performance_profile(self):
+        with database.engine.connect() as connection:
+            assert read_pragmas(connection) == PERFORMANCE
+
+    def test_async_engine_uses_performance_profile(self):
+        async def main():
+            try:
+                async with database.async_engine.connect() as connection:
+                    return await connection.run_sync(read_pragmas)
+            finally:
+                await database.async_engine.dispose()
+
+        assert asyncio.run(main()) == PERFORMANCE
+
+    def test_default_profile_keeps_rollback_journal(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'products.db'}")
+        apply_sqlite_profile(engine, "default")
+        with engine.connect() as connection:
+            pragmas = read_pragmas(connection)
+        engine.dispose()
+
+        assert pragmas["journal_mode"] == "delete"
+        assert pragmas["busy_timeout"] == 5000
+
+
+class TestDatabaseEnvironment:
+    """DATABASE_URL and SQLITE_* settings read when app.database is imported."""
+
+    def test_database_url_and_profile_overrides(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'override.db'}"
+        output = probe(tmp_path, DATABASE_URL=url, SQLITE_PROFILE="default", SQLITE_BUSY_TIMEOUT_MS="1234")
+
+        result = json.loads(output.stdout)
+        assert result["url"] == url
+        assert result["pool"] == "QueuePool"
+        assert result["pragmas"]["journal_mode"] == "delete"
+        assert result["pragmas"]["busy_timeout"] == 1234
+        assert (tmp_path / "override.db").exists()
+
+    def test_performance_setting_overrides(self, tmp_path):
+        output = probe(
+            tmp_path,
+            DATABASE_URL=f"sqlite:///{tmp_path / 'tuned.db'}",
+            SQLITE_PROFILE="performance",
+            SQLITE_MMAP_SIZE="0",
+            SQLITE_CACHE_SIZE_KB="1024",
+        )
+
+        pragmas = json.loads(output.stdout)["pragmas"]
+        assert pragmas["journal_mode"] == "wal"
+        assert (pragmas["mmap_size"], pragmas["cache_size"]) == (0, -1024)
+
+    @pytest.mark.parametrize("profile", ["fast", ""])
+    def test_rejects_unknown_profile(self, tmp_path, profile):
+        output = probe(tmp_path, DATABASE_URL=f"sqlite:///{tmp_path / 'products.db'}", SQLITE_PROFILE=profile)
+
+        assert output.returncode != 0
+        assert "Unknown SQLITE_PROFILE" in output.stderr
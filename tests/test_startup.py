@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+from sqlalchemy import create_engine, inspect
+from app.migrate import migrate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestStartup:
+    """Cold start of an API worker."""
+
+    def test_importing_the_app_does_not_load_pandas_or_touch_the_database(self, tmp_path):
+        env = dict(os.environ, PYTHONPATH=ROOT, DATABASE_URL=f"sqlite:///{tmp_path / 'products.db'}")
+        probe = "import sys, app.main; print('pandas' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", probe], env=env, cwd=tmp_path, capture_output=True, text=True, check=True)
+
+        assert output.stdout.strip() == "False"
+        assert not (tmp_path / "products.db").exists()
+
+    def test_migrate_is_idempotent(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'products.db'}")
+        migrate(engine)
+        migrate(engine)
+
+        inspector = inspect(engine)
+        assert {"products", "products_fts", "import_jobs"} <= set(inspector.get_table_names())
+        assert "ix_products_brand_price" in {index["name"] for index in inspector.get_indexes("products")}
+        engine.dispose()
@@ -0,0 +1,158 @@
+import pytest
+import io
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models import Product
+from app.services.catalog_state import CatalogStateService
+from app.services.csv_service import CSVService
+from tests.conftest import store_csv, upload_csv
+
+
+class TestStoreProducts:
+    """Bulk persistence of validated rows."""
+
+    def test_stores_valid_rows(self, db_session, sample_csv_valid):
+        result = store_csv(db_session, sample_csv_valid)
+
+        assert result["valid_products_stored"] == 3
+        assert result["skipped_duplicates"] == 0
+        assert db_session.query(Product).count() == 3
+        stored = db_session.query(Product).filter(Product.sku == "TEST002").one()
+        assert (stored.brand, stored.color, stored.price, stored.quantity) == ("TestBrand", "Red", 1500.0, 20)
+
+    def test_skips_skus_already_in_database(self, db_session, sample_csv_valid):
+        store_csv(db_session, sample_csv_valid)
+        result = store_csv(db_session, sample_csv_valid)
+
+        assert result["valid_products_stored"] == 0
+        assert result["skipped_duplicates"] == 3
+        assert db_session.query(Product).count() == 3
+
+    def test_skips_duplicate_skus_within_file(self, db_session):
+        csv_content = """sku,name,brand,color,size,mrp,price,quantity
+TEST001,Product 1,Brand1,Blue,M,1000,800,10
+TEST001,Product 2,Brand2,Red,L,2000,1500,20
+TEST002,Product 3,Brand3,Green,S,1500,1200,5"""
+
+        result = store_csv(db_session, csv_content)
+
+        assert result["valid_products_stored"] == 2
+        assert result["skipped_duplicates"] == 1
+        assert db_session.query(Product).filter(Product.sku == "TEST001").one().name == "Product 1"
+
+    def test_sku_committed_by_another_writer_after_the_lookup(self, db_session, sample_csv_valid, monkeypatch):
+        existing_skus = CSVService._existing_skus
+
+        def lookup_then_race(db, skus):
+            found = existing_skus(db, skus)
+            with Session(bind=db.get_bind()) as other:
+                other.add(Product(sku="TEST002", name="Raced", brand="Other", mrp=10.0, price=5.0))
+                CatalogStateService.adjust_product_count(other, 1)
+                other.commit()
+            return found
+
+        monkeypatch.setattr(CSVService, "_existing_skus", staticmethod(lookup_then_race))
+
+        result = store_csv(db_session, sample_csv_valid)
+
+        assert result["valid_products_stored"] == 2
+        assert result["skipped_duplicates"] == 1
+        assert db_session.query(Product).filter(Product.sku == "TEST002").one().name == "Raced"
+        assert CatalogStateService.get_product_count(db_session) == db_session.query(Product).count() == 3
+
+    def test_query_count_does_not_grow_with_rows(self, db_session, monkeypatch):
+        monkeypatch.setattr(CSVService, "STORE_CHUNK_SIZE", 50)
+        rows = "\n".join(f"SKU{i:04d},Product {i},Brand,Blue,M,1000,800,1" for i in range(120))
+        statements = []
+        event.listen(db_session.get_bind(), "before_cursor_execute",
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        result = store_csv(db_session, "sku,name,brand,color,size,mrp,price,quantity\n" + rows)
+
+        assert result["valid_products_stored"] == 120
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        assert len(selects) == 3
+
+
+class TestStreamingUpload:
+    """Chunked ingestion must add up to the same result as a whole-file upload."""
+
+    def test_stream_matches_whole_file(self, db_session, sample_csv_invalid):
+        expected = store_csv(db_session, sample_csv_invalid)
+        db_session.query(Product).delete()
+        db_session.commit()
+
+        result = CSVService.process_csv_stream(io.BytesIO(sample_csv_invalid.encode('utf-8')), db_session, chunk_size=2)
+
+        assert result == expected
+        assert [error["row"] for error in result["errors"]] == [2, 3, 4]
+
+    def test_stream_dedups_across_chunks(self, db_session):
+        csv_content = """sku,name,brand,color,size,mrp,price,quantity
+TEST001,Product 1,Brand1,Blue,M,1000,800,10
+TEST002,Product 2,Brand2,Red,L,2000,1500,20
+TEST001,Product 3,Brand3,Green,S,1500,1200,5"""
+
+        result = CSVService.process_csv_stream(io.BytesIO(csv_content.encode('utf-8')), db_session, chunk_size=1)
+
+        assert result["total_rows"] == 3
+        assert result["valid_products_stored"] == 2
+        assert result["skipped_duplicates"] == 1
+
+    def test_failing_chunk_rolls_back_earlier_chunks(self, db_session):
+        # The MRP passes validation but can't be converted when the third row is stored
+        csv_content = """sku,name,brand,color,size,mrp,price,quantity
+A1,Product 1,Brand,Blue,M,10,5,1
+A2,Product 2,Brand,Blue,M,10,5,1
+A3,Product 3,Brand,Blue,M,abc,5,1
+A4,Product 4,Brand,Blue,M,10,5,1"""
+
+        with pytest.raises(ValueError):
+            CSVService.process_csv_stream(io.BytesIO(csv_content.encode('utf-8')), db_session, chunk_size=2)
+
+        assert db_session.query(Product).count() == 0
+        assert CatalogStateService.get_product_count(db_session) == 0
+
+        with pytest.raises(ValueError):
+            CSVService.process_csv_stream(io.BytesIO(csv_content.encode('utf-8')), db_session, chunk_size=2, atomic=False)
+
+        assert [p.sku for p in db_session.query(Product).order_by(Product.id)] == ["A1", "A2"]
+
+    def test_stream_rejects_empty_file(self, db_session):
+        with pytest.raises(ValueError, match="Invalid CSV format"):
+            CSVService.process_csv_stream(io.BytesIO(b""), db_session)
+
+
+class TestUploadEndpoint:
+    """POST /upload over HTTP, whole-file and streamed."""
+
+    @pytest.mark.parametrize("params", [{}, {"stream": "true"}])
+    def test_upload_reports_validation(self, client, sample_csv_invalid, params):
+        response = upload_csv(client, sample_csv_invalid, **params)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["valid_products_stored"] == 1
+        assert body["validation_errors_count"] == 3
+        assert [error["row"] for error in body["errors"]] == [2, 3, 4]
+
+    @pytest.mark.parametrize("params", [{}, {"stream": "true"}])
+    def test_failed_upload_stores_nothing(self, client, monkeypatch, params):
+        monkeypatch.setattr(CSVService, "CHUNK_SIZE", 2)
+        csv_content = """sku,name,brand,color,size,mrp,price,quantity
+A1,Product 1,Brand,Blue,M,10,5,1
+A2,Product 2,Brand,Blue,M,10,5,1
+A3,Product 3,Brand,Blue,M,abc,5,1"""
+
+        response = upload_csv(client, csv_content, **params)
+
+        assert response.status_code == 400
+        assert client.get("/products").json()["pagination"]["total_products"] == 0
+
+    def test_rejects_non_csv(self, client):
+        response = client.post("/upload", files={"file": ("products.txt", b"sku", "text/plain")})
+        assert response.status_code == 400
+
+    def test_rejects_empty_csv(self, client):
+        response = upload_csv(client, b"")
+        assert response.status_code == 400
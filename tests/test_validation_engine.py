@@ -0,0 +1,62 @@
+import pytest
+from app.services.csv_service import CSVService
+
+
+def row_by_row(df):
+    valid_products = []
+    validation_errors = []
+    for index, row in df.iterrows():
+        row_errors = CSVService.validate_row(row, index)
+        if row_errors:
+            validation_errors.append({"row": index + 1, "errors": row_errors})
+        else:
+            valid_products.append(CSVService._create_product_data(row))
+    return valid_products, validation_errors
+
+
+class TestValidationEngine:
+    """The column-wise engine must match validate_row/_create_product_data exactly."""
+
+    def test_matches_row_path_on_valid_csv(self, sample_csv_valid):
+        df = CSVService.parse_csv(sample_csv_valid.encode('utf-8'))
+        assert CSVService.validate_dataframe(df) == row_by_row(df)
+
+    def test_matches_row_path_on_invalid_csv(self, sample_csv_invalid):
+        df = CSVService.parse_csv(sample_csv_invalid.encode('utf-8'))
+        valid_products, validation_errors = CSVService.validate_dataframe(df)
+
+        assert (valid_products, validation_errors) == row_by_row(df)
+        assert [error["row"] for error in validation_errors] == [2, 3, 4]
+
+    def test_matches_row_path_on_sample_file(self):
+        with open('products.csv', 'rb') as f:
+            df = CSVService.parse_csv(f.read())
+        assert CSVService.validate_dataframe(df) == row_by_row(df)
+
+    @pytest.mark.parametrize("csv_content", [
+        # Missing optional and required columns
+        "sku,name,brand\nTEST001,Product 1,Brand1\nTEST002,Product 2,Brand2",
+        # Blank optional fields, whitespace-only required field, float quantities
+        "sku,name,brand,color,size,mrp,price,quantity\n"
+        "TEST001,Product 1,Brand1,,,1000,800,2.7\n"
+        "TEST002,   ,Brand2,Red,L,1000,800,\n"
+        "TEST003, Product 3 ,Brand3, Blue ,32,1000,1000,0",
+        # Non-numeric values in numeric columns
+        "sku,name,brand,mrp,price,quantity\n"
+        "TEST001,Product 1,Brand1,1000,abc,ten\n"
+        "TEST002,Product 2,Brand2,1000,1200,-1\n"
+        "TEST003,Product 3,Brand3,1000,900,5",
+    ])
+    def test_matches_row_path_on_edge_cases(self, csv_content):
+        df = CSVService.parse_csv(csv_content.encode('utf-8'))
+        try:
+            expected = row_by_row(df)
+        except ValueError as e:
+            with pytest.raises(ValueError, match=str(e)):
+                CSVService.validate_dataframe(df)
+        else:
+            assert CSVService.validate_dataframe(df) == expected
+
+    def test_empty_dataframe(self):
+        df = CSVService.parse_csv(b"sku,name,brand,color,size,mrp,price,quantity")
+        assert CSVService.validate_dataframe(df) == ([], [])